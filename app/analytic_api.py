@@ -1,15 +1,22 @@
+import asyncio
+import re
 import time
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
-from fastapi import FastAPI, Depends, Request, Response, HTTPException
+from fastapi import FastAPI, BackgroundTasks, Depends, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import ValidationError
 
+from app.orchestration.query_understanding_agent import get_query_understanding_agent
+from app.orchestration.simple_query_executor import shutdown_chart_pool
 from app.security.auth import bearer_scheme, validate_jwt_token
 from app.services.query_processor import QueryProcessor, PromptRequest
 from app.services.audit_sqs_service import get_audit_sqs_service
+from app.services.query_context_service import get_query_context_service
+from app.services.http_clients import close_openai_http_clients
 from config.logging_config import setup_logging, get_logger
 from config.app_config import (
     CORS_ORIGINS,
@@ -27,18 +34,62 @@ logger = get_logger("analytic_agent")
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events (stateless)."""
     logger.info("Starting Analytic Agent API (stateless)...")
+    # Build the query understanding agent and its LLM client before the first request
+    get_query_understanding_agent()
+    audit_service = get_audit_sqs_service()
+    audit_service.start_batching()
     yield
+    # Flush queued audit logs without blocking the event loop
+    await asyncio.to_thread(audit_service.stop_batching)
+    await asyncio.to_thread(shutdown_chart_pool)
+    await close_openai_http_clients()
     logger.info("Shutdown complete")
 
-# Create FastAPI app with lifespan handler
+# Request validator messages -> message shown to the user, matched in one scan
+_VALIDATION_MESSAGE_RE = re.compile(
+    r"(?P<malicious>Potentially malicious content detected)"
+    r"|(?P<empty>Prompt cannot be empty)"
+    r"|(?P<too_long>Prompt too long)"
+)
+_VALIDATION_USER_MESSAGES = {
+    "malicious": "Request blocked for security reasons",
+    "empty": "Prompt cannot be empty",
+    "too_long": "Prompt exceeds maximum length",
+}
+
+# Larger bodies cannot hold a valid request (a 5000-character prompt is at most
+# 60KB even if every character is sent as a \u-escaped surrogate pair), so they
+# are rejected before JSON parsing and validation
+_MAX_REQUEST_BODY_BYTES = 64 * 1024
+
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Map the first validation error to the message returned to the user."""
+    errors = error.errors()
+    if not errors:
+        return ""
+    match = _VALIDATION_MESSAGE_RE.search(errors[0].get("msg", ""))
+    return _VALIDATION_USER_MESSAGES[match.lastgroup] if match else "Invalid request format"
+
+
+def _username_from_payload(jwt_payload: Dict[str, Any]) -> str:
+    """Username for audit logs: the userName claim, else the local part of the email."""
+    # partition stops at the first "@" and builds no list, unlike split
+    return jwt_payload.get("userName") or jwt_payload.get("email", "").partition("@")[0]
+
+
+# Create FastAPI app with lifespan handler.
+# ORJSONResponse: the report payload carries a large base64 chart_image, which
+# orjson serializes several times faster than the stdlib json encoder
 app = FastAPI(
     title="Analytic Agent API",
     description="Scalable analytic agent (stateless, DynamoDB conversation history)",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-logger.info(f"CORS:mode - Allowing origins: {CORS_ORIGINS}")
+logger.info("CORS:mode - Allowing origins: %s", CORS_ORIGINS)
 app.add_middleware(
             CORSMiddleware,
             allow_origins=CORS_ORIGINS,
@@ -54,11 +105,13 @@ query_processor = QueryProcessor()
 @app.post("/api/analytics/report", response_model=Dict[str, Any])
 async def receive_userprompt(
     http_request: Request,
+    background_tasks: BackgroundTasks,
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
-) -> Dict[str, Any]:
+) -> Union[Dict[str, Any], ORJSONResponse]:
     """
     Process analytic user prompt with authentication and audit logging.
-    Includes AWS SQS audit logging before sending response.
+    The AWS SQS audit log is sent as a background task after the response,
+    so the SQS round-trip never adds to request latency.
     """
     user_id = None
     username = None
@@ -66,26 +119,51 @@ async def receive_userprompt(
     result = None
     
     try:
-        # Extract user info from JWT for audit logging
+        # Extract user info from JWT for audit logging. The payload is kept on
+        # the request so query_handler does not verify the same token again.
         try:
             jwt_payload = validate_jwt_token(credentials)
+            http_request.state.jwt_payload = jwt_payload
             user_id = jwt_payload.get("sub")
-            username = jwt_payload.get("userName") or jwt_payload.get("email", "").split("@")[0]
+            username = _username_from_payload(jwt_payload)
         except Exception as jwt_error:
-            logger.warning(f"Failed to extract user info for audit: {jwt_error}")
+            logger.warning("Failed to extract user info for audit: %s", jwt_error)
+        
+        body = await http_request.body()
+        if len(body) > _MAX_REQUEST_BODY_BYTES:
+            error_msg = _VALIDATION_USER_MESSAGES["too_long"]
+            logger.warning("Request body too large: %d bytes", len(body))
+            
+            audit_service = get_audit_sqs_service()
+            background_tasks.add_task(
+                audit_service.send_analytics_query_audit,
+                statusCode=400,
+                user_id=user_id,
+                username=username or "unknown",
+                prompt="",
+                success=False,
+                message=error_msg
+            )
+            
+            return {
+                "success": False,
+                "message": error_msg,
+                "chart_image": None
+            }
         
-        # Parse and validate request
-        request_data = await http_request.json()
-        request = PromptRequest(**request_data)
+        # Parse and validate the raw body in one pass inside pydantic-core, with
+        # no intermediate Python dict. Malformed JSON is a ValidationError too.
+        request = PromptRequest.model_validate_json(body)
         prompt = request.prompt
         
         # Process the request
         result = await query_processor.query_handler(request, http_request, credentials)
         
-        # Send audit log before returning response
+        # Send audit log once the response is on its way
         audit_service = get_audit_sqs_service()
         
-        audit_service.send_analytics_query_audit(
+        background_tasks.add_task(
+            audit_service.send_analytics_query_audit,
             statusCode=200,
             user_id=user_id,
             username=username or "unknown",
@@ -94,27 +172,21 @@ async def receive_userprompt(
             message=result.get("message") if not result.get("success") else None
         )
         
-        return result
+        # Returned as a response object so FastAPI skips validating and re-encoding
+        # the dict (and its large chart_image) against response_model, which is
+        # then only used for the OpenAPI schema
+        return ORJSONResponse(result)
         
     except ValidationError as e:
         # Extract validation error message
-        error_msg = ""
-        if e.errors():
-            error_detail = e.errors()[0]
-            if "Potentially malicious content detected" in error_detail.get("msg", ""):
-                error_msg = "Request blocked for security reasons"
-            elif "Prompt cannot be empty" in error_detail.get("msg", ""):
-                error_msg = "Prompt cannot be empty"
-            elif "Prompt too long" in error_detail.get("msg", ""):
-                error_msg = "Prompt exceeds maximum length"
-            else:
-                error_msg = "Invalid request format"
+        error_msg = _validation_error_message(e)
         
-        logger.warning(f"Validation failed: {error_msg}")
+        logger.warning("Validation failed: %s", error_msg)
         
         # Send audit log for validation failure
         audit_service = get_audit_sqs_service()
-        audit_service.send_analytics_query_audit(
+        background_tasks.add_task(
+            audit_service.send_analytics_query_audit,
             statusCode=400,
             user_id=user_id,
             username=username or "unknown",
@@ -130,11 +202,12 @@ async def receive_userprompt(
         }
         
     except Exception as e:
-        logger.exception(f"Unexpected error in API endpoint: {e}")
+        logger.exception("Unexpected error in API endpoint: %s", e)
         
         # Send audit log for unexpected errors
         audit_service = get_audit_sqs_service()
-        audit_service.send_analytics_query_audit(
+        background_tasks.add_task(
+            audit_service.send_analytics_query_audit,
             statusCode=500,
             user_id=user_id,
             username=username or "unknown",
@@ -152,6 +225,7 @@ async def receive_userprompt(
 
 @app.delete("/api/analytics/conversation/clear")
 async def clear_conversation_history(
+    background_tasks: BackgroundTasks,
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
 ) -> Dict[str, Any]:
     """
@@ -185,7 +259,7 @@ async def clear_conversation_history(
         # Validate JWT and extract user info
         jwt_payload = validate_jwt_token(credentials)
         user_id = jwt_payload.get("sub")
-        username = jwt_payload.get("userName") or jwt_payload.get("email", "").split("@")[0]
+        username = _username_from_payload(jwt_payload)
         
         if not user_id:
             logger.warning("User ID not found in JWT token")
@@ -194,19 +268,19 @@ async def clear_conversation_history(
                 "message": "Invalid authentication token"
             }
         
-        # Get query context service
-        from app.services.query_context_service import QueryContextService
-        context_service = QueryContextService()
+        # Shared query context service (its DynamoDB clients are built once per process)
+        context_service = get_query_context_service()
         
         # Clear the conversation context
         success = context_service.clear_query_context(user_id)
         
         if success:
-            logger.info(f"Conversation history cleared for user: {username} (ID: {user_id})")
+            logger.info("Conversation history cleared for user: %s (ID: %s)", username, user_id)
             
             # Send audit log
             audit_service = get_audit_sqs_service()
-            audit_service.send_analytics_query_audit(
+            background_tasks.add_task(
+                audit_service.send_analytics_query_audit,
                 statusCode=200,
                 user_id=user_id,
                 username=username,
@@ -220,7 +294,7 @@ async def clear_conversation_history(
                 "message": "Conversation history cleared successfully"
             }
         else:
-            logger.warning(f"Failed to clear conversation history for user: {username} (ID: {user_id})")
+            logger.warning("Failed to clear conversation history for user: %s (ID: %s)", username, user_id)
             return {
                 "success": False,
                 "message": "Failed to clear conversation history"
@@ -231,7 +305,7 @@ async def clear_conversation_history(
         raise http_exc
         
     except Exception as e:
-        logger.exception(f"Unexpected error clearing conversation history: {e}")
+        logger.exception("Unexpected error clearing conversation history: %s", e)
         
         # Try to send audit log
         try:
@@ -239,7 +313,8 @@ async def clear_conversation_history(
             username = jwt_payload.get("userName") if 'jwt_payload' in locals() else "unknown"
             
             audit_service = get_audit_sqs_service()
-            audit_service.send_analytics_query_audit(
+            background_tasks.add_task(
+                audit_service.send_analytics_query_audit,
                 statusCode=500,
                 user_id=user_id or "unknown",
                 username=username,
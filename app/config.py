@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+from functools import lru_cache
 
 def load_environment_config():
     """
@@ -43,41 +44,64 @@ load_environment_config()
 # AWS Secrets Manager integration (conditional)
 USE_SECRETS_MANAGER: bool = os.getenv('USE_SECRETS_MANAGER', 'true').lower() == 'true'
 
-if USE_SECRETS_MANAGER:
-    try:
-        from app.services.aws_secrets import get_jwt_public_key, get_openai_api_key, get_secrets_manager
-        
-        secrets_manager = get_secrets_manager()
-        
-        if secrets_manager.available:
-            # Retrieve secrets from AWS Secrets Manager with environment variable fallbacks
-            OPENAI_API_KEY = get_openai_api_key(os.getenv("OPENAI_API_KEY"))
-            JWT_SECRET_KEY = get_jwt_public_key(os.getenv("JWT_SECRET_KEY"))
+# Settings that may come from AWS Secrets Manager. They are resolved on first
+# access (see __getattr__), so importing this module never waits on boto3 or a
+# Secrets Manager round-trip.
+_SECRET_SETTINGS = ("OPENAI_API_KEY", "JWT_SECRET_KEY", "USE_LLM")
+
+
+@lru_cache(maxsize=1)
+def _load_secrets() -> dict:
+    """Resolve the secret settings once, from AWS Secrets Manager when enabled."""
+    if USE_SECRETS_MANAGER:
+        try:
+            from app.services.aws_secrets import get_jwt_public_key, get_openai_api_key, get_secrets_manager
             
-            print(f"🔐 AWS Secrets Manager: Connected - Using secure secrets from region {secrets_manager.region_name}")
-        else:
-            # Fall back to environment variables
-            OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-            JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-            print("⚠️  AWS Secrets Manager: Unavailable - Using environment variables")
+            secrets_manager = get_secrets_manager()
             
-    except ImportError as e:
-        print(f"⚠️  AWS Secrets Manager import failed: {e} - Using environment variables")
-        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-        JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    except Exception as e:
-        print(f"⚠️  AWS Secrets Manager initialization failed: {e} - Using environment variables")
-        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-        JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-else:
-    # Use environment variables only
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    print("🔧 AWS Secrets Manager: Disabled - Using environment variables only")
+            if secrets_manager.available:
+                # Retrieve secrets from AWS Secrets Manager with environment variable fallbacks
+                openai_api_key = get_openai_api_key(os.getenv("OPENAI_API_KEY"))
+                jwt_secret_key = get_jwt_public_key(os.getenv("JWT_SECRET_KEY"))
+                
+                print(f"🔐 AWS Secrets Manager: Connected - Using secure secrets from region {secrets_manager.region_name}")
+            else:
+                # Fall back to environment variables
+                openai_api_key = os.getenv("OPENAI_API_KEY", "")
+                jwt_secret_key = os.getenv("JWT_SECRET_KEY")
+                print("⚠️  AWS Secrets Manager: Unavailable - Using environment variables")
+                
+        except ImportError as e:
+            print(f"⚠️  AWS Secrets Manager import failed: {e} - Using environment variables")
+            openai_api_key = os.getenv("OPENAI_API_KEY", "")
+            jwt_secret_key = os.getenv("JWT_SECRET_KEY")
+        except Exception as e:
+            print(f"⚠️  AWS Secrets Manager initialization failed: {e} - Using environment variables")
+            openai_api_key = os.getenv("OPENAI_API_KEY", "")
+            jwt_secret_key = os.getenv("JWT_SECRET_KEY")
+    else:
+        # Use environment variables only
+        openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        jwt_secret_key = os.getenv("JWT_SECRET_KEY")
+        print("🔧 AWS Secrets Manager: Disabled - Using environment variables only")
+    
+    return {
+        "OPENAI_API_KEY": openai_api_key,
+        "JWT_SECRET_KEY": jwt_secret_key,
+        "USE_LLM": bool(openai_api_key),
+    }
+
+
+def __getattr__(name):
+    """Resolve secret settings lazily (PEP 562)."""
+    if name in _SECRET_SETTINGS:
+        return _load_secrets()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Other configuration variables
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-USE_LLM = bool(OPENAI_API_KEY)
+# Model for the two-way report tool routing; a small model is enough for that task
+OPENAI_ROUTER_MODEL = os.getenv("OPENAI_ROUTER_MODEL", "gpt-4o-mini")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
 # default to ap-southeast-1 if not provided
@@ -98,9 +122,17 @@ ADMIN_API_BASE_URL = os.getenv("ADMIN_URL")
 
 # AWS SQS Audit Logging Configuration
 AUDIT_SQS_QUEUE_URL = os.getenv("AUDIT_SQS_QUEUE_URL")
+# Audit logs are sent with SendMessageBatch: up to AUDIT_BATCH_SIZE per call
+# (SQS allows at most 10), waiting at most AUDIT_BATCH_LINGER_MS for a batch to fill
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "10"))
+AUDIT_BATCH_LINGER_MS = int(os.getenv("AUDIT_BATCH_LINGER_MS", "200"))
 
 # JWT configuration
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
+# Verified tokens are cached to skip repeated signature checks. Entries live for
+# JWT_CACHE_TTL seconds, or until the token's own expiry if that comes first.
+JWT_CACHE_MAX = int(os.getenv("JWT_CACHE_MAX", "10000"))
+JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", "60"))
 
 
 # Maximum number of assistant->tool cycles before we force-stop the agent
@@ -48,42 +48,42 @@ Architecture:
                   └──────────────────┘
 """
 
-from app.orchestration.query_understanding_agent import (
-    get_query_understanding_agent,
-    QueryUnderstandingAgent,
-    QueryUnderstandingResult
-)
+import importlib
 
-from app.orchestration.planner_agent import (
-    create_execution_plan,
-    ExecutionPlan,
-    PlanStep
-)
-
-from app.orchestration.complex_query_executor import (
-    execute_plan,
-    ExecutionState
-)
-
-from app.orchestration.simple_query_executor import (
-    run_analytics_query,
-    AnalyticsState
-)
-
-__all__ = [
+# Public name -> defining submodule. Submodules are imported on first attribute
+# access (PEP 562), so importing the package does not pull in LangChain, LangGraph
+# and the OpenAI client until a component is actually used.
+_LAZY_EXPORTS = {
     # Query Understanding
-    "get_query_understanding_agent",
-    "QueryUnderstandingAgent",
-    "QueryUnderstandingResult",
+    "get_query_understanding_agent": "query_understanding_agent",
+    "QueryUnderstandingAgent": "query_understanding_agent",
+    "QueryUnderstandingResult": "query_understanding_agent",
     
     # Planning
-    "create_execution_plan",
-    "ExecutionPlan",
-    "PlanStep",
+    "create_execution_plan": "planner_agent",
+    "ExecutionPlan": "planner_agent",
+    "PlanStep": "planner_agent",
     
     # Execution
-    "execute_plan",
-    "ExecutionState",
-    "run_analytics_query",
-    "AnalyticsState",
-]
+    "execute_plan": "complex_query_executor",
+    "ExecutionState": "complex_query_executor",
+    "run_analytics_query": "simple_query_executor",
+    "run_analytics_queries_batch": "simple_query_executor",
+    "AnalyticsState": "simple_query_executor",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
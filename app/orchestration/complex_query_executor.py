@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import TypedDict, List, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
@@ -8,6 +9,7 @@ from app.prompts.complex_executor_prompts import (
     ComplexExecutorResponseFormattingPrompt
 )
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
+from app.services.http_clients import get_openai_http_clients
 
 logger = logging.getLogger("complex_query_executor")
 
@@ -16,6 +18,24 @@ pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
 
+@lru_cache(maxsize=None)
+def _get_llm(temperature: float) -> ChatOpenAI:
+    """
+    Get the LLM client for a temperature, created once and reused across steps.
+    
+    Tool selection and chart suggestions run at temperature 0, response
+    formatting at 0.7; all clients share the keep-alive HTTP pools.
+    """
+    http_client, http_async_client = get_openai_http_clients()
+    return ChatOpenAI(
+        model=OPENAI_MODEL,
+        temperature=temperature,
+        api_key=OPENAI_API_KEY,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
 # ============================================================================
 # State Management
 # ============================================================================
@@ -76,7 +96,7 @@ async def execute_query_analytics(
     tools = get_analytics_tools()
     
     # Create LLM with tool calling capability
-    llm = ChatOpenAI(model=OPENAI_MODEL, temperature=0, api_key=OPENAI_API_KEY)
+    llm = _get_llm(temperature=0)
     llm_with_tools = llm.bind_tools(tools)
     
     # Initialize secure prompt template for tool selection
@@ -98,8 +118,8 @@ async def execute_query_analytics(
     ]
     
     try:
-        # Let LLM select and call the tool
-        response = llm_with_tools.invoke(messages)
+        # Let LLM select and call the tool (native async, no executor thread)
+        response = await llm_with_tools.ainvoke(messages)
         
         if response.tool_calls:
             tool_call = response.tool_calls[0]
@@ -261,12 +281,8 @@ No explanation, just the type name.
 """
     
     try:
-        # Initialize LLM
-        llm = ChatOpenAI(
-            api_key=OPENAI_API_KEY,
-            model=OPENAI_MODEL,
-            temperature=0.0  # Deterministic output
-        )
+        # Shared deterministic LLM client
+        llm = _get_llm(temperature=0.0)
         
         # Get LLM suggestion
         response = await llm.ainvoke(suggestion_prompt)
@@ -428,8 +444,8 @@ async def execute_format_response(
     
     try:
         # Use LLM to generate natural response
-        llm = ChatOpenAI(model=OPENAI_MODEL, temperature=0.7, api_key=OPENAI_API_KEY)
-        response = llm.invoke(messages)
+        llm = _get_llm(temperature=0.7)
+        response = await llm.ainvoke(messages)
         
         message_text = response.content
         logger.info(f"LLM response generated ({len(message_text)} chars)")
@@ -1,6 +1,7 @@
 import logging
 import json
 import uuid
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
@@ -8,6 +9,7 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from config.app_config import OPENAI_API_KEY, OPENAI_MODEL
 from app.prompts.planner_prompts import PlannerPrompt
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
+from app.services.http_clients import get_openai_http_clients
 
 logger = logging.getLogger("planner_agent")
 
@@ -16,6 +18,19 @@ pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
 
+@lru_cache(maxsize=1)
+def _get_planner_llm() -> ChatOpenAI:
+    """Get the planning LLM client, created once and reused across plans."""
+    http_client, http_async_client = get_openai_http_clients()
+    return ChatOpenAI(
+        model=OPENAI_MODEL,
+        temperature=0,  # Deterministic planning
+        api_key=OPENAI_API_KEY,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
 # ============================================================================
 # PYDANTIC MODELS FOR PLAN STRUCTURE
 # ============================================================================
@@ -150,12 +165,8 @@ def create_execution_plan(
     logger.info(f"Query Type: {query_type}")
     logger.info(f"Comparison Targets: {comparison_targets}")
     
-    # Initialize LLM
-    llm = ChatOpenAI(
-        model=OPENAI_MODEL,
-        temperature=0,  # Deterministic planning
-        api_key=OPENAI_API_KEY
-    )
+    # Shared LLM client
+    llm = _get_planner_llm()
     
     # Initialize secure prompt template
     planner_prompt = PlannerPrompt()
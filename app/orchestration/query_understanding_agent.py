@@ -1,12 +1,17 @@
-import json
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import from_json
 from config.app_config import OPENAI_API_KEY, OPENAI_MODEL
 from app.prompts.query_understanding_prompts import QueryUnderstandingPrompt
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
+from app.services.http_clients import get_openai_http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +19,100 @@ logger = logging.getLogger(__name__)
 pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
+# Maximum number of normalized queries kept in the per-agent result cache
+_RESULT_CACHE_SIZE = 1024
+# Same limit as the API request validator and the prompt template
+_MAX_QUERY_LENGTH = 5000
+# Results below this confidence are likely bad parses and are never cached
+_MIN_CACHEABLE_CONFIDENCE = 0.5
+# Filler words dropped from cache keys so paraphrases like "show me X for Y" and
+# "what is X of Y?" share one entry. Lead-in words are only dropped before the
+# first other word: later on, short words like "a" or "you" may name the target
+# ("success rate for domain a").
+_CACHE_KEY_LEAD_IN_WORDS = frozenset({
+    "a", "an", "the", "me", "i", "you", "is", "of", "for", "to",
+    "please", "can", "could", "would", "like", "want", "give", "tell",
+    "show", "see", "get", "display", "what", "what's", "whats",
+})
+# Connectors between the metric and its target, dropped anywhere in the query
+_CACHE_KEY_CONNECTOR_WORDS = frozenset({"the", "is", "of", "for", "to"})
+_CACHE_KEY_TRAILING_PUNCTUATION = "?!.,;:"
+# The system prompt is static: build, integrity-check and wrap it once per process.
+# Reusing the same message keeps the prompt prefix byte-identical across calls.
+_SYSTEM_MESSAGE = SystemMessage(content=QueryUnderstandingPrompt().get_system_prompt())
+# Routes requests with the same system prompt to the same OpenAI prompt cache;
+# derived from the template hash so editing the prompt starts a fresh cache
+_PROMPT_CACHE_KEY = f"query-understanding-{QueryUnderstandingPrompt.TEMPLATE_HASH[:16]}"
+
+# Deterministic pre-classifier. Only unambiguous queries are answered without
+# the LLM; anything that could carry more intent or slots falls through.
+_OUT_OF_SCOPE_RE = re.compile(
+    r"^\s*(?:hi|hello|hey|good (?:morning|afternoon|evening)|how are you|who are you"
+    r"|what(?:'s| is) your name|what can you do|tell me a joke"
+    r"|what(?:'s| is) the weather(?: today)?|thanks|thank you)(?: there)?\s*[!.?]*\s*$",
+    re.IGNORECASE,
+)
+_FILE_NAME_RE = re.compile(r"(?<![\w.\-])[\w\-]+\.(?:csv|json|xlsx)\b", re.IGNORECASE)
+_DOMAIN_NAME_RE = re.compile(r"\b([A-Za-z][\w\-]*)\s+domain\b", re.IGNORECASE)
+# Words that can precede "domain" without naming one ("for this domain")
+_NON_DOMAIN_WORDS = frozenset({
+    "a", "an", "the", "this", "that", "my", "our", "your", "each", "every",
+    "which", "what", "any", "all", "same", "one", "other", "another", "specific",
+})
+# A query that is nothing but a target ("customer.csv", "payment domain")
+_BARE_FILE_NAME_RE = re.compile(r"^\s*([\w\-]+\.(?:csv|json|xlsx))\s*[!.?]*\s*$", re.IGNORECASE)
+_BARE_DOMAIN_NAME_RE = re.compile(r"^\s*([A-Za-z][\w\-]*)\s+domain\s*[!.?]*\s*$", re.IGNORECASE)
+_SUCCESS_RE = re.compile(r"\bsuccess(?:ful)?\b", re.IGNORECASE)
+_FAILURE_RE = re.compile(r"\b(?:fail(?:s|ed|ures?)?|errors?)\b", re.IGNORECASE)
+# Comparisons, multiple domains, chart types and negations need the LLM
+_FAST_PATH_BLOCKERS_RE = re.compile(
+    r"\b(?:compare|comparison|comparing|vs|versus|between|and|both|trend|domains"
+    r"|chart|graph|plot|pie|bar|line|donut|doughnut|area|not|without)\b",
+    re.IGNORECASE,
+)
+_OUT_OF_SCOPE_CLARIFICATION = (
+    "I'm an analytics assistant specialized in data analysis. "
+    "I can help you with success rates, failure rates, and data reports. "
+    "What would you like to analyze?"
+)
+_GENERAL_QUERY_CLARIFICATION = (
+    "I can help you with analytics! Please specify:\n"
+    "1. What type of analysis? (success rate, failure rate)\n"
+    "2. Which file or domain to analyze?"
+)
+# intent -> (slots that must all be filled, clarification asked otherwise).
+# An empty slot set means the clarification is always asked: out_of_scope
+# queries are complete but not actionable.
+_CLARIFICATION_RULES: Dict[str, Tuple[FrozenSet[str], str]] = {
+    "out_of_scope": (frozenset(), _OUT_OF_SCOPE_CLARIFICATION),
+    "general_query": (frozenset({"domain_name", "file_name"}), _GENERAL_QUERY_CLARIFICATION),
+}
+_UNPARSEABLE_CLARIFICATION = (
+    "I couldn't understand your request. "
+    "Please specify what you'd like to analyze and which file or domain."
+)
+_EMPTY_QUERY_CLARIFICATION = (
+    "Please tell me what you'd like to analyze, "
+    "for example 'success rate for customer.csv'."
+)
+_QUERY_TOO_LONG_CLARIFICATION = (
+    "Your question is too long. "
+    "Please shorten it to under 5000 characters."
+)
+_ERROR_CLARIFICATION = (
+    "I encountered an error processing your request. "
+    "Please try rephrasing your question."
+)
+
 
 class QueryUnderstandingResult(BaseModel):
     """Structured result from query understanding."""
+    # Results are built from already-validated data and then adjusted in place by
+    # validate_completeness, so assignments are deliberately not re-validated
+    model_config = ConfigDict(validate_assignment=False, extra='ignore')
+    
     intent: Optional[str] = Field(None, description="Detected user intent (success_rate, failure_rate, both_rate, domain_distribution, etc.)")
-    slots: Dict[str, Any] = Field(default_factory=dict, description="Extracted slot values (domain_name, file_name, etc.)")
+    slots: Dict[str, Optional[str]] = Field(default_factory=dict, description="Extracted slot values (domain_name, file_name, etc.)")
     chart_type: Optional[str] = Field(None, description="Preferred chart type (bar, pie, line, donut, area)")
     confidence: float = Field(0.0, description="Confidence score (0.0 to 1.0)")
     missing_required: List[str] = Field(default_factory=list, description="List of required slots that are missing")
@@ -29,17 +123,179 @@ class QueryUnderstandingResult(BaseModel):
     comparison_targets: List[str] = Field(default_factory=list, description="List of targets for comparison queries")
 
 
+def _fallback_result(clarification: str) -> QueryUnderstandingResult:
+    """Build the incomplete general_query result returned when extraction fails."""
+    # Every value is a trusted literal, so skip validation
+    return QueryUnderstandingResult.model_construct(
+        intent="general_query",
+        slots={},
+        confidence=0.0,
+        missing_required=["intent", "domain_name or file_name"],
+        is_complete=False,
+        clarification_needed=clarification
+    )
+
+
+# Prebuilt fallbacks; callers receive deep copies because results get mutated
+_UNPARSEABLE_RESULT = _fallback_result(_UNPARSEABLE_CLARIFICATION)
+_ERROR_RESULT = _fallback_result(_ERROR_CLARIFICATION)
+_EMPTY_QUERY_RESULT = _fallback_result(_EMPTY_QUERY_CLARIFICATION)
+_QUERY_TOO_LONG_RESULT = _fallback_result(_QUERY_TOO_LONG_CLARIFICATION)
+
+
+def _bare_target_slots(user_query: str) -> Optional[Dict[str, str]]:
+    """Return the slot for a query that only names a file or a domain, else None."""
+    match = _BARE_FILE_NAME_RE.match(user_query)
+    if match:
+        return {"file_name": match.group(1)}
+    match = _BARE_DOMAIN_NAME_RE.match(user_query)
+    if match and match.group(1).lower() not in _NON_DOMAIN_WORDS:
+        return {"domain_name": match.group(1)}
+    return None
+
+
+def _fast_classify(user_query: str) -> Optional[QueryUnderstandingResult]:
+    """
+    Answer empty, oversized, greeting, bare-target and single-target metric queries without the LLM.
+    
+    Args:
+        user_query: The user's natural language query
+        
+    Returns:
+        QueryUnderstandingResult when the query is unambiguous, otherwise None
+    """
+    # Empty and oversized queries are answered before any regex or LLM work
+    if not user_query or user_query.isspace():
+        return _EMPTY_QUERY_RESULT.model_copy(deep=True)
+    if len(user_query) > _MAX_QUERY_LENGTH:
+        return _QUERY_TOO_LONG_RESULT.model_copy(deep=True)
+    
+    if _OUT_OF_SCOPE_RE.match(user_query):
+        return QueryUnderstandingResult(
+            intent="out_of_scope",
+            query_type="simple",
+            confidence=0.95,
+            is_complete=True,
+            clarification_needed=_OUT_OF_SCOPE_CLARIFICATION,
+        )
+    
+    bare_target = _bare_target_slots(user_query)
+    if bare_target is not None:
+        target = next(iter(bare_target.values()))
+        return QueryUnderstandingResult(
+            intent="general_query",
+            query_type="simple",
+            slots=bare_target,
+            confidence=0.9,
+            missing_required=["intent"],
+            is_complete=False,
+            clarification_needed=(
+                f"I understand you want to analyze {target}. Which metric would you like to analyze? "
+                "(e.g., 'success rate' or 'failure rate')"
+            ),
+        )
+    
+    if _FAST_PATH_BLOCKERS_RE.search(user_query):
+        return None
+    
+    is_success = _SUCCESS_RE.search(user_query) is not None
+    is_failure = _FAILURE_RE.search(user_query) is not None
+    if is_success == is_failure:
+        return None
+    
+    file_names = set(_FILE_NAME_RE.findall(user_query))
+    domain_names = set(_DOMAIN_NAME_RE.findall(user_query))
+    if any(name.lower() in _NON_DOMAIN_WORDS for name in domain_names):
+        return None
+    
+    # Exactly one target: either a single file or a single domain
+    if len(file_names) + len(domain_names) != 1:
+        return None
+    slots = {"file_name": file_names.pop()} if file_names else {"domain_name": domain_names.pop()}
+    
+    return QueryUnderstandingResult(
+        intent="success_rate" if is_success else "failure_rate",
+        query_type="simple",
+        slots=slots,
+        confidence=0.95,
+        is_complete=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_llm() -> ChatOpenAI:
+    """Build the query understanding LLM client once per process."""
+    http_client, http_async_client = get_openai_http_clients()
+    return ChatOpenAI(
+        model=OPENAI_MODEL,
+        temperature=0.0,  # Deterministic for consistent extraction
+        api_key=OPENAI_API_KEY,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        # One retry: a failed extraction falls back to a clarification instead
+        # of stalling the request behind exponential backoff
+        max_retries=1,
+        # Structured Outputs: responses always parse and match the result schema
+        model_kwargs={"response_format": QueryUnderstandingPrompt.RESPONSE_FORMAT}
+    )
+
+
 class QueryUnderstandingAgent:
     
     def __init__(self):
         """Initialize the query understanding agent with secure prompt template."""
-        self.llm = ChatOpenAI(
-            model=OPENAI_MODEL,
-            temperature=0.0,  # Deterministic for consistent extraction
-            api_key=OPENAI_API_KEY
-        )
+        self.llm = _get_llm()
         # Initialize secure prompt template
         self.prompt_template = QueryUnderstandingPrompt()
+        self.system_message = _SYSTEM_MESSAGE
+        # LRU of normalized query -> result. Lookups and inserts never await,
+        # so they cannot interleave on the event loop and need no lock.
+        self._result_cache: "OrderedDict[str, QueryUnderstandingResult]" = OrderedDict()
+        # Normalized query -> future of the LLM call currently answering it, so
+        # concurrent identical queries share one round-trip
+        self._pending: Dict[str, "asyncio.Future[QueryUnderstandingResult]"] = {}
+    
+    @staticmethod
+    def _cache_key(user_query: str) -> str:
+        """
+        Reduce a query to the words that can affect intent and slots.
+        
+        Whitespace, trailing punctuation, a lead-in like "show me" and connector
+        words are dropped so simple paraphrases share an entry. Case is preserved
+        on purpose: file names are looked up case-sensitively.
+        """
+        kept = []
+        for token in user_query.split():
+            token = token.rstrip(_CACHE_KEY_TRAILING_PUNCTUATION)
+            lowered = token.lower()
+            if not token or lowered in _CACHE_KEY_CONNECTOR_WORDS:
+                continue
+            if not kept and lowered in _CACHE_KEY_LEAD_IN_WORDS:
+                continue
+            kept.append(token)
+        return " ".join(kept)
+    
+    def _get_cached_result(self, key: str) -> Optional[QueryUnderstandingResult]:
+        """Return a private copy of a cached result, or None on a miss."""
+        cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        self._result_cache.move_to_end(key)
+        # Callers mutate the result (validate_completeness), so never hand out the stored object
+        return cached.model_copy(deep=True)
+    
+    def _cache_result(self, key: str, result: QueryUnderstandingResult) -> None:
+        """Store a successful, confident parse and evict the least recently used entry."""
+        if not key or result.confidence < _MIN_CACHEABLE_CONFIDENCE:
+            return
+        self._result_cache[key] = result.model_copy(deep=True)
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached query understanding results."""
+        self._result_cache.clear()
     
     async def extract_intent_and_slots(self, user_query: str) -> QueryUnderstandingResult:
         """
@@ -51,66 +307,208 @@ class QueryUnderstandingAgent:
         Returns:
             QueryUnderstandingResult with extracted intent, slots, and completeness info
         """
+        fast_result = _fast_classify(user_query)
+        if fast_result is not None:
+            logger.debug("Query classified without LLM: intent=%s", fast_result.intent)
+            return fast_result
+        
+        cache_key = self._cache_key(user_query)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            logger.debug("Query understanding cache hit")
+            return cached
+        
+        pending = self._pending.get(cache_key) if cache_key else None
+        if pending is not None:
+            logger.debug("Joining in-flight query understanding call")
+            try:
+                return (await asyncio.shield(pending)).model_copy(deep=True)
+            except asyncio.CancelledError:
+                # Only re-raise our own cancellation; if the caller that owned the
+                # LLM call was cancelled, answer the query ourselves
+                if not pending.cancelled():
+                    raise
+        
+        if not cache_key:
+            return await self._understand_with_llm(user_query, cache_key)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[cache_key] = future
         try:
-            # Get secure system prompt with leakage prevention
-            system_prompt = self.prompt_template.get_system_prompt()
+            result = await self._understand_with_llm(user_query, cache_key)
+            future.set_result(result.model_copy(deep=True))
+            return result
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._pending.get(cache_key) is future:
+                del self._pending[cache_key]
+    
+    async def batch_extract_intent_and_slots(
+        self,
+        user_queries: List[str],
+        max_concurrency: int = 10
+    ) -> List[QueryUnderstandingResult]:
+        """
+        Extract intent and slots for several queries concurrently.
+        
+        Fast-path, cached and duplicate queries resolve without extra LLM calls;
+        the rest run with at most max_concurrency LLM requests in flight.
+        
+        Args:
+            user_queries: The user's natural language queries
+            max_concurrency: Maximum number of extractions running at the same time
             
-            # Format user message with security validation and structural isolation
-            user_message = self.prompt_template.format_user_message(query=user_query)
+        Returns:
+            QueryUnderstandingResults in the same order as user_queries
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _bounded(user_query: str) -> QueryUnderstandingResult:
+            async with semaphore:
+                return await self.extract_intent_and_slots(user_query)
+        
+        return list(await asyncio.gather(*(_bounded(query) for query in user_queries)))
+    
+    async def stream_extract_intent_and_slots(self, user_query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream query understanding so a chat UI can react before the JSON completes.
+        
+        Yields {"type": "partial", "intent": ..., "query_type": ...} whenever one of
+        those allowlisted fields is first known from the partially streamed JSON,
+        then a single {"type": "final", "result": QueryUnderstandingResult} event.
+        Fast-path and cached queries only yield the final event.
+        
+        Args:
+            user_query: The user's natural language query
+        """
+        fast_result = _fast_classify(user_query)
+        if fast_result is not None:
+            yield {"type": "final", "result": fast_result}
+            return
+        
+        cache_key = self._cache_key(user_query)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            yield {"type": "final", "result": cached}
+            return
+        
+        try:
+            messages = self._build_messages(user_query)
+            chunks: List[str] = []
+            preview: Dict[str, str] = {}
+            async for chunk in self.llm.astream(messages, prompt_cache_key=_PROMPT_CACHE_KEY):
+                chunks.append(chunk.content)
+                update = self._partial_preview("".join(chunks), preview)
+                if update:
+                    preview.update(update)
+                    yield {"type": "partial", **preview}
+            result = self._parse_response("".join(chunks).strip(), cache_key)
+        except Exception as e:
+            logger.exception("Error in streamed query understanding: %s", e)
+            result = _ERROR_RESULT.model_copy(deep=True)
+        
+        yield {"type": "final", "result": result}
+    
+    def _partial_preview(self, partial_text: str, preview: Dict[str, str]) -> Dict[str, str]:
+        """Return allowlisted fields of partial JSON that are not in the preview yet."""
+        try:
+            # Incomplete trailing strings are dropped, so values are never cut off
+            partial = from_json(partial_text, allow_partial=True)
+        except ValueError:
+            return {}
+        if not isinstance(partial, dict):
+            return {}
+        allowlists = {
+            "intent": self.prompt_template.INTENTS,
+            "query_type": self.prompt_template.QUERY_TYPES,
+        }
+        return {
+            field: partial[field] for field, allowed in allowlists.items()
+            if field not in preview and partial.get(field) in allowed
+        }
+    
+    async def _understand_with_llm(self, user_query: str, cache_key: str) -> QueryUnderstandingResult:
+        """
+        Run the LLM extraction for a query and cache a confident result.
+        
+        Args:
+            user_query: The user's natural language query
+            cache_key: Normalized cache key for the query
             
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_message)
-            ]
+        Returns:
+            QueryUnderstandingResult, or a fallback result if the LLM response is unusable
+        """
+        try:
+            messages = self._build_messages(user_query)
             
-            logger.info(f"Understanding query: '{user_query[:100]}...'")
+            response = await self.llm.ainvoke(messages, prompt_cache_key=_PROMPT_CACHE_KEY)
             
-            response = await self.llm.ainvoke(messages)
-            response_text = response.content.strip()
+            # Track how much of the static prompt prefix OpenAI served from its cache
+            token_usage = (response.response_metadata or {}).get("token_usage") or {}
+            prompt_tokens_details = token_usage.get("prompt_tokens_details") or {}
+            logger.debug(
+                "Query understanding prompt_tokens=%s cached_tokens=%s",
+                token_usage.get("prompt_tokens"), prompt_tokens_details.get("cached_tokens")
+            )
             
-            # Parse JSON response
-            try:
-                result_dict = json.loads(response_text)
-                
-                # Validate response schema with security checks
-                self.prompt_template.validate_response_schema(result_dict)
-                
-                # Extract chart_type from slots and move to top-level
-                chart_type = result_dict.get('slots', {}).pop('chart_type', None)
-                if chart_type:
-                    result_dict['chart_type'] = chart_type
-                
-                result = QueryUnderstandingResult(**result_dict)
-                
-                logger.info(f"Extracted intent: {result.intent}, slots: {result.slots}, chart_type: {result.chart_type}, complete: {result.is_complete}")
-                
-                return result
-                
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse LLM response as JSON: {e}")
-                logger.warning(f"Raw response: {response_text}")
-                
-                # Fallback: return incomplete result
-                return QueryUnderstandingResult(
-                    intent="general_query",
-                    slots={},
-                    confidence=0.0,
-                    missing_required=["intent", "domain_name or file_name"],
-                    is_complete=False,
-                    clarification_needed="I couldn't understand your request. Please specify what you'd like to analyze and which file or domain."
-                )
-                
+            return self._parse_response(response.content.strip(), cache_key)
+        
         except Exception as e:
-            logger.exception(f"Error in query understanding: {e}")
+            logger.exception("Error in query understanding: %s", e)
+            
+            return _ERROR_RESULT.model_copy(deep=True)
+    
+    def _build_messages(self, user_query: str) -> list:
+        """Build the LLM messages: the shared system message and the isolated query."""
+        # Format user message with security validation and structural isolation
+        user_message = self.prompt_template.format_user_message(query=user_query)
+        
+        logger.debug("Understanding query: %.100r", user_query)
+        
+        return [
+            self.system_message,
+            HumanMessage(content=user_message)
+        ]
+    
+    def _parse_response(self, response_text: str, cache_key: str) -> QueryUnderstandingResult:
+        """
+        Parse and validate the LLM's JSON response, caching a confident result.
+        
+        Raises:
+            PromptSecurityError: If the response fails schema validation
+        """
+        try:
+            # pydantic-core's parser: one native pass, no stdlib json round-trip
+            result_dict = from_json(response_text)
+            
+            # Validate response schema with security checks
+            self.prompt_template.validate_response_schema(result_dict)
+            
+            # Extract chart_type from slots and move to top-level
+            slots = result_dict.get('slots', {})
+            chart_type = slots.pop('chart_type', None)
+            if chart_type:
+                result_dict['chart_type'] = chart_type
+            # The strict schema emits every slot; keep only the ones that were filled
+            result_dict['slots'] = {key: value for key, value in slots.items() if value is not None}
             
-            return QueryUnderstandingResult(
-                intent="general_query",
-                slots={},
-                confidence=0.0,
-                missing_required=["intent", "domain_name or file_name"],
-                is_complete=False,
-                clarification_needed="I encountered an error processing your request. Please try rephrasing your question."
+            result = QueryUnderstandingResult.model_validate(result_dict)
+            
+        except ValueError as e:
+            logger.warning("Failed to parse LLM response as JSON: %s", e)
+            logger.warning("Raw response: %s", response_text)
+            
+            return _UNPARSEABLE_RESULT.model_copy(deep=True)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Extracted intent: %s, slots: %s, chart_type: %s, complete: %s",
+                result.intent, result.slots, result.chart_type, result.is_complete
             )
+        
+        self._cache_result(cache_key, result)
+        return result
     
     def validate_completeness(self, result: QueryUnderstandingResult) -> QueryUnderstandingResult:
         """
@@ -123,44 +521,20 @@ class QueryUnderstandingAgent:
         Returns:
             Updated result with validation information
         """
-        intent = result.intent
-        query_type = result.query_type
-        high_level_intent = result.high_level_intent
         result.clarification_needed = None
         
-        # Handle out_of_scope intent - always complete but not actionable
-        if intent == "out_of_scope":
-            result.clarification_needed = (
-                    "I'm an analytics assistant specialized in data analysis. "
-                    "I can help you with success rates, failure rates, and data reports. "
-                    "What would you like to analyze?"
-                )
+        rule = _CLARIFICATION_RULES.get(result.intent)
+        if rule is None:
             return result
         
-        elif intent == "general_query":
-            # Check what's already provided to avoid asking for it again
-            has_domain = "domain_name" in result.slots and result.slots["domain_name"]
-            has_file = "file_name" in result.slots and result.slots["file_name"]
-
-            # If either a domain or a file is provided, ask only for the metric type.
-            if not has_domain or not has_file:
-                
-                result.clarification_needed = (
-                    "I can help you with analytics! Please specify:\n"
-                    "1. What type of analysis? (success rate, failure rate)\n"
-                    "2. Which file or domain to analyze?"
-                )
-        
+        required_slots, clarification = rule
+        if not required_slots or not all(result.slots.get(slot) for slot in required_slots):
+            result.clarification_needed = clarification
         
         return result
 
 
-# Singleton instance
-_query_understanding_agent = None
-
+@lru_cache(maxsize=1)
 def get_query_understanding_agent() -> QueryUnderstandingAgent:
     """Get the singleton query understanding agent."""
-    global _query_understanding_agent
-    if _query_understanding_agent is None:
-        _query_understanding_agent = QueryUnderstandingAgent()
-    return _query_understanding_agent
+    return QueryUnderstandingAgent()
@@ -1,13 +1,25 @@
+import asyncio
+import copy
 import logging
-from typing import TypedDict, Literal, Optional
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import TypedDict, Literal, Optional, List, Tuple, AsyncIterator
+from cachetools import LRUCache, TTLCache
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
-from config.app_config import OPENAI_API_KEY, OPENAI_MODEL
+from config.app_config import OPENAI_API_KEY, OPENAI_ROUTER_MODEL
 from app.prompts.simple_executor_prompts import (
     SimpleExecutorToolSelectionPrompt,
     SimpleExecutorResponseFormattingPrompt
 )
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
+from app.services.chart_service import generate_analytics_chart
+from app.services.http_clients import get_openai_http_clients
+from app.tools.analytics_tools import get_analytics_tools
 
 
 logger = logging.getLogger("analytic_agent")
@@ -16,6 +28,126 @@ logger = logging.getLogger("analytic_agent")
 pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
+# Tool-selection system prompt is static. Building it once keeps it byte-identical
+# across calls, so OpenAI's automatic prompt-prefix caching can reuse it. Dynamic
+# content (query, report_type, targets) only ever goes into the user message.
+_TOOL_SELECTION_PROMPT = SimpleExecutorToolSelectionPrompt()
+_TOOL_SELECTOR_SYSTEM_PROMPT = _TOOL_SELECTION_PROMPT.get_system_prompt()
+
+
+# Keyword router: a two-way choice between report tools does not need an LLM
+# round-trip when the query clearly asks for one of them. Both keyword sets live
+# in one pattern so the query is scanned once; the named group tells them apart.
+# A negated keyword ("no errors", "without failures") flips its meaning, so it
+# matches the "negated" group and leaves the choice to the LLM.
+_SUCCESS_KEYWORDS = (
+    r"success(?:es|ful(?:ly)?)?|succeed(?:s|ed)?|wins?|passed?|uptime|completed?|completion"
+)
+_FAILURE_KEYWORDS = r"fail(?:s|ed|ures?)?|errors?|issues?|problems?|broken"
+_REPORT_KEYWORD_RE = re.compile(
+    rf"\b(?:(?P<negated>(?:no|not|without|zero|never)\s+(?:any\s+)?"
+    rf"(?:{_SUCCESS_KEYWORDS}|{_FAILURE_KEYWORDS}))"
+    rf"|(?P<success_rate>{_SUCCESS_KEYWORDS})"
+    rf"|(?P<failure_rate>{_FAILURE_KEYWORDS}))\b",
+    re.IGNORECASE,
+)
+
+# report_type -> analytics tool name
+_REPORT_TOOLS = {
+    "success_rate": "generate_success_rate_report",
+    "failure_rate": "generate_failure_rate_report",
+}
+
+# Short-lived cache of successful tool results, so repeating a question within
+# a minute skips the DynamoDB queries. Keys include org_id (tenant isolation).
+_TOOL_CACHE = TTLCache(maxsize=256, ttl=60)
+_TOOL_CACHE_LOCK = threading.Lock()
+
+# LLM tool selections for ambiguous queries:
+# (query, report_type, domain, file) -> (tool name, args without org_id).
+# Selections do not go stale with the data, so they are kept until evicted.
+_TOOL_SELECTION_CACHE = LRUCache(maxsize=1024)
+_TOOL_SELECTION_CACHE_LOCK = threading.Lock()
+
+
+def clear_analytics_cache() -> None:
+    """Clear cached tool selections and analytics tool results (e.g. after data is reloaded)."""
+    with _TOOL_CACHE_LOCK:
+        _TOOL_CACHE.clear()
+    with _TOOL_SELECTION_CACHE_LOCK:
+        _TOOL_SELECTION_CACHE.clear()
+    logger.debug("Cleared analytics tool result cache")
+
+
+@lru_cache(maxsize=1)
+def _get_chat_client() -> ChatOpenAI:
+    """
+    Get the single ChatOpenAI client shared by tool selection and formatting.
+    
+    Both LLM calls of a query go through one OpenAI client and the shared
+    keep-alive pools, so repeat calls reuse warm TLS connections.
+    Its defaults are the formatting settings; tool selection overrides model
+    and temperature per request through bind_tools.
+    """
+    http_client, http_async_client = get_openai_http_clients()
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0.7,
+        api_key=OPENAI_API_KEY,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_tool_selection_llm():
+    """
+    Get the tool-calling LLM, created once and reused across requests.
+    
+    Binding the tools once also keeps the serialized tool schema identical on
+    every call, which is part of the cached prompt prefix.
+    """
+    return _get_chat_client().bind_tools(
+        get_analytics_tools(),
+        model=OPENAI_ROUTER_MODEL,
+        temperature=0
+    )
+
+
+def _get_formatting_llm() -> ChatOpenAI:
+    """Get the response-formatting LLM (the shared client with its default settings)."""
+    return _get_chat_client()
+
+
+@lru_cache(maxsize=1)
+def _get_chart_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool used for chart rendering.
+    
+    Matplotlib rasterization is CPU-bound and holds the GIL, so concurrent
+    queries only render in parallel in separate processes. Workers import
+    chart_service, which selects the Agg backend before pyplot is loaded.
+    
+    The pool is created on the first chart request, when the server already
+    runs other threads (audit flusher, HTTP pools, request workers). Forking
+    such a process can copy locks held by those threads into the child, so
+    workers are started from a clean forkserver process instead.
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+def shutdown_chart_pool() -> None:
+    """Stop the chart rendering worker processes, if they were started."""
+    if _get_chart_pool.cache_info().currsize == 0:
+        return
+    pool = _get_chart_pool()
+    _get_chart_pool.cache_clear()
+    pool.shutdown()
+    logger.info("Chart rendering pool shut down")
+
 
 class AnalyticsState(TypedDict):
     """State for analytics workflow."""
@@ -27,17 +159,84 @@ class AnalyticsState(TypedDict):
     final_response: dict  # Structured response: {success, message, chart_image}
 
 
+def _route_by_keywords(user_query: str, report_type: Optional[str]) -> Optional[str]:
+    """
+    Pick the report type deterministically, without calling the LLM.
+    
+    Args:
+        user_query: User's natural language query
+        report_type: Report type from context (can be None)
+        
+    Returns:
+        "success_rate" or "failure_rate", or None if the query is ambiguous
+        (both or neither keyword set matches, or a keyword is negated)
+    """
+    # Explicit report_type from multi-turn context always wins
+    if report_type in _REPORT_TOOLS:
+        return report_type
+    
+    matched = None
+    for match in _REPORT_KEYWORD_RE.finditer(user_query):
+        if match.lastgroup == "negated":
+            return None
+        if matched is None:
+            matched = match.lastgroup
+        elif match.lastgroup != matched:
+            # Both keyword sets present: stop scanning, the query is ambiguous
+            return None
+    return matched
+
+
+def _invoke_report_tool(tools: list, tool_name: str, tool_args: dict) -> Optional[dict]:
+    """
+    Invoke the named analytics tool and tag its data with the report type.
+    
+    Successful results are cached for a short TTL, keyed on the tool name and
+    all arguments (including org_id). Callers always get their own copy.
+    
+    Returns:
+        Tool result dict, or None if no tool with that name is available
+    """
+    cache_key = (tool_name, tuple(sorted(tool_args.items())))
+    with _TOOL_CACHE_LOCK:
+        cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Tool result cache hit: %s", tool_name)
+        return copy.deepcopy(cached)
+    
+    for tool in tools:
+        if tool.name == tool_name:
+            result = tool.invoke(tool_args)
+            logger.info("Tool execution complete: success=%s", result.get('success'))
+            
+            # Store which tool was called for accurate chart filtering
+            if "data" in result and isinstance(result["data"], dict):
+                # Determine report_type from the tool that was called
+                if "success_rate" in tool_name:
+                    result["data"]["_report_type"] = "success_rate"
+                elif "failure_rate" in tool_name:
+                    result["data"]["_report_type"] = "failure_rate"
+            
+            # Only cache successes; errors should be retried on the next ask
+            if result.get("success"):
+                with _TOOL_CACHE_LOCK:
+                    _TOOL_CACHE[cache_key] = copy.deepcopy(result)
+            
+            return result
+    return None
+
+
 def execute_analytics_tool(state: AnalyticsState) -> dict:
     """
-    Intelligent tool selection using report_type priority with LLM fallback.
+    Intelligent tool selection: deterministic routing first, LLM for ambiguous queries.
     
-    Two-tier selection strategy:
+    Three-tier selection strategy:
     1. If report_type provided (from multi-turn context) → Use it directly
-    2. If report_type is None → LLM analyzes user query keywords
+    2. If the query matches only success or only failure keywords → Use that tool
+    3. Otherwise (ambiguous query, or both/no targets) → LLM selects the tool,
+       with deterministic fallback if the LLM fails
     
-    This provides:
-    - Accuracy for multi-turn conversations (explicit intent)
-    - Flexibility for single-turn queries (keyword analysis)
+    Tiers 1 and 2 skip the LLM round-trip entirely.
     
     Returns raw data only - no message formatting.
     """
@@ -47,96 +246,110 @@ def execute_analytics_tool(state: AnalyticsState) -> dict:
     domain_name = extracted_data.get("domain_name")
     file_name = extracted_data.get("file_name")
     
-    logger.info(f"Tool selection for query: '{user_query}'")
-    logger.info(f"Report type: {report_type}, Domain: {domain_name}, File: {file_name}")
+    logger.info("Tool selection for query: '%s'", user_query)
+    logger.info("Report type: %s, Domain: %s, File: %s", report_type, domain_name, file_name)
     
     # Get analytics tools
-    from app.tools.analytics_tools import get_analytics_tools
     tools = get_analytics_tools()
     
-    # HYBRID APPROACH: LLM-first with deterministic fallback
-    # Strategy 1: Always try LLM first (most flexible)
+    # Tools take exactly one target, so only route deterministically when that holds
+    routed_report_type = _route_by_keywords(user_query, report_type)
+    if routed_report_type and bool(domain_name) != bool(file_name):
+        tool_name = _REPORT_TOOLS[routed_report_type]
+        tool_args = {"domain_name": domain_name} if domain_name else {"file_name": file_name}
+        
+        # Add org_id to tool arguments for multi-tenant support
+        org_id = state.get("org_id")
+        if org_id:
+            tool_args["org_id"] = org_id
+        
+        logger.info("Keyword router selected tool: %s (LLM skipped)", tool_name)
+        result = _invoke_report_tool(tools, tool_name, tool_args)
+        if result is not None:
+            return {"tool_result": result}
+        logger.warning("Tool '%s' not available, falling back to LLM selection", tool_name)
+    
+    # HYBRID APPROACH: LLM with deterministic fallback
+    # Strategy 1: LLM for queries the keyword router can't resolve
     # Strategy 2: If LLM fails, use deterministic fallback (most reliable)
     
-    logger.info(f"Attempting LLM tool selection first...")
-    
-    # Create LLM with tool calling capability
-    llm = ChatOpenAI(model=OPENAI_MODEL, temperature=0, api_key=OPENAI_API_KEY)
-    llm_with_tools = llm.bind_tools(tools)
-    
-    # Initialize secure prompt template
-    tool_selection_prompt = SimpleExecutorToolSelectionPrompt()
+    # The LLM's choice depends only on the query and extracted fields, so a
+    # repeated question reuses it. org_id is added after the lookup.
+    selection_key = (user_query, report_type, domain_name, file_name)
+    with _TOOL_SELECTION_CACHE_LOCK:
+        selection = _TOOL_SELECTION_CACHE.get(selection_key)
     
-    # Get secure system prompt with leakage prevention
-    system_prompt = tool_selection_prompt.get_system_prompt()
-    
-    # Format user message with security validation and structural isolation
-    user_prompt = tool_selection_prompt.format_user_message(
-        user_query=user_query,
-        report_type=report_type or "",
-        domain_name=domain_name or "",
-        file_name=file_name or ""
-    )
+    if selection is not None:
+        logger.info("Tool selection cache hit: %s (LLM skipped)", selection[0])
+    else:
+        logger.info("Attempting LLM tool selection...")
+        
+        # Cached LLM with tool calling capability
+        llm_with_tools = _get_tool_selection_llm()
+        
+        # Format user message with security validation and structural isolation
+        user_prompt = _TOOL_SELECTION_PROMPT.format_user_message(
+            user_query=user_query,
+            report_type=report_type or "",
+            domain_name=domain_name or "",
+            file_name=file_name or ""
+        )
 
-    # Combine system and user prompts
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt}
-    ]
+        # Static system prompt first, so the shared prefix is cacheable
+        messages = [
+            {"role": "system", "content": _TOOL_SELECTOR_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
     
-    # Let LLM decide which tool to invoke
     try:
-        response = llm_with_tools.invoke(messages)
-        
-        # Check if LLM called a tool
-        if response.tool_calls:
-            tool_call = response.tool_calls[0]
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"]
+        if selection is None:
+            # Let LLM decide which tool to invoke
+            response = llm_with_tools.invoke(messages)
             
-            logger.info(f"LLM selected tool: {tool_name}")
-            logger.info(f"Tool arguments: {tool_args}")
+            # Track router prompt size (system prompt + tool schemas + user message)
+            token_usage = (response.response_metadata or {}).get("token_usage") or {}
+            logger.debug("Tool selection prompt_tokens=%s", token_usage.get('prompt_tokens'))
             
-            # Add org_id to tool arguments for multi-tenant support
-            org_id = state.get("org_id")
-            if org_id:
-                tool_args["org_id"] = org_id
-                logger.info(f"Added org_id to tool args: {org_id}")
+            if not response.tool_calls:
+                # LLM didn't call any tool - use deterministic fallback
+                logger.warning("LLM did not call any tool, falling back to deterministic selection")
+                logger.warning("LLM response: %s", response.content)
+                
+                # FALLBACK: Use deterministic selection
+                return _deterministic_fallback(state, tools, report_type, domain_name, file_name)
             
-            # Execute the selected tool
-            for tool in tools:
-                if tool.name == tool_name:
-                    result = tool.invoke(tool_args)
-                    logger.info(f"Tool execution complete: success={result.get('success')}")
-                    
-                    # Store which tool was called for accurate chart filtering
-                    if "data" in result and isinstance(result["data"], dict):
-                        # Determine report_type from the tool that was called
-                        if "success_rate" in tool_name:
-                            result["data"]["_report_type"] = "success_rate"
-                        elif "failure_rate" in tool_name:
-                            result["data"]["_report_type"] = "failure_rate"
-                    
-                    return {"tool_result": result}
-            
-            # Tool not found (shouldn't happen)
-            logger.error(f"Tool '{tool_name}' not found in available tools")
-            return {
-                "tool_result": {
-                    "success": False,
-                    "error": f"Tool {tool_name} not found"
-                }
+            tool_call = response.tool_calls[0]
+            selection = (tool_call["name"], dict(tool_call["args"]))
+            logger.info("LLM selected tool: %s", selection[0])
+            logger.info("Tool arguments: %s", selection[1])
+        
+        tool_name = selection[0]
+        tool_args = dict(selection[1])
+        
+        # Add org_id to tool arguments for multi-tenant support
+        org_id = state.get("org_id")
+        if org_id:
+            tool_args["org_id"] = org_id
+            logger.info("Added org_id to tool args: %s", org_id)
+        
+        # Execute the selected tool
+        result = _invoke_report_tool(tools, tool_name, tool_args)
+        if result is not None:
+            with _TOOL_SELECTION_CACHE_LOCK:
+                _TOOL_SELECTION_CACHE[selection_key] = selection
+            return {"tool_result": result}
+        
+        # Tool not found (shouldn't happen)
+        logger.error("Tool '%s' not found in available tools", tool_name)
+        return {
+            "tool_result": {
+                "success": False,
+                "error": f"Tool {tool_name} not found"
             }
-        else:
-            # LLM didn't call any tool - use deterministic fallback
-            logger.warning("LLM did not call any tool, falling back to deterministic selection")
-            logger.warning(f"LLM response: {response.content}")
-            
-            # FALLBACK: Use deterministic selection
-            return _deterministic_fallback(state, tools, report_type, domain_name, file_name)
+        }
             
     except Exception as e:
-        logger.exception(f"Error in LLM tool selection: {e}")
+        logger.exception("Error in LLM tool selection: %s", e)
         logger.info("Falling back to deterministic selection due to LLM error")
         
         # FALLBACK: Use deterministic selection
@@ -156,7 +369,7 @@ def _deterministic_fallback(state: AnalyticsState, tools: list, report_type: str
     
     # Fallback 1: If report_type is explicitly provided → Use it directly
     if report_type and (domain_name or file_name):
-        logger.info(f"Fallback: Using report_type={report_type}")
+        logger.info("Fallback: Using report_type=%s", report_type)
         
         # Map report_type to tool
         tool_map = {
@@ -178,13 +391,13 @@ def _deterministic_fallback(state: AnalyticsState, tools: list, report_type: str
             if org_id:
                 tool_args["org_id"] = org_id
             
-            logger.info(f"Fallback selection: {tool_name} with args {tool_args}")
+            logger.info("Fallback selection: %s with args %s", tool_name, tool_args)
             
             # Execute tool directly
             for tool in tools:
                 if tool.name == tool_name:
                     result = tool.invoke(tool_args)
-                    logger.info(f"Tool execution complete: success={result.get('success')}")
+                    logger.info("Tool execution complete: success=%s", result.get('success'))
                     
                     # Store report_type in result
                     if "data" in result and isinstance(result["data"], dict):
@@ -194,7 +407,7 @@ def _deterministic_fallback(state: AnalyticsState, tools: list, report_type: str
     
     # Fallback 2: If target provided but no report_type → Ask for clarification
     elif domain_name or file_name:
-        logger.warning(f"Fallback: No report_type specified, asking user for clarification")
+        logger.warning("Fallback: No report_type specified, asking user for clarification")
         
         target = domain_name or file_name
         target_type = "domain" if domain_name else "file"
@@ -231,7 +444,9 @@ async def generate_chart_node(state: AnalyticsState) -> dict:
     - "failure_rate": Show only failure data in chart
     """
     tool_result = state["tool_result"]
-    logger.info(f"Generating chart from tool result... {tool_result}")
+    # tool_result can be large; skip building the record entirely unless INFO is on
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Generating chart from tool result... %s", tool_result)
 
     # Skip chart if tool failed
     if not tool_result.get("success"):
@@ -244,7 +459,7 @@ async def generate_chart_node(state: AnalyticsState) -> dict:
     # Determine report_type from the actual tool that was called (stored in data)
     # This is more reliable than using extracted_data which might be incorrect
     report_type = data.get("report_type")
-    logger.info(f"Using report type from tool result: {report_type}")
+    logger.info("Using report type from tool result: %s", report_type)
     
     
     # Skip chart if no data
@@ -254,13 +469,9 @@ async def generate_chart_node(state: AnalyticsState) -> dict:
     
     # Use complete data for charts - always show both success and failure
     # This ensures accurate visualization regardless of report type
-    logger.info(f"Generating chart for report_type: {report_type}")
-    
-    # Use the full, unfiltered data
-    filtered_data = data.copy()
+    logger.info("Generating chart for report_type: %s", report_type)
     
-    # Log the chart data for debugging
-    success_rate = data.get("success_rate", 0)
+    # Chart rendering only reads data, so pass the tool data as-is (no copy)
     
     # Get user-specified chart type from extracted_data (if provided)
     extracted_data = state["extracted_data"]
@@ -269,7 +480,7 @@ async def generate_chart_node(state: AnalyticsState) -> dict:
     # PRIORITY 1: User explicitly specified chart type
     if user_chart_type:
         chart_style = user_chart_type
-        logger.info(f"Using user-specified chart type: {chart_style}")
+        logger.info("Using user-specified chart type: %s", chart_style)
     else:
         chart_style = "bar"  # Default chart type
         # PRIORITY 2: LLM recommendation (intelligent selection)
@@ -279,51 +490,68 @@ async def generate_chart_node(state: AnalyticsState) -> dict:
         # chart_style = await get_chart_type_recommendation(
         #     user_query=state["user_query"],
         #     report_type=report_type,
-        #     data=filtered_data
+        #     data=data
         # )
-        # logger.info(f"Chart type determined: {chart_style}")
+        # logger.info("Chart type determined: %s", chart_style)
     
     # Generate chart with determined style
-    from app.services.chart_service import generate_analytics_chart
-    
-    logger.info(f"Generating {report_type} chart with style '{chart_style}'...")
+    logger.info("Generating %s chart with style '%s'...", report_type, chart_style)
     
     try:
-        chart_base64 = generate_analytics_chart(
-            data=filtered_data,
-            chart_type=report_type,
-            style=chart_style
+        # Matplotlib rendering is CPU-bound and blocking, so render in a worker
+        # process while the event loop keeps serving format_response and other queries
+        loop = asyncio.get_running_loop()
+        chart_base64 = await loop.run_in_executor(
+            _get_chart_pool(),
+            partial(
+                generate_analytics_chart,
+                data=data,
+                chart_type=report_type,
+                style=chart_style
+            )
         )
         
+        # chart_base64 is already ASCII base64 PNG (rendered in memory by the chart
+        # service); pass it through untouched, never re-encode
         # Return just the base64 string (or None if generation failed)
         if chart_base64:
-            logger.info(f"Chart generated successfully ({len(chart_base64)} bytes)")
+            logger.info("Chart generated successfully (%s bytes)", len(chart_base64))
         else:
             logger.warning("Chart generation returned None")
         
         return {"chart_image": chart_base64}
         
     except Exception as e:
-        logger.exception(f"Chart generation error: {e}")
+        logger.exception("Chart generation error: %s", e)
         return {"chart_image": None}
 
 
-def format_response_with_llm(state: AnalyticsState) -> dict:
+def _chart_expected(tool_result: dict) -> bool:
+    """
+    Predict whether generate_chart_node will produce a chart for this tool result.
+
+    Formatting runs in parallel with chart generation, so the formatter cannot
+    wait for chart_image. It uses the same skip rules as generate_chart_node instead.
+    """
+    if not tool_result.get("success"):
+        return False
+    return tool_result.get("data", {}).get("total_requests", 0) > 0
+
+
+async def format_response_with_llm(state: AnalyticsState) -> dict:
     """
     Use LLM to format raw analytics data into natural language response.
     
-    Returns structured JSON with success, message, and chart_image.
-    The LLM generates the conversational message text, and we wrap it
-    in the structured response format.
+    Runs concurrently with generate_chart_node, so it only depends on tool_result.
+    The chart is attached afterwards by merge_response; chart_image here is always None.
     """
     tool_result = state["tool_result"]
     user_query = state["user_query"]
-    chart_image = state.get("chart_image")  # Get chart from previous node
     
     # Handle tool errors
     if not tool_result.get("success"):
         error_msg = tool_result.get("error", "Unknown error occurred")
-        logger.error(f"Tool error: {error_msg}")
+        logger.error("Tool error: %s", error_msg)
         return {
             "final_response": {
                 "success": False,
@@ -335,6 +563,19 @@ def format_response_with_llm(state: AnalyticsState) -> dict:
     # Get raw data
     data = tool_result.get("data", {})
     
+    # No data: the message is fully deterministic, so skip the LLM round-trip
+    if data.get("total_requests", 0) == 0:
+        target_type = data.get("target_type") or "target"
+        target_value = data.get("target_value") or "your selection"
+        logger.info("No analytics data available, using templated response")
+        return {
+            "final_response": {
+                "success": True,
+                "message": f"No analytics data is available yet for the {target_type} '{target_value}'.",
+                "chart_image": None
+            }
+        }
+    
     # Initialize secure prompt template for response formatting
     response_formatting_prompt = SimpleExecutorResponseFormattingPrompt()
     
@@ -345,13 +586,13 @@ def format_response_with_llm(state: AnalyticsState) -> dict:
     user_prompt = response_formatting_prompt.format_user_message(
         user_query=user_query,
         data=data,
-        has_chart=bool(chart_image)
+        has_chart=_chart_expected(tool_result)
     )
     
     logger.info("Generating LLM-formatted message...")
     
-    # Use LLM to generate natural response with secure prompts
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7, api_key=OPENAI_API_KEY)
+    # Use cached LLM to generate natural response with secure prompts
+    llm = _get_formatting_llm()
     
     # Create messages with secure prompts
     messages = [
@@ -359,29 +600,49 @@ def format_response_with_llm(state: AnalyticsState) -> dict:
         {"role": "user", "content": user_prompt}
     ]
     
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     
     message_text = response.content
-    logger.info(f"LLM message generated ({len(message_text)} chars)")
+    logger.info("LLM message generated (%s chars)", len(message_text))
     
-    # Build structured response
+    # Build structured response (chart is attached in merge_response)
     structured_response = {
         "success": True,
         "message": message_text,
-        "chart_image": chart_image  # Include chart from state (or None)
+        "chart_image": None
     }
     
     return {"final_response": structured_response}
 
 
+def merge_response(state: AnalyticsState) -> dict:
+    """
+    Join node: attach the chart from generate_chart_node to the formatted response.
+    
+    Runs once both parallel branches (generate_chart, format_response) have
+    written their state updates.
+    """
+    final_response = dict(state.get("final_response") or {})
+    
+    # Error responses never carry a chart
+    if final_response.get("success"):
+        final_response["chart_image"] = state.get("chart_image")
+    else:
+        final_response["chart_image"] = None
+    
+    return {"final_response": final_response}
+
+
 def build_analytics_orchestrator() -> StateGraph:
     """
     Build the analytics orchestrator for Pattern B with chart generation.
     
     Orchestration Flow:
     1. execute_analytics_tool - Calls tool, gets raw data
-    2. generate_chart_node - Creates chart visualization from data
-    3. format_response_with_llm - LLM formats message, wraps in JSON with chart
+    2. Fan-out (run in parallel, both only depend on tool_result):
+       - generate_chart_node - Creates chart visualization from data
+       - format_response_with_llm - LLM formats message
+    3. merge_response - Fan-in, wraps message and chart in JSON
     4. END - Return structured response: {success, message, chart_image}
     """
     workflow = StateGraph(AnalyticsState)
@@ -390,21 +651,32 @@ def build_analytics_orchestrator() -> StateGraph:
     workflow.add_node("execute_tool", execute_analytics_tool)
     workflow.add_node("generate_chart", generate_chart_node)
     workflow.add_node("format_response", format_response_with_llm)
+    workflow.add_node("merge", merge_response)
     
-    # Define edges
+    # Define edges: fan out after tool execution, join before END
     workflow.set_entry_point("execute_tool")
     workflow.add_edge("execute_tool", "generate_chart")
-    workflow.add_edge("generate_chart", "format_response")
-    workflow.add_edge("format_response", END)
+    workflow.add_edge("execute_tool", "format_response")
+    workflow.add_edge(["generate_chart", "format_response"], "merge")
+    workflow.add_edge("merge", END)
     
     return workflow.compile()
 
 
-# Example usage
-async def run_analytics_query(user_query: str, extracted_data: dict, org_id: Optional[str] = None) -> dict:
-    orchestrator = build_analytics_orchestrator()
+@lru_cache(maxsize=1)
+def _get_orchestrator():
+    """
+    Get the compiled analytics orchestrator.
     
-    initial_state = {
+    Compiling the StateGraph walks all nodes and edges, so it is done once
+    and the compiled graph is shared by every request (it holds no per-run state).
+    """
+    return build_analytics_orchestrator()
+
+
+def _initial_state(user_query: str, extracted_data: dict, org_id: Optional[str]) -> dict:
+    """Build the orchestrator input state for one query."""
+    return {
         "user_query": user_query,
         "extracted_data": extracted_data,
         "org_id": org_id or "",  # Pass org_id through state
@@ -412,20 +684,127 @@ async def run_analytics_query(user_query: str, extracted_data: dict, org_id: Opt
         "chart_image": None,
         "final_response": {}
     }
+
+
+async def _stream_analytics_query(
+    user_query: str,
+    extracted_data: dict,
+    org_id: Optional[str] = None
+) -> AsyncIterator[dict]:
+    """
+    Run the orchestrator and stream the formatted message as it is generated.
+    
+    Uses LangGraph's astream_events. Chat models invoked inside the graph
+    stream automatically when an event stream is attached, so
+    format_response_with_llm needs no separate streaming code path.
+    
+    Yields:
+        {"type": "token", "content": str} for each message chunk, then
+        {"type": "final", "response": dict} with the structured response
+        (same shape as run_analytics_query returns)
+    """
+    orchestrator = _get_orchestrator()
+    initial_state = _initial_state(user_query, extracted_data, org_id)
+    
+    logger.info("Starting streaming orchestrator for: %s", user_query)
+    
+    async for event in orchestrator.astream_events(initial_state, version="v2"):
+        kind = event["event"]
+        
+        # Only the formatter's tokens are user-facing (tool selection emits tool calls)
+        if kind == "on_chat_model_stream":
+            if event.get("metadata", {}).get("langgraph_node") != "format_response":
+                continue
+            content = event["data"]["chunk"].content
+            if content:
+                yield {"type": "token", "content": content}
+        
+        # End of the top-level graph run carries the final state
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            logger.info("Streaming orchestrator complete")
+            yield {"type": "final", "response": event["data"]["output"]["final_response"]}
+
+
+# Example usage
+async def run_analytics_query(
+    user_query: str,
+    extracted_data: dict,
+    org_id: Optional[str] = None,
+    stream: bool = False
+):
+    """
+    Run one analytics query through the orchestrator.
+    
+    Args:
+        user_query: User's natural language query
+        extracted_data: {report_type, domain_name, file_name, chart_type}
+        org_id: Organization ID for multi-tenant data isolation
+        stream: If True, return an async generator of message chunks
+            (see _stream_analytics_query) instead of the final response
+        
+    Returns:
+        Structured response {success, message, chart_image}, or an async
+        generator of stream events when stream=True
+    """
+    if stream:
+        return _stream_analytics_query(user_query, extracted_data, org_id)
+    
+    orchestrator = _get_orchestrator()
     
-    logger.info(f"Starting orchestrator for: {user_query}")
-    logger.info(f"Extracted parameters: {extracted_data}")
+    initial_state = _initial_state(user_query, extracted_data, org_id)
+    
+    logger.info("Starting orchestrator for: %s", user_query)
+    logger.info("Extracted parameters: %s", extracted_data)
     if org_id:
-        logger.info(f"Organization ID: {org_id}")
+        logger.info("Organization ID: %s", org_id)
     
     # Run orchestrator - LLM will select appropriate tool
     final_state = await orchestrator.ainvoke(initial_state)
     
-    logger.info(f"Orchestrator complete")
+    logger.info("Orchestrator complete")
     
     return final_state["final_response"]
 
 
+async def run_analytics_queries_batch(
+    queries: List[Tuple[str, dict]],
+    org_id: Optional[str] = None,
+    max_concurrency: int = 10
+) -> List[dict]:
+    """
+    Run several analytics queries concurrently with bounded concurrency.
+    
+    Concurrency is enforced with a semaphore rather than LangChain's
+    max_concurrency config, so at most max_concurrency orchestrator runs
+    (and their LLM calls) are in flight at once.
+    
+    Args:
+        queries: List of (user_query, extracted_data) pairs
+        org_id: Organization ID applied to every query
+        max_concurrency: Maximum number of queries running at the same time
+        
+    Returns:
+        Structured responses in the same order as queries. A query that raises
+        gets an error response instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _bounded(user_query: str, extracted_data: dict) -> dict:
+        async with semaphore:
+            try:
+                return await run_analytics_query(user_query, extracted_data, org_id)
+            except Exception as e:
+                logger.exception("Batch analytics query failed: %s", e)
+                return {
+                    "success": False,
+                    "message": f"I encountered an error: {e}",
+                    "chart_image": None
+                }
+    
+    logger.info("Running batch of %s analytics queries (max_concurrency=%s)", len(queries), max_concurrency)
+    return await asyncio.gather(*(_bounded(q, e) for q, e in queries))
+
+
 # Example test cases
 if __name__ == "__main__":
     import asyncio
@@ -13,6 +13,25 @@ logger = logging.getLogger(__name__)
 pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
+# Sanitization patterns are compiled once at import, not rebuilt on every input
+# Control characters other than \t, \n and \r (null bytes included)
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Suspicious but possibly legitimate input: logged, never blocked
+_SUSPICIOUS_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), attack_type)
+    for pattern, attack_type in (
+        (r'<script[^>]*>', 'script tag'),
+        (r'javascript:', 'javascript protocol'),
+        (r'data:text/html', 'data URI'),
+        (r'\\x[0-9a-fA-F]{2}', 'hex encoding'),
+        (r'%[0-9a-fA-F]{2}', 'URL encoding'),
+        (r'<iframe', 'iframe tag'),
+        (r'onerror\s*=', 'event handler'),
+        (r'eval\s*\(', 'eval function'),
+    )
+)
+
 
 class PromptSecurityError(Exception):
     """Raised when prompt template security validation fails."""
@@ -270,18 +289,13 @@ class SecurePromptTemplate(ABC):
             # Example: Cyrillic 'а' (U+0430) → Latin 'a' (U+0061)
             text = unicodedata.normalize('NFKC', text)
         
-        # Layer 3: Remove null bytes and dangerous control characters
-        text = text.replace('\x00', '')
-        
-        # Remove control characters except common whitespace (\n, \r, \t, space)
-        text = ''.join(
-            char for char in text 
-            if ord(char) >= 32 or char in '\n\r\t'
-        )
+        # Layer 3: Remove null bytes and control characters except common
+        # whitespace (\n, \r, \t), in one C-level pass
+        text = _CONTROL_CHARS_RE.sub('', text)
         
         # Layer 4: Normalize excessive newlines (max 2 consecutive)
         # MUST happen BEFORE injection detection to avoid false positives on \n\s*\n\s*\n
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
         
         # Layer 5: Prompt injection detection using existing PromptSecurityValidator
         # Runs AFTER normalization to avoid false positives from legitimate newlines
@@ -297,26 +311,15 @@ class SecurePromptTemplate(ABC):
         
         # Layer 6: Detect suspicious patterns (log warnings, don't block)
         # These patterns might be legitimate in analytics context, so we log but don't raise
-        suspicious_patterns = [
-            (r'<script[^>]*>', 'script tag'),
-            (r'javascript:', 'javascript protocol'),
-            (r'data:text/html', 'data URI'),
-            (r'\\x[0-9a-fA-F]{2}', 'hex encoding'),
-            (r'%[0-9a-fA-F]{2}', 'URL encoding'),
-            (r'<iframe', 'iframe tag'),
-            (r'onerror\s*=', 'event handler'),
-            (r'eval\s*\(', 'eval function'),
-        ]
-        
-        for pattern, attack_type in suspicious_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern, attack_type in _SUSPICIOUS_PATTERNS:
+            if pattern.search(text):
                 logger.warning(
                     f"Suspicious pattern detected in input: {attack_type} "
-                    f"(pattern: {pattern})"
+                    f"(pattern: {pattern.pattern})"
                 )
         
         # Layer 7: Final validation - ensure no control characters survived
-        remaining_control = re.findall(r'[\x00-\x08\x0b-\x0c\x0e-\x1f]', text)
+        remaining_control = _CONTROL_CHARS_RE.findall(text)
         if remaining_control:
             logger.error(f"Control characters survived sanitization: {remaining_control}")
             raise PromptSecurityError(
@@ -418,10 +421,8 @@ class SecurePromptTemplate(ABC):
         raise PromptSecurityError("Response is not valid JSON format")
     
     def detect_prompt_leakage(self, response: str) -> Tuple[bool, str]:
-        response_lower = response.lower()
-        
         for pattern, leak_type in self.LEAKAGE_PATTERNS:
-            if re.search(pattern, response_lower, re.IGNORECASE):
+            if re.search(pattern, response, re.IGNORECASE):
                 logger.error(f"REACTIVE: Prompt leakage detected (prevention failed!)")
                 logger.error(f"  Leak type: {leak_type}")
                 logger.error(f"  Pattern: {pattern}")
@@ -13,415 +13,114 @@ class QueryUnderstandingPrompt(SecurePromptTemplate):
     - Comparison targets for multi-target queries
     """
     
-    TEMPLATE = """You are an expert query understanding agent for an analytics system.
+    TEMPLATE = """You are the query understanding agent of an analytics system. Extract the intent, slots, query type and comparison targets of the user's query and return only JSON matching the response schema.
 
-Your task is to extract:
-1. **INTENT** - What type of analysis does the user want?
-2. **SLOTS** - What specific entities/parameters are mentioned?
-3. **QUERY TYPE** - Is this a simple or complex query?
-4. **COMPARISON TARGETS** - For comparison queries, list all targets being compared
+Intents:
+- success_rate: mentions success, successful or success rate
+- failure_rate: mentions fail, failed, failure or error
+- comparison: compare/vs/versus/between with no metric named
+- general_query: analytics request without a metric (e.g. "analyze customer domain")
+- out_of_scope: greetings, chitchat and unrelated topics
 
-📋 **SUPPORTED INTENTS:**
-- "success_rate" - User wants to see success rates
-- "failure_rate" - User wants to see failure rates
-- "comparison" - User wants to compare metrics between multiple targets (when metric type not specified)
-- "general_query" - General analytics question or unclear request
-- "out_of_scope" - Non-analytics question (greetings, chitchat, unrelated topics)
+A metric keyword always decides the intent, also in report and comparison requests ("generate failure rate report" is failure_rate). Compare/between/vs/versus or two or more targets make the query complex with high_level_intent "comparison"; otherwise it is simple.
 
-📊 **QUERY TYPES:**
-- "simple" - Single target analysis (one domain or file)
-- "complex" - Multi-target analysis (comparisons, aggregations)
-
-🎯 **HIGH-LEVEL INTENTS (for complex queries):**
-- "comparison" - Comparing metrics between multiple targets
-- "aggregation" - Combining data from multiple sources
-- "trend" - Analyzing trends over time
-
-🎯 **SUPPORTED SLOTS:**
-- domain_name: Domain to analyze (e.g., "customer", "product", "order")
-- file_name: File to analyze (e.g., "customer.csv", "sales.json")
-- chart_type: Visualization type (e.g., "bar", "pie", "line", "donut", "area")
-
-⚠️ **CRITICAL RULES:**
-
-1. **Intent Detection (HIGHEST PRIORITY - CHECK THESE FIRST):**
-   - If query contains "failure" OR "failed" OR "fail" OR "error" OR "failure rate" → intent: "failure_rate"
-   - If query contains "success" OR "successful" OR "success rate" → intent: "success_rate"
-   - **IMPORTANT:** Queries like "success rate report", "generate success rate", "show success rate" MUST be classified as "success_rate" (NOT "general_query")
-   - **IMPORTANT:** Queries like "failure rate report", "generate failure rate", "show failure rate" MUST be classified as "failure_rate" (NOT "general_query")
-   - Examples that MUST be "failure_rate":
-     * "I want to generate failure rate report"
-     * "create failure rate report"
-     * "analyse/analyze failure rate report"
-     * "show me failure rate"
-     * "failure rate for customer"
-     * "failure rate report"
-   - Examples that MUST be "success_rate":
-     * "I want to generate success rate report"
-     * "create success rate report"
-     * "show me success rate"
-     * "success rate for customer"
-     * "success rate report"
-   - Keywords "compare", "comparison", "vs", "versus" WITHOUT explicit metric → intent: "comparison"
-   - Keywords "compare" WITH "success" → intent: "success_rate"
-   - Keywords "compare" WITH "fail/failure/error" → intent: "failure_rate"
-   - Greetings, chitchat, or non-analytics questions → intent: "out_of_scope"
-   - Generic "generate report" OR "analytics" WITHOUT any metric keyword (no "success" or "failure" mentioned) → intent: "general_query"
-
-2. **Query Type Detection:**
-   - Keywords "compare", "between", "vs", "versus" → query_type: "complex", high_level_intent: "comparison"
-   - Multiple targets mentioned (e.g., "customer.csv and product.csv") → query_type: "complex"
-   - Single target → query_type: "simple"
-
-3. **Comparison Target Extraction:**
-   - Extract ALL files or domains mentioned in comparison queries
-   - Format: Preserve exact names as mentioned (e.g., "customer.csv", "product.csv")
-   - Store in comparison_targets array
-   - For "file" without extension, add ".csv" (e.g., "customer file" → "customer.csv")
-   - For "domain" without extension, store without extension (e.g., "customer domain" → "customer")
-   - Mixed comparisons allowed: domain vs file (e.g., ["customer", "payment.csv"])
-   - Domain vs domain: both without extension (e.g., ["customer", "payment"])
-   - File vs file: both with extension (e.g., ["customer.csv", "payment.csv"])
-
-4. **Out of Scope Detection:**
-   - Greetings: "hello", "hi", "hey", "good morning"
-   - Personal questions: "how are you", "what's your name", "who are you"
-   - Unrelated topics: "weather", "sports", "news", "recipes"
-   - Chitchat: "tell me a joke", "what can you do", "help"
-   - When detected, set intent to "out_of_scope" and clarification_needed with helpful redirect
-
-5. **Slot Extraction:**
-   - File extensions (.csv, .json, .xlsx) → extract as file_name
-   - Domain names without extension → extract as domain_name
-   - For complex queries, also populate comparison_targets
-
-6. **Chart Type Extraction:**
-   - Keywords "bar chart", "bar graph" → chart_type: "bar"
-   - Keywords "pie chart", "pie graph" → chart_type: "pie"
-   - Keywords "line chart", "line graph", "trend line" → chart_type: "line"
-   - Keywords "donut chart", "donut graph", "doughnut" → chart_type: "donut"
-   - Keywords "area chart", "area graph" → chart_type: "area"
-   - If no visualization keyword mentioned → chart_type: null (will be decided by LLM later)
-   - Examples:
-     * "Show customer success rate as a pie chart" → chart_type: "pie"
-     * "Bar chart for product failures" → chart_type: "bar"
-     * "Customer analytics" (no chart mentioned) → chart_type: null
-     * "Line graph showing trend" → chart_type: "line"
-     * "Display with donut chart" → chart_type: "donut"
-
-7. **Required Slots per Intent:**
-   - success_rate/failure_rate (simple) REQUIRES: domain_name OR file_name
-   - success_rate/failure_rate (complex comparison) REQUIRES: comparison_targets (at least 2)
-   - comparison (complex) REQUIRES: comparison_targets (at least 2)
-   - general_query: May have partial information
-   - out_of_scope: No slots required
-
-8. **Validation:**
-   - Check if all required slots are present
-   - If missing, specify what's needed in "clarification_needed"
-   - Set "is_complete" to true only if all required slots are present
-   - For out_of_scope, always set is_complete=true (complete but not actionable)
-
-**EXAMPLES:**
-
-**SIMPLE QUERIES:**
-
-Input: "show me success rate for customer.csv"
-Output: {
-  "intent": "success_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"file_name": "customer.csv"},
-  "comparison_targets": [],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "failure rate for customer domain"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "customer"},
-  "comparison_targets": [],
-  "confidence": 0.9,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "analyze customer domain"
-Output: {
-  "intent": "general_query",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "customer"},
-  "comparison_targets": [],
-  "confidence": 0.9,
-  "missing_required": ["intent"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want to analyze the customer domain. Which metric would you like to analyze? (e.g., 'success rate' or 'failure rate')"
-}
-
-Input: "I want to generate failure rate report"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {},
-  "comparison_targets": [],
-  "confidence": 0.85,
-  "missing_required": ["domain_name or file_name"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want a failure rate report. Which file or domain would you like to analyze? (e.g., 'customer.csv' or 'customer domain')"
-}
-
-Input: "success rate report"
-Output: {
-  "intent": "success_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {},
-  "comparison_targets": [],
-  "confidence": 0.85,
-  "missing_required": ["domain_name or file_name"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want a success rate report. Which file or domain would you like to analyze? (e.g., 'customer.csv' or 'customer domain')"
-}
-
-Input: "Analyze success rate report"
-Output: {
-  "intent": "success_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {},
-  "comparison_targets": [],
-  "confidence": 0.85,
-  "missing_required": ["domain_name or file_name"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want a success rate report. Which file or domain would you like to analyze? (e.g., 'customer.csv' or 'customer domain')"
-}
-
-Input: "generate success rate report for payment"
-Output: {
-  "intent": "success_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "payment"},
-  "comparison_targets": [],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-**QUERIES WITH CHART TYPE:**
-
-Input: "Show me customer success rate as a pie chart"
-Output: {
-  "intent": "success_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "customer", "chart_type": "pie"},
-  "comparison_targets": [],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "Bar graph showing product failure rate"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "product", "chart_type": "bar"},
-  "comparison_targets": [],
-  "confidence": 0.9,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "Display customer.csv analytics with line chart"
-Output: {
-  "intent": "general_query",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"file_name": "customer.csv", "chart_type": "line"},
-  "comparison_targets": [],
-  "confidence": 0.7,
-  "missing_required": ["report_type"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want to analyze customer.csv with a line chart. What type of analysis would you like? (success rate or failure rate)"
-}
-
-Input: "Customer domain analytics"
-Output: {
-  "intent": "general_query",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"domain_name": "customer", "chart_type": null},
-  "comparison_targets": [],
-  "confidence": 0.7,
-  "missing_required": ["report_type"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want to analyze the customer domain. Which metric would you like to analyze? (e.g., 'success rate' or 'failure rate')"
-}
-
-Input: "Failure rate with donut chart"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {"chart_type": "donut"},
-  "comparison_targets": [],
-  "confidence": 0.6,
-  "missing_required": ["domain_name or file_name"],
-  "is_complete": false,
-  "clarification_needed": "I understand you want a failure rate report with a donut chart. Which file or domain would you like to analyze?"
-}
-
-**COMPLEX COMPARISON QUERIES (COMPLETE):**
-
-Input: "Compare failure rates between customer.csv and product.csv"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {},
-  "comparison_targets": ["customer.csv", "product.csv"],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "compare success rate for customer.csv vs payment.csv"
-Output: {
-  "intent": "success_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {},
-  "comparison_targets": ["customer.csv", "payment.csv"],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-**COMPLEX COMPARISON QUERIES WITH CHART TYPE:**
-
-Input: "Compare customer.csv and payment.csv success rate as pie chart"
-Output: {
-  "intent": "success_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {"chart_type": "pie"},
-  "comparison_targets": ["customer.csv", "payment.csv"],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "compare failure rate of customer.csv vs product.csv with bar chart"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {"chart_type": "bar"},
-  "comparison_targets": ["customer.csv", "product.csv"],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "Show line chart comparing customer and payment domains"
-Output: {
-  "intent": "comparison",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {"chart_type": "line"},
-  "comparison_targets": ["customer", "payment"],
-  "confidence": 0.9,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "Compare success rate between customer.csv and payment.csv as horizontal bar"
-Output: {
-  "intent": "success_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {"chart_type": "horizontal_bar"},
-  "comparison_targets": ["customer.csv", "payment.csv"],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-Input: "Compare customer, payment, and order files with grouped bar chart"
-Output: {
-  "intent": "comparison",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {"chart_type": "grouped_bar"},
-  "comparison_targets": ["customer.csv", "payment.csv", "order.csv"],
-  "confidence": 0.9,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": null
-}
-
-**COMPLEX COMPARISON QUERIES (INCOMPLETE):**
-
-Input: "Compare failure rates between customer.csv"
-Output: {
-  "intent": "failure_rate",
-  "query_type": "complex",
-  "high_level_intent": "comparison",
-  "slots": {},
-  "comparison_targets": ["customer.csv"],
-  "confidence": 0.7,
-  "missing_required": ["second_comparison_target"],
-  "is_complete": false,
-  "clarification_needed": "I see you want to compare failure rates for customer.csv. What would you like to compare it with? Please specify another file or domain."
-}
-
-Input: "hello"
-Output: {
-  "intent": "out_of_scope",
-  "query_type": "simple",
-  "high_level_intent": null,
-  "slots": {},
-  "comparison_targets": [],
-  "confidence": 0.95,
-  "missing_required": [],
-  "is_complete": true,
-  "clarification_needed": "Hello! I'm an analytics assistant. I can help you analyze success rates, failure rates, and generate reports for your data. What would you like to analyze?"
-}
-
-🎯 **YOUR RESPONSE FORMAT:**
-Return ONLY valid JSON matching the QueryUnderstandingResult schema. No additional text.
+Examples:
+"failure rate for customer domain" -> {"intent": "failure_rate", "query_type": "simple", "high_level_intent": null, "slots": {"domain_name": "customer", "file_name": null, "chart_type": null}, "comparison_targets": [], "confidence": 0.9, "missing_required": [], "is_complete": true, "clarification_needed": null}
+"compare success rate of customer.csv vs payment as pie chart" -> {"intent": "success_rate", "query_type": "complex", "high_level_intent": "comparison", "slots": {"domain_name": null, "file_name": null, "chart_type": "pie"}, "comparison_targets": ["customer.csv", "payment"], "confidence": 0.95, "missing_required": [], "is_complete": true, "clarification_needed": null}
 """
     
     # Calculate SHA-256 hash for template integrity verification
     TEMPLATE_HASH = hashlib.sha256(TEMPLATE.encode('utf-8')).hexdigest()
     
+    # Allowlists shared by the response schema and validate_response_schema
+    INTENTS = ['success_rate', 'failure_rate', 'comparison', 'general_query', 'out_of_scope']
+    QUERY_TYPES = ['simple', 'complex']
+    HIGH_LEVEL_INTENTS = ['comparison', 'aggregation', 'trend']
+    CHART_TYPES = ["bar", "horizontal_bar", "pie", "line", "donut", "area", "grouped_bar"]
+    
+    # OpenAI Structured Outputs schema: the model can only emit JSON of this shape.
+    # Strict mode requires every property to be listed as required, so optional
+    # values are nullable instead and null slots are dropped after parsing.
+    RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "query_understanding_result",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "intent": {"type": "string", "enum": INTENTS},
+                    "query_type": {"type": "string", "enum": QUERY_TYPES},
+                    "high_level_intent": {
+                        "type": ["string", "null"],
+                        "enum": HIGH_LEVEL_INTENTS + [None],
+                        "description": "\"comparison\" for complex queries, otherwise null",
+                    },
+                    "slots": {
+                        "type": "object",
+                        "description": "Target of a simple query; null for complex queries except chart_type",
+                        "properties": {
+                            "domain_name": {
+                                "type": ["string", "null"],
+                                "description": "Name without a file extension (\"customer domain\" -> \"customer\")",
+                            },
+                            "file_name": {
+                                "type": ["string", "null"],
+                                "description": "Name with .csv/.json/.xlsx, exactly as written; \"customer file\" -> \"customer.csv\"",
+                            },
+                            "chart_type": {
+                                "type": ["string", "null"],
+                                "enum": CHART_TYPES + [None],
+                                "description": "Only when a chart or graph is named (doughnut -> donut), otherwise null",
+                            },
+                        },
+                        "required": ["domain_name", "file_name", "chart_type"],
+                        "additionalProperties": False,
+                    },
+                    "comparison_targets": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Every compared file or domain, named like the slots; empty for simple queries",
+                    },
+                    "confidence": {"type": "number", "description": "0.0 to 1.0"},
+                    "missing_required": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Missing information, e.g. \"domain_name or file_name\", \"intent\", \"second_comparison_target\"",
+                    },
+                    "is_complete": {
+                        "type": "boolean",
+                        "description": "True when a metric or comparison intent has one target (simple) or at least two comparison_targets (complex); always true for out_of_scope",
+                    },
+                    "clarification_needed": {
+                        "type": ["string", "null"],
+                        "description": "One short question asking for the missing information, or a redirect to analytics for out_of_scope; null when complete",
+                    },
+                },
+                "required": [
+                    "intent", "query_type", "high_level_intent", "slots", "comparison_targets",
+                    "confidence", "missing_required", "is_complete", "clarification_needed",
+                ],
+                "additionalProperties": False,
+            },
+        },
+    }
+    
+    # Task instruction kept at the tail of the system prompt so the user message
+    # carries only the query and everything before it is a cacheable prefix
+    QUERY_INSTRUCTION = "Extract intent and slots from the query in the <USER_QUERY> section of the user message."
+    
     def get_system_prompt(self) -> str:
         """
         Get the system prompt with proactive leakage prevention.
         
+        The result is static, so it is byte-identical across calls and forms
+        a stable prefix for OpenAI's automatic prompt caching.
+        
         Returns:
-            System prompt with leakage prevention rules
+            System prompt with leakage prevention rules and the task instruction
         """
-        return self.get_template_with_leakage_prevention()
+        return f"{self.get_template_with_leakage_prevention()}\n\n{self.QUERY_INSTRUCTION}"
     
     def validate_response_schema(self, data: dict) -> bool:
         """
@@ -462,17 +161,14 @@ Return ONLY valid JSON matching the QueryUnderstandingResult schema. No addition
             )
         
         # Validate intent (strict allowlist)
-        intent_allowlist = [
-            'success_rate', 'failure_rate', 'comparison', 
-            'general_query', 'out_of_scope'
-        ]
+        intent_allowlist = self.INTENTS
         if data['intent'] not in intent_allowlist:
             raise PromptSecurityError(
                 f"intent must be one of {intent_allowlist}, got: {data['intent']}"
             )
         
         # Validate query_type (strict allowlist)
-        query_type_allowlist = ['simple', 'complex']
+        query_type_allowlist = self.QUERY_TYPES
         if data['query_type'] not in query_type_allowlist:
             raise PromptSecurityError(
                 f"query_type must be one of {query_type_allowlist}, got: {data['query_type']}"
@@ -499,7 +195,7 @@ Return ONLY valid JSON matching the QueryUnderstandingResult schema. No addition
                 if not isinstance(chart_type, str):
                     raise PromptSecurityError("chart_type must be string or null")
                 
-                valid_chart_types = ["bar", "horizontal_bar", "pie", "line", "donut", "area", "grouped_bar"]
+                valid_chart_types = self.CHART_TYPES
                 if chart_type not in valid_chart_types:
                     raise PromptSecurityError(
                         f"Invalid chart_type '{chart_type}'. Must be one of {valid_chart_types}"
@@ -526,7 +222,7 @@ Return ONLY valid JSON matching the QueryUnderstandingResult schema. No addition
         
         # Validate optional high_level_intent if present
         if 'high_level_intent' in data and data['high_level_intent'] is not None:
-            high_level_allowlist = ['comparison', 'aggregation', 'trend']
+            high_level_allowlist = self.HIGH_LEVEL_INTENTS
             if data['high_level_intent'] not in high_level_allowlist:
                 raise PromptSecurityError(
                     f"high_level_intent must be one of {high_level_allowlist} or None"
@@ -581,13 +277,8 @@ Return ONLY valid JSON matching the QueryUnderstandingResult schema. No addition
         # Sanitize input using inherited method
         sanitized_query = self._sanitize_user_input(query)
         
-        # Build structurally isolated user section
-        user_content = self.build_user_section(
+        # Build structurally isolated user section; the instruction lives in the system prompt
+        return self.build_user_section(
             section_id="USER_QUERY",
             user_input=sanitized_query
         )
-        
-        # Add prefix instruction
-        formatted_message = f"Extract intent and slots from this query:\n\n{user_content}"
-        
-        return formatted_message
@@ -11,32 +11,13 @@ class SimpleExecutorToolSelectionPrompt(SecurePromptTemplate):
     2. Fallback: Analyze user query keywords if report_type missing
     """
     
-    TEMPLATE = """You are an analytics assistant. You have access to analytics tools that can retrieve data.
+    TEMPLATE = """You are an analytics assistant. Call exactly one analytics tool.
 
-## Your Task:
-
-Based on the provided information, call the appropriate analytics tool with the correct parameters.
-
-## Decision Rules (in priority order):
-
-### 1. If report_type is provided - USE IT (HIGHEST PRIORITY)
-- report_type = "success_rate" → Call generate_success_rate_report
-- report_type = "failure_rate" → Call generate_failure_rate_report
-
-### 2. If report_type is NOT provided - Analyze the user query
-- Keywords indicating success: "success", "wins", "passed", "uptime", "completion" → generate_success_rate_report
-- Keywords indicating failure: "failure", "errors", "issues", "problems", "fail" → generate_failure_rate_report
-
-## Parameter Rules:
+Tool choice, in priority order:
+1. report_type "success_rate" → generate_success_rate_report; "failure_rate" → generate_failure_rate_report
+2. No report_type: success/wins/passed/uptime/completion → generate_success_rate_report; failure/errors/issues/problems/fail → generate_failure_rate_report
 
-- Provide EXACTLY ONE of: domain_name OR file_name (never both)
-- Use domain_name if the user mentions a domain (e.g., "customer", "payment")
-- Use file_name if the user mentions a file (e.g., "customer.csv", "data.json")
-- If neither is mentioned but one is provided in parameters, use that
-
-## Important:
-
-The tools will return raw data. You don't need to format the response - just call the appropriate tool."""
+Pass exactly one of domain_name or file_name, never both. Prefer the target named in the user query."""
     
     # Calculate SHA-256 hash for template integrity verification
     TEMPLATE_HASH = hashlib.sha256(TEMPLATE.encode('utf-8')).hexdigest()
@@ -157,7 +138,7 @@ The tools will return raw data. You don't need to format the response - just cal
         )
         
         # Build parameters section with structural isolation
-        params_content = f"""- report_type: {sanitized_report_type}  ← CHECK THIS FIRST!
+        params_content = f"""- report_type: {sanitized_report_type}
 - domain_name: {sanitized_domain_name}
 - file_name: {sanitized_file_name}"""
         
@@ -166,15 +147,11 @@ The tools will return raw data. You don't need to format the response - just cal
             user_input=params_content
         )
         
-        # Combine sections
+        # Combine sections (tool-choice rules live in the system prompt only)
         formatted_message = f"""User Query: {user_query_section}
 
 Available Parameters (extracted from conversation):
-{params_section}
-
-IMPORTANT: If report_type is provided, use it to select the tool (PRIORITY). Otherwise, analyze the user query.
-
-Select the appropriate analytics tool and call it with the correct parameters."""
+{params_section}"""
         
         return formatted_message
 
@@ -1,24 +1,27 @@
 """
 Security module for authentication and input validation.
+
+Exports are imported on first access (PEP 562), so importing one submodule,
+such as pii_redactor from the logging config, does not also load auth and
+resolve the JWT secret.
 """
-from app.security.prompt_validator import (
-    PromptSecurityValidator,
-    validate_user_prompt,
-    validate_llm_output
-)
-from app.security.auth import (
-    bearer_scheme,
-    validate_jwt_token,
-    validate_user_profile,
-    validate_user_profile_with_response
-)
+import importlib
+
+_EXPORTS = {
+    'PromptSecurityValidator': 'app.security.prompt_validator',
+    'validate_user_prompt': 'app.security.prompt_validator',
+    'validate_llm_output': 'app.security.prompt_validator',
+    'bearer_scheme': 'app.security.auth',
+    'validate_jwt_token': 'app.security.auth',
+    'validate_user_profile': 'app.security.auth',
+    'validate_user_profile_with_response': 'app.security.auth'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'PromptSecurityValidator',
-    'validate_user_prompt',
-    'validate_llm_output',
-    'bearer_scheme',
-    'validate_jwt_token',
-    'validate_user_profile',
-    'validate_user_profile_with_response'
-]
+def __getattr__(name):
+    """Import the submodule that defines an exported name on first use."""
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
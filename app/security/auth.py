@@ -1,9 +1,21 @@
 from fastapi import HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JOSEError, JWTError, jwk, jwt
+from cachetools import TLRUCache
+import hashlib
 import httpx
 import logging
-from config.app_config import ADMIN_API_BASE_URL, JWT_SECRET_KEY, JWT_ALGORITHM
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Union
+from config.app_config import (
+    ADMIN_API_BASE_URL,
+    JWT_ALGORITHM,
+    JWT_CACHE_MAX,
+    JWT_CACHE_TTL,
+    JWT_SECRET_KEY,
+)
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
 
 bearer_scheme = HTTPBearer()
@@ -21,6 +33,41 @@ if not JWT_SECRET_KEY:
 if not ADMIN_API_BASE_URL:
     raise ValueError("ADMIN_API_BASE_URL is required but not found in environment variables")
 
+
+@lru_cache(maxsize=1)
+def _get_verification_key() -> Union[jwk.Key, str]:
+    """
+    Get JWT_SECRET_KEY parsed into a jose key object.
+    
+    Passing the raw PEM string to jwt.decode makes jose parse it again for every
+    token. A key that cannot be parsed for JWT_ALGORITHM is returned as is, so
+    those tokens are rejected by jwt.decode just as before.
+    """
+    try:
+        return jwk.construct(JWT_SECRET_KEY, JWT_ALGORITHM)
+    except JOSEError as e:
+        logger.warning("Could not parse JWT key for %s, using it unparsed: %s", JWT_ALGORITHM, e)
+        return JWT_SECRET_KEY
+
+
+def _jwt_cache_expiry(_key, payload: dict, now: float) -> float:
+    """Expire a cached token after JWT_CACHE_TTL seconds or at its own exp, whichever is first."""
+    return min(now + JWT_CACHE_TTL, payload.get("exp", float("inf")))
+
+
+# Decoded payloads of recently verified tokens, keyed by SHA-256 of the token.
+# A user's token is sent on every request, so the signature is only checked
+# once per JWT_CACHE_TTL. Only successful validations are cached.
+_JWT_CACHE = TLRUCache(maxsize=JWT_CACHE_MAX, ttu=_jwt_cache_expiry, timer=time.time)
+_JWT_CACHE_LOCK = threading.Lock()
+
+
+def clear_jwt_cache() -> None:
+    """Forget all cached token validations."""
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE.clear()
+
+
 def validate_jwt_token(credentials: HTTPAuthorizationCredentials):
     """
     Validate JWT token and extract payload.
@@ -35,34 +82,49 @@ def validate_jwt_token(credentials: HTTPAuthorizationCredentials):
         HTTPException: If token is invalid or expired
     """
     token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _JWT_CACHE_LOCK:
+        payload = _JWT_CACHE.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _get_verification_key(), algorithms=[JWT_ALGORITHM])
     except JWTError as e:
-        logger.error(f"JWT validation failed: {e}")
+        logger.error("JWT validation failed: %s", e)
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE[cache_key] = dict(payload)
+    return payload
 
 
-async def validate_user_profile_with_response(credentials: HTTPAuthorizationCredentials):
+async def validate_user_profile_with_response(
+    credentials: HTTPAuthorizationCredentials,
+    payload: Optional[dict] = None
+):
     """
     Validate JWT token and check user profile status via admin API.
     Returns a structured response instead of raising exceptions for inactive users.
     
     Args:
         credentials: HTTP authorization credentials containing the JWT token
+        payload: Payload already returned by validate_jwt_token for these
+            credentials earlier in the same request, if any
         
     Returns:
         dict: Response with success, message, chart_image, and payload (if successful)
     """
-    try:
-        # First validate the JWT token
-        payload = validate_jwt_token(credentials)
-    except HTTPException as e:
-        return {
-            "success": False,
-            "message": f"Authentication failed: {e.detail}",
-            "chart_image": None
-        }
+    if payload is None:
+        try:
+            # First validate the JWT token
+            payload = validate_jwt_token(credentials)
+        except HTTPException as e:
+            return {
+                "success": False,
+                "message": f"Authentication failed: {e.detail}",
+                "chart_image": None
+            }
     
     # Extract user ID from JWT payload (sub claim)
     user_id = payload.get("sub")
@@ -84,16 +146,16 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
         }
         
         async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(f"Validating user profile for user_id:")
+            logger.info("Validating user profile for user_id:")
             response = await client.get(profile_url, headers=headers)
             
             if response.status_code == 200:
                 profile_data = response.json()
                 
                 # Check if user is active
-                logger.info(f"Profile data for user {user_id}: {profile_data}")
+                logger.info("Profile data for user %s: %s", user_id, profile_data)
                 if profile_data.get("success") is True:
-                    logger.info(f"User {user_id} is active and validated")
+                    logger.info("User %s is active and validated", user_id)
                     return {
                         "success": True,
                         "message": "User authenticated and active",
@@ -111,10 +173,10 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
             elif response.status_code == 401:
                 # For 401, check if there's a JSON response with error details
                 try:
-                    logger.info(f"401 response text for user {user_id}: {response.text}")
+                    logger.info("401 response text for user %s: %s", user_id, response.text)
                     error_data = response.json()
                     error_message = error_data.get("message", "Authentication failed")
-                    logger.warning(f"Admin API returned 401 for user {user_id}: {error_message}")
+                    logger.warning("Admin API returned 401 for user %s: %s", user_id, error_message)
                     return {
                         "success": False,
                         "message": error_message,
@@ -122,8 +184,8 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
                     }
                 except Exception as parse_error:
                     # Fallback if response is not JSON
-                    logger.error(f"Failed to parse 401 response for user {user_id}: {parse_error}")
-                    logger.error(f"Response text: {response.text}")
+                    logger.error("Failed to parse 401 response for user %s: %s", user_id, parse_error)
+                    logger.error("Response text: %s", response.text)
                     return {
                         "success": False,
                         "message": "Authentication failed: Invalid credentials",
@@ -131,7 +193,7 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
                     }
             
             elif response.status_code == 404:
-                logger.error(f"User {user_id} not found in admin system")
+                logger.error("User %s not found in admin system", user_id)
                 return {
                     "success": False,
                     "message": "User not found in the system",
@@ -139,7 +201,7 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
                 }
             
             else:
-                logger.error(f"Admin API error: {response.status_code} - {response.text}")
+                logger.error("Admin API error: %s - %s", response.status_code, response.text)
                 return {
                     "success": False,
                     "message": "Unable to verify user profile. Please try again later.",
@@ -147,21 +209,21 @@ async def validate_user_profile_with_response(credentials: HTTPAuthorizationCred
                 }
                 
     except httpx.TimeoutException:
-        logger.error(f"Timeout calling admin API for user")
+        logger.error("Timeout calling admin API for user")
         return {
             "success": False,
             "message": "User profile validation timeout. Please try again.",
             "chart_image": None
         }
     except httpx.RequestError as e:
-        logger.error(f"Request error calling admin API: {e}")
+        logger.error("Request error calling admin API: %s", e)
         return {
             "success": False,
             "message": "Unable to connect to user profile service. Please check your connection.",
             "chart_image": None
         }
     except Exception as e:
-        logger.error(f"Unexpected error during user profile validation: {e}")
+        logger.error("Unexpected error during user profile validation: %s", e)
         return {
             "success": False,
             "message": "User profile validation failed due to an unexpected error.",
@@ -201,7 +263,7 @@ async def validate_user_profile(credentials: HTTPAuthorizationCredentials):
         }
         
         async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(f"Validating user profile for user_id")
+            logger.info("Validating user profile for user_id")
             response = await client.get(profile_url, headers=headers)
             
             if response.status_code == 200:
@@ -209,10 +271,10 @@ async def validate_user_profile(credentials: HTTPAuthorizationCredentials):
                 
                 # Check if user is active
                 if profile_data.get("success") is True:
-                    logger.info(f"User {user_id} is active and validated")
+                    logger.info("User %s is active and validated", user_id)
                     return payload
                 else:
-                    logger.warning(f"User {user_id} is not active: {profile_data.get('active')}")
+                    logger.warning("User %s is not active: %s", user_id, profile_data.get('active'))
                     raise HTTPException(
                         status_code=403, 
                         detail="User account is not active"
@@ -221,42 +283,42 @@ async def validate_user_profile(credentials: HTTPAuthorizationCredentials):
             elif response.status_code == 401:
                 # For 401, check if there's a JSON response with error details
                 try:
-                    logger.info(f"401 response text for user")
+                    logger.info("401 response text for user")
                     error_data = response.json()
                     error_message = error_data.get("message", "Authentication failed")
-                    logger.warning(f"Admin API returned 401 for user")
+                    logger.warning("Admin API returned 401 for user")
                     raise HTTPException(status_code=403, detail=error_message)
                 except Exception as parse_error:
                     # Fallback if response is not JSON
-                    logger.error(f"Failed to parse 401 response for user {parse_error}")
-                    logger.error(f"Response text: {response.text}")
+                    logger.error("Failed to parse 401 response for user %s", parse_error)
+                    logger.error("Response text: %s", response.text)
                     raise HTTPException(status_code=401, detail="Authentication failed")
             
             elif response.status_code == 404:
-                logger.error(f"User not found in admin system")
+                logger.error("User not found in admin system")
                 raise HTTPException(status_code=404, detail="User not found")
             
             else:
-                logger.error(f"Admin API error: {response.status_code} - {response.text}")
+                logger.error("Admin API error: %s - %s", response.status_code, response.text)
                 raise HTTPException(
                     status_code=500, 
                     detail="Unable to verify user profile"
                 )
                 
     except httpx.TimeoutException:
-        logger.error(f"Timeout calling admin API for user")
+        logger.error("Timeout calling admin API for user")
         raise HTTPException(
             status_code=500, 
             detail="User profile validation timeout"
         )
     except httpx.RequestError as e:
-        logger.error(f"Request error calling admin API: {e}")
+        logger.error("Request error calling admin API: %s", e)
         raise HTTPException(
             status_code=500, 
             detail="Unable to connect to user profile service"
         )
     except Exception as e:
-        logger.error(f"Unexpected error during user profile validation: {e}")
+        logger.error("Unexpected error during user profile validation: %s", e)
         raise HTTPException(
             status_code=500, 
             detail="User profile validation failed"
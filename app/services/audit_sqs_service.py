@@ -1,11 +1,21 @@
 import json
 import logging
+import queue
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import boto3
-from botocore.exceptions import ClientError, BotoCoreError
+from botocore.config import Config
+from botocore.exceptions import ClientError, BotoCoreError, ParamValidationError
 
-from config.app_config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_DEFAULT_REGION
+from config.app_config import (
+    AUDIT_BATCH_LINGER_MS,
+    AUDIT_BATCH_SIZE,
+    AWS_ACCESS_KEY_ID,
+    AWS_DEFAULT_REGION,
+    AWS_SECRET_ACCESS_KEY,
+)
 from app.security.pii_redactor import PIIRedactionFilter, redact_pii
 
 logger = logging.getLogger(__name__)
@@ -14,6 +24,25 @@ logger = logging.getLogger(__name__)
 pii_filter = PIIRedactionFilter()
 logger.addFilter(pii_filter)
 
+# SendMessageBatch accepts at most 10 entries per call
+_BATCH_MAX_SIZE = max(1, min(AUDIT_BATCH_SIZE, 10))
+# Longest a queued audit log waits for its batch to fill up
+_BATCH_MAX_WAIT_SECONDS = AUDIT_BATCH_LINGER_MS / 1000
+# Audit logs beyond this backlog are dropped (with a warning) instead of piling up
+_BATCH_QUEUE_SIZE = 1000
+# Tells the flusher thread to send what it has and exit
+_STOP_FLUSHER = object()
+
+# The SQS client lives as long as the service, so its connections stay open
+# between sends. The pool covers direct sends from the request thread pool, and
+# short timeouts keep a slow SQS endpoint from tying those threads up.
+_SQS_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=1,
+    read_timeout=3
+)
+
 
 class AuditSQSService:
     """Service for sending audit logs to AWS SQS queue."""
@@ -28,6 +57,9 @@ class AuditSQSService:
         self.queue_url = queue_url or self._get_queue_url_from_config()
         self.sqs_client = None
         self._initialize_sqs_client()
+        # Set while batching is active (see start_batching)
+        self._batch_queue: Optional[queue.Queue] = None
+        self._flusher: Optional[threading.Thread] = None
     
     def _get_queue_url_from_config(self) -> Optional[str]:
         """Get SQS queue URL from environment configuration."""
@@ -42,11 +74,14 @@ class AuditSQSService:
                     'sqs',
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                    region_name=AWS_DEFAULT_REGION
+                    region_name=AWS_DEFAULT_REGION,
+                    config=_SQS_CLIENT_CONFIG
                 )
             else:
                 # Use default credentials (IAM role, profile, etc.)
-                self.sqs_client = boto3.client('sqs', region_name=AWS_DEFAULT_REGION)
+                self.sqs_client = boto3.client(
+                    'sqs', region_name=AWS_DEFAULT_REGION, config=_SQS_CLIENT_CONFIG
+                )
             
             logger.info(f"SQS client initialized for region: {AWS_DEFAULT_REGION}")
         except Exception as e:
@@ -81,7 +116,7 @@ class AuditSQSService:
             additional_data: Extra data to include in the audit log
             
         Returns:
-            bool: True if log was sent successfully, False otherwise
+            bool: True if log was sent (or queued for a batch), False otherwise
         """
         if not self.queue_url:
             logger.warning("SQS queue URL not configured, skipping audit log")
@@ -111,17 +146,17 @@ class AuditSQSService:
             if additional_data:
                 audit_log.update(additional_data)
             
-            # Send to SQS
-            response = self.sqs_client.send_message(
-                QueueUrl=self.queue_url,
-                MessageBody=json.dumps(audit_log),
-                MessageAttributes={
+            message = {
+                'MessageBody': json.dumps(audit_log),
+                'MessageAttributes': {
                     'ActivityType': {
                         'StringValue': activity_type,
                         'DataType': 'String'
                     },
                     'UserId': {
-                        'StringValue': user_id,
+                        # SQS rejects empty attribute values; user_id is None when the
+                        # JWT could not be read
+                        'StringValue': user_id or "unknown",
                         'DataType': 'String'
                     },
                     'Timestamp': {
@@ -129,7 +164,20 @@ class AuditSQSService:
                         'DataType': 'String'
                     }
                 }
-            )
+            }
+            
+            # While batching, the flusher thread sends it with up to 9 others
+            batch_queue = self._batch_queue
+            if batch_queue is not None:
+                try:
+                    batch_queue.put_nowait(message)
+                    return True
+                except queue.Full:
+                    # Audit records must not be lost in a burst; send this one directly
+                    logger.warning("Audit log queue is full, sending audit log directly")
+            
+            # Send to SQS
+            response = self.sqs_client.send_message(QueueUrl=self.queue_url, **message)
             
             message_id = response.get('MessageId')
             logger.info(f"Audit log sent to SQS: MessageId={message_id}")
@@ -188,6 +236,104 @@ class AuditSQSService:
             remarks=message[:200] if message else ""
         )
     
+    def start_batching(self) -> None:
+        """
+        Queue audit logs and send them with SendMessageBatch from a background thread.
+        
+        A batch is sent once it holds AUDIT_BATCH_SIZE messages or its first
+        message has waited AUDIT_BATCH_LINGER_MS, so each SQS call carries
+        up to 10 audit logs.
+        Call stop_batching() on shutdown to flush what is still queued.
+        """
+        if self._flusher is not None or not self.queue_url or not self.sqs_client:
+            return
+        self._batch_queue = queue.Queue(maxsize=_BATCH_QUEUE_SIZE)
+        self._flusher = threading.Thread(
+            target=self._flush_batches,
+            args=(self._batch_queue,),
+            name="audit-sqs-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+        logger.info("SQS audit log batching started")
+    
+    def stop_batching(self, timeout: float = 5.0) -> None:
+        """Send any queued audit logs and stop the background flusher."""
+        if self._flusher is None:
+            return
+        batch_queue, flusher = self._batch_queue, self._flusher
+        # New audit logs go straight to SQS again
+        self._batch_queue = None
+        self._flusher = None
+        batch_queue.put(_STOP_FLUSHER)
+        flusher.join(timeout)
+        logger.info("SQS audit log batching stopped")
+    
+    def _flush_batches(self, batch_queue: queue.Queue) -> None:
+        """Flusher thread: collect up to _BATCH_MAX_SIZE queued messages per batch and send them."""
+        while True:
+            message = batch_queue.get()
+            if message is _STOP_FLUSHER:
+                return
+            batch = [message]
+            stopping = False
+            deadline = time.monotonic() + _BATCH_MAX_WAIT_SECONDS
+            while len(batch) < _BATCH_MAX_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = batch_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if message is _STOP_FLUSHER:
+                    stopping = True
+                    break
+                batch.append(message)
+            self._send_batch(batch)
+            if stopping:
+                return
+    
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Send queued messages with one SendMessageBatch call, logging any failures."""
+        entries = [{'Id': str(index), **message} for index, message in enumerate(batch)]
+        try:
+            response = self.sqs_client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+        except ParamValidationError as e:
+            # One malformed entry fails the whole call before anything is sent, so
+            # send the entries one by one and only lose the bad ones
+            logger.warning("Audit log batch failed validation, sending %d messages individually: %s", len(batch), e)
+            self._send_individually(batch)
+            return
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            logger.error("AWS SQS ClientError sending %d audit logs: %s - %s", len(batch), error_code, e)
+            return
+        except Exception as e:
+            logger.error("Failed to send %d audit logs to SQS: %s", len(batch), e)
+            return
+        
+        failed = response.get('Failed') or []
+        for failure in failed:
+            logger.error(
+                "Audit log rejected by SQS: %s - %s", failure.get('Code'), failure.get('Message')
+            )
+        logger.info("Audit log batch sent to SQS: %d of %d messages", len(batch) - len(failed), len(batch))
+        if failed:
+            # Retry the rejected entries once; entry ids are their index in the batch
+            self._send_individually([batch[int(failure['Id'])] for failure in failed])
+    
+    def _send_individually(self, batch: List[Dict[str, Any]]) -> None:
+        """Send queued messages with one SendMessage call each, logging any that fail."""
+        sent = 0
+        for message in batch:
+            try:
+                self.sqs_client.send_message(QueueUrl=self.queue_url, **message)
+                sent += 1
+            except Exception as e:
+                logger.error("Failed to send audit log to SQS: %s", e)
+        logger.info("Audit log batch sent to SQS individually: %d of %d messages", sent, len(batch))
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Check the health of the SQS audit service.
@@ -8,6 +8,10 @@ import matplotlib.pyplot as plt
 
 logger = logging.getLogger("analytic_agent")
 
+# Keywords for the rule-based chart type fallback
+_TREND_KEYWORDS = ("trend", "over time", "timeline", "track", "history")
+_PROPORTION_KEYWORDS = ("proportion", "percentage", "breakdown", "distribution", "share")
+
 
 class AnalyticsChartGenerator:
     """
@@ -169,17 +173,8 @@ class AnalyticsChartGenerator:
             # Adjust layout to prevent label cutoff
             plt.tight_layout()
             
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-            buffer.seek(0)
-            
-            # Encode to base64
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            
-            # Clean up
-            buffer.close()
-            plt.close(fig)
+            # Convert to base64 (in-memory PNG, closes the figure)
+            image_base64 = _convert_plot_to_base64(fig)
             
             logger.info(f"Chart generated successfully ({len(image_base64)} bytes)")
             
@@ -258,17 +253,8 @@ class AnalyticsChartGenerator:
             # Adjust layout
             plt.tight_layout()
             
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-            buffer.seek(0)
-            
-            # Encode to base64
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            
-            # Clean up
-            buffer.close()
-            plt.close(fig)
+            # Convert to base64 (in-memory PNG, closes the figure)
+            image_base64 = _convert_plot_to_base64(fig)
             
             logger.info(f"Pie chart generated successfully ({len(image_base64)} bytes)")
             
@@ -355,17 +341,8 @@ class AnalyticsChartGenerator:
             # Adjust layout
             plt.tight_layout()
             
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-            buffer.seek(0)
-            
-            # Encode to base64
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            
-            # Clean up
-            buffer.close()
-            plt.close(fig)
+            # Convert to base64 (in-memory PNG, closes the figure)
+            image_base64 = _convert_plot_to_base64(fig)
             
             logger.info(f"Donut chart generated successfully ({len(image_base64)} bytes)")
             
@@ -457,17 +434,8 @@ class AnalyticsChartGenerator:
             # Adjust layout
             plt.tight_layout()
             
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-            buffer.seek(0)
-            
-            # Encode to base64
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            
-            # Clean up
-            buffer.close()
-            plt.close(fig)
+            # Convert to base64 (in-memory PNG, closes the figure)
+            image_base64 = _convert_plot_to_base64(fig)
             
             logger.info(f"Line chart generated successfully ({len(image_base64)} bytes)")
             
@@ -556,17 +524,8 @@ class AnalyticsChartGenerator:
             # Adjust layout
             plt.tight_layout()
             
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-            buffer.seek(0)
-            
-            # Encode to base64
-            image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            
-            # Clean up
-            buffer.close()
-            plt.close(fig)
+            # Convert to base64 (in-memory PNG, closes the figure)
+            image_base64 = _convert_plot_to_base64(fig)
             
             logger.info(f"Area chart generated successfully ({len(image_base64)} bytes)")
             
@@ -1138,21 +1097,21 @@ def _convert_plot_to_base64(fig) -> str:
     """
     Convert matplotlib figure to base64-encoded PNG string.
     
+    Renders straight into an in-memory buffer (no filesystem round-trip) and
+    encodes its bytes once. The result is plain ASCII, ready to embed in JSON
+    as-is; callers must not encode it again.
+    
     Args:
         fig: Matplotlib figure object
     
     Returns:
         Base64-encoded PNG image string
     """
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-    buffer.seek(0)
-    
-    # Encode to base64
-    image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
+    with BytesIO() as buffer:
+        fig.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
+        image_base64 = base64.b64encode(buffer.getvalue()).decode('ascii')
     
     # Clean up
-    buffer.close()
     plt.close(fig)
     
     return image_base64
@@ -1244,12 +1203,12 @@ def apply_chart_type_rules(
     query_lower = user_query.lower()
     
     # Rule 1: Time/trend keywords → line chart
-    if any(keyword in query_lower for keyword in ["trend", "over time", "timeline", "track", "history"]):
+    if any(keyword in query_lower for keyword in _TREND_KEYWORDS):
         logger.info("Rule-based: Selected 'line' (trend keywords detected)")
         return "line"
     
     # Rule 2: Proportion/percentage keywords → pie chart
-    if any(keyword in query_lower for keyword in ["proportion", "percentage", "breakdown", "distribution", "share"]):
+    if any(keyword in query_lower for keyword in _PROPORTION_KEYWORDS):
         logger.info("Rule-based: Selected 'pie' (proportion keywords detected)")
         return "pie"
     
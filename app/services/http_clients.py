@@ -0,0 +1,58 @@
+"""
+Shared HTTP clients for OpenAI calls.
+
+Every ChatOpenAI client in the service is given the same httpx pools, so
+all LLM calls reuse warm TLS connections. HTTP/2 lets concurrent requests
+to the API multiplex over those connections.
+"""
+import asyncio
+import atexit
+import logging
+from functools import lru_cache
+from typing import Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive connection pools for OpenAI calls. Sync callers (tool selection in
+# worker threads) and async callers each get one shared pool.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+_HTTP_TIMEOUT = httpx.Timeout(30.0)
+
+
+@lru_cache(maxsize=1)
+def get_openai_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Get the shared (sync, async) httpx clients, closed at interpreter exit."""
+    clients = (
+        httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+    )
+    atexit.register(_close_http_clients, *clients)
+    return clients
+
+
+def _close_http_clients(client: httpx.Client, async_client: httpx.AsyncClient) -> None:
+    """Close the shared httpx clients (best effort, the event loop may already be gone)."""
+    client.close()
+    try:
+        asyncio.run(async_client.aclose())
+    except Exception as e:
+        logger.debug("Could not close async HTTP client cleanly: %s", e)
+
+
+async def close_openai_http_clients() -> None:
+    """
+    Close the shared httpx clients on application shutdown.
+    
+    Closing inside the running event loop releases pooled connections cleanly,
+    which the atexit fallback cannot guarantee. Only call this at shutdown:
+    LLM clients created earlier keep references to the closed pools.
+    """
+    if get_openai_http_clients.cache_info().currsize == 0:
+        return
+    client, async_client = get_openai_http_clients()
+    get_openai_http_clients.cache_clear()
+    client.close()
+    await async_client.aclose()
+    logger.info("Closed shared OpenAI HTTP clients")
@@ -38,7 +38,7 @@ class QueryContextService:
         self._ensure_table_exists()
         
         self.table = self.dynamodb.Table(self.table_name)
-        logger.info(f"QueryContextService initialized with table: {self.table_name}")
+        logger.info("QueryContextService initialized with table: %s", self.table_name)
     
     def _ensure_table_exists(self):
         """Create DynamoDB table if it doesn't exist."""
@@ -47,10 +47,10 @@ class QueryContextService:
             existing_tables = self.dynamodb_client.list_tables()['TableNames']
             
             if self.table_name in existing_tables:
-                logger.info(f"Table {self.table_name} already exists")
+                logger.info("Table %s already exists", self.table_name)
                 return
             
-            logger.info(f"Creating DynamoDB table: {self.table_name}")
+            logger.info("Creating DynamoDB table: %s", self.table_name)
             
             # Create table
             self.dynamodb_client.create_table(
@@ -67,12 +67,12 @@ class QueryContextService:
             )
             
             # Wait for table to be created
-            logger.info(f"Waiting for table {self.table_name} to be created...")
+            logger.info("Waiting for table %s to be created...", self.table_name)
             waiter = self.dynamodb_client.get_waiter('table_exists')
             waiter.wait(TableName=self.table_name)
             
             # Enable TTL
-            logger.info(f"Enabling TTL on table {self.table_name}")
+            logger.info("Enabling TTL on table %s", self.table_name)
             self.dynamodb_client.update_time_to_live(
                 TableName=self.table_name,
                 TimeToLiveSpecification={
@@ -81,17 +81,17 @@ class QueryContextService:
                 }
             )
             
-            logger.info(f"Table {self.table_name} created successfully with TTL enabled")
+            logger.info("Table %s created successfully with TTL enabled", self.table_name)
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'ResourceInUseException':
-                logger.info(f"Table {self.table_name} is already being created")
+                logger.info("Table %s is already being created", self.table_name)
             else:
-                logger.error(f"Failed to create table {self.table_name}: {e}")
+                logger.error("Failed to create table %s: %s", self.table_name, e)
                 raise
         except Exception as e:
-            logger.exception(f"Unexpected error ensuring table exists: {e}")
+            logger.exception("Unexpected error ensuring table exists: %s", e)
             raise
     
     def save_query_context(
@@ -127,23 +127,23 @@ class QueryContextService:
             Dict with all saved values (user_id, intent, slots, chart_type, prompts, timestamps) or None if save failed
         """
         try:
-            logger.info(f"========== SAVE QUERY CONTEXT START ==========")
-            logger.info(f"Input parameters:")
-            logger.info(f"   - intent: '{intent}'")
-            logger.info(f"   - slots: {slots}")
-            logger.info(f"   - chart_type: '{chart_type}'")
-            logger.info(f"   - original_prompt: '{redact_pii(original_prompt) if original_prompt else None}'")
-            logger.info(f"   - comparison_targets: {comparison_targets}")
+            logger.info("========== SAVE QUERY CONTEXT START ==========")
+            logger.info("Input parameters:")
+            logger.info("   - intent: '%s'", intent)
+            logger.info("   - slots: %s", slots)
+            logger.info("   - chart_type: '%s'", chart_type)
+            logger.info("   - original_prompt: '%s'", redact_pii(original_prompt) if original_prompt else None)
+            logger.info("   - comparison_targets: %s", comparison_targets)
             
             # Check if user already has existing context
             existing = self.get_full_context(user_id)
             
             if existing:
-                logger.info(f"Existing record found:")
-                logger.info(f"   - Current intent: '{existing.get('intent')}'")
-                logger.info(f"   - Current slots: {existing.get('slots')}")
-                logger.info(f"   - Current chart_type: '{existing.get('chart_type')}'")
-                logger.info(f"   - Will UPDATE with smart merge strategy")
+                logger.info("Existing record found:")
+                logger.info("   - Current intent: '%s'", existing.get('intent'))
+                logger.info("   - Current slots: %s", existing.get('slots'))
+                logger.info("   - Current chart_type: '%s'", existing.get('chart_type'))
+                logger.info("   - Will UPDATE with smart merge strategy")
                 
                 # Smart merge strategy: Update each field independently
                 # 1. Intent: Use new if valid, else keep existing
@@ -156,10 +156,10 @@ class QueryContextService:
                 # 3. Chart_type: Use new if provided, else keep existing
                 chosen_chart_type = chart_type if chart_type else existing.get('chart_type')
                 
-                logger.info(f"Smart merge result:")
-                logger.info(f"   - Chosen intent: '{chosen_intent}'")
-                logger.info(f"   - Merged slots: {merged_slots}")
-                logger.info(f"   - Chosen chart_type: '{chosen_chart_type}'")
+                logger.info("Smart merge result:")
+                logger.info("   - Chosen intent: '%s'", chosen_intent)
+                logger.info("   - Merged slots: %s", merged_slots)
+                logger.info("   - Chosen chart_type: '%s'", chosen_chart_type)
                
                 updated = self._update_existing_record(
                     user_id=user_id,
@@ -174,18 +174,18 @@ class QueryContextService:
                 if updated:
                     # Return the updated record
                     final_record = self.get_full_context(user_id)
-                    logger.info(f"Update successful, final record:")
-                    logger.info(f"   - Stored intent: '{final_record.get('intent')}'")
-                    logger.info(f"   - Stored slots: {final_record.get('slots')}")
-                    logger.info(f"   - Stored chart_type: '{final_record.get('chart_type')}'")
-                    logger.info(f"========== SAVE QUERY CONTEXT END ==========")
+                    logger.info("Update successful, final record:")
+                    logger.info("   - Stored intent: '%s'", final_record.get('intent'))
+                    logger.info("   - Stored slots: %s", final_record.get('slots'))
+                    logger.info("   - Stored chart_type: '%s'", final_record.get('chart_type'))
+                    logger.info("========== SAVE QUERY CONTEXT END ==========")
                     return final_record
                 else:
-                    logger.error(f"Update failed")
-                    logger.info(f"========== SAVE QUERY CONTEXT END ==========")
+                    logger.error("Update failed")
+                    logger.info("========== SAVE QUERY CONTEXT END ==========")
                     return None
             
-            logger.info(f"No existing record, creating new one")
+            logger.info("No existing record, creating new one")
             
             # Create new record
             ttl_timestamp = int((datetime.now() + timedelta(hours=self.ttl_hours)).timestamp())
@@ -217,18 +217,18 @@ class QueryContextService:
             if comparison_targets:
                 item['comparison_targets'] = comparison_targets
             
-            logger.info(f"Creating new DynamoDB item:")
-            logger.info(f"   - report_type: '{intent}'")
-            logger.info(f"   - slots: {slots}")
-            logger.info(f"   - chart_type: '{chart_type}'")
-            logger.info(f"   - prompts_count: {len(prompts)}")
-            logger.info(f"   - comparison_targets: {comparison_targets}")
+            logger.info("Creating new DynamoDB item:")
+            logger.info("   - report_type: '%s'", intent)
+            logger.info("   - slots: %s", slots)
+            logger.info("   - chart_type: '%s'", chart_type)
+            logger.info("   - prompts_count: %s", len(prompts))
+            logger.info("   - comparison_targets: %s", comparison_targets)
             
             # Save to DynamoDB
             self.table.put_item(Item=item)
             
-            logger.info(f"Successfully created new record for user {user_id}")
-            logger.info(f"========== SAVE QUERY CONTEXT END ==========")
+            logger.info("Successfully created new record for user %s", user_id)
+            logger.info("========== SAVE QUERY CONTEXT END ==========")
             
             # Return the saved record with all values
             return {
@@ -240,14 +240,14 @@ class QueryContextService:
             }
             
         except ClientError as e:
-            logger.error(f"DynamoDB ClientError for user {user_id}: {e}")
-            logger.error(f"Error code: {e.response['Error']['Code']}")
-            logger.error(f"Error message: {e.response['Error']['Message']}")
-            logger.info(f"========= SAVE QUERY CONTEXT END ==========")
+            logger.error("DynamoDB ClientError for user %s: %s", user_id, e)
+            logger.error("Error code: %s", e.response['Error']['Code'])
+            logger.error("Error message: %s", e.response['Error']['Message'])
+            logger.info("========= SAVE QUERY CONTEXT END ==========")
             return None
         except Exception as e:
-            logger.exception(f"Unexpected error saving query context: {e}")
-            logger.info(f"========== SAVE QUERY CONTEXT END ==========")
+            logger.exception("Unexpected error saving query context: %s", e)
+            logger.info("========== SAVE QUERY CONTEXT END ==========")
             return None
     
     def _update_existing_record(
@@ -283,19 +283,19 @@ class QueryContextService:
             bool: True if update successful, False otherwise
         """
         try:
-            logger.info(f"========== UPDATE EXISTING RECORD START ==========")
-            logger.info(f"Update parameters:")
-            logger.info(f"   - user_id: {user_id}")
-            logger.info(f"   - timestamp: {timestamp}")
-            logger.info(f"   - new_intent: '{new_intent}'")
-            logger.info(f"   - new_slots: {new_slots}")
-            logger.info(f"   - new_chart_type: '{new_chart_type}'")
-            logger.info(f"   - new_prompt: '{new_prompt}'")
-            logger.info(f"   - new_comparison_targets: {new_comparison_targets}")
+            logger.info("========== UPDATE EXISTING RECORD START ==========")
+            logger.info("Update parameters:")
+            logger.info("   - user_id: %s", user_id)
+            logger.info("   - timestamp: %s", timestamp)
+            logger.info("   - new_intent: '%s'", new_intent)
+            logger.info("   - new_slots: %s", new_slots)
+            logger.info("   - new_chart_type: '%s'", new_chart_type)
+            logger.info("   - new_prompt: '%s'", new_prompt)
+            logger.info("   - new_comparison_targets: %s", new_comparison_targets)
             
             if not new_prompt:
                 logger.warning("No prompt to append")
-                logger.info(f"========== UPDATE EXISTING RECORD END ==========")
+                logger.info("========== UPDATE EXISTING RECORD END ==========")
                 return False
             
             # Create new prompt entry
@@ -331,13 +331,13 @@ class QueryContextService:
                 update_expression += ', comparison_targets = :comparison_targets'
                 expression_attribute_values[':comparison_targets'] = new_comparison_targets
             
-            logger.info(f"Performing DynamoDB update:")
-            logger.info(f"   - UPDATE report_type to: '{new_intent}'")
-            logger.info(f"   - UPDATE slots to: {new_slots}")
-            logger.info(f"   - UPDATE chart_type to: '{new_chart_type}'")
-            logger.info(f"   - APPEND prompt to history")
-            logger.info(f"   - REFRESH TTL to: {new_ttl}")
-            logger.info(f"   - REPLACE comparison_targets with: {new_comparison_targets}")
+            logger.info("Performing DynamoDB update:")
+            logger.info("   - UPDATE report_type to: '%s'", new_intent)
+            logger.info("   - UPDATE slots to: %s", new_slots)
+            logger.info("   - UPDATE chart_type to: '%s'", new_chart_type)
+            logger.info("   - APPEND prompt to history")
+            logger.info("   - REFRESH TTL to: %s", new_ttl)
+            logger.info("   - REPLACE comparison_targets with: %s", new_comparison_targets)
             
             # Update: REPLACE intent and slots, append prompt, refresh TTL
             # Note: 'ttl' is a reserved keyword in DynamoDB, so we use ExpressionAttributeNames
@@ -354,18 +354,18 @@ class QueryContextService:
                 ReturnValues='UPDATED_NEW'
             )
             
-            logger.info(f"DynamoDB update successful!")
-            logger.info(f"   - Updated attributes: {response.get('Attributes', {})}")
-            logger.info(f"========== UPDATE EXISTING RECORD END ==========")
+            logger.info("DynamoDB update successful!")
+            logger.info("   - Updated attributes: %s", response.get('Attributes', {}))
+            logger.info("========== UPDATE EXISTING RECORD END ==========")
             return True
             
         except ClientError as e:
-            logger.error(f"Failed to update record for user {user_id}: {e}")
-            logger.info(f"========== UPDATE EXISTING RECORD END ==========")
+            logger.error("Failed to update record for user %s: %s", user_id, e)
+            logger.info("========== UPDATE EXISTING RECORD END ==========")
             return False
         except Exception as e:
-            logger.exception(f"Unexpected error updating record: {e}")
-            logger.info(f"========== UPDATE EXISTING RECORD END ==========")
+            logger.exception("Unexpected error updating record: %s", e)
+            logger.info("========== UPDATE EXISTING RECORD END ==========")
             return False
     
     def _merge_slots(self, existing_slots: Dict[str, Any], new_slots: Dict[str, Any]) -> Dict[str, Any]:
@@ -395,12 +395,12 @@ class QueryContextService:
             # User specified domain, remove any existing file
             merged.pop('file_name', None)
             merged['domain_name'] = has_new_domain
-            logger.info(f"Mutual exclusion: new domain_name '{has_new_domain}' removes file_name")
+            logger.info("Mutual exclusion: new domain_name '%s' removes file_name", has_new_domain)
         elif has_new_file:
             # User specified file, remove any existing domain
             merged.pop('domain_name', None)
             merged['file_name'] = has_new_file
-            logger.info(f"Mutual exclusion: new file_name '{has_new_file}' removes domain_name")
+            logger.info("Mutual exclusion: new file_name '%s' removes domain_name", has_new_file)
         
         # Merge other slots (overwrite with new values)
         for key, value in new_slots.items():
@@ -442,14 +442,16 @@ class QueryContextService:
                 if ttl_timestamp and current_time >= ttl_timestamp:
                     # TTL has expired, treat as if record doesn't exist
                     logger.info(
-                        f"Query context found for user {user_id} but TTL expired: "
-                        f"ttl={ttl_timestamp}, now={current_time}, expired_by={current_time - ttl_timestamp}s"
+                        "Query context found for user %s but TTL expired: "
+                        "ttl=%s, now=%s, expired_by=%ss",
+                        user_id, ttl_timestamp, current_time, current_time - ttl_timestamp
                     )
                     return None
                 
                 logger.info(
-                    f"Found query context for user {user_id}: report_type={item.get('report_type')}, "
-                    f"updated_at={item.get('updated_at')}, ttl_remaining={ttl_timestamp - current_time}s"
+                    "Found query context for user %s: report_type=%s, "
+                    "updated_at=%s, ttl_remaining=%ss",
+                    user_id, item.get('report_type'), item.get('updated_at'), ttl_timestamp - current_time
                 )
                 return {
                     'report_type': item.get('report_type'),
@@ -460,14 +462,14 @@ class QueryContextService:
                     'timestamp': item.get('timestamp')
                 }
             
-            logger.info(f"No query context found for user {user_id} (expired or never existed)")
+            logger.info("No query context found for user %s (expired or never existed)", user_id)
             return None
             
         except ClientError as e:
-            logger.error(f"Failed to retrieve query context for user {user_id}: {e}")
+            logger.error("Failed to retrieve query context for user %s: %s", user_id, e)
             return None
         except Exception as e:
-            logger.exception(f"Unexpected error retrieving query context: {e}")
+            logger.exception("Unexpected error retrieving query context: %s", e)
             return None
     
     def get_full_context(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -493,8 +495,9 @@ class QueryContextService:
             if items:
                 item = items[0]
                 logger.info(
-                    f"Retrieved full context for user {user_id}: {item.get('report_type')}, "
-                    f"prompts_count={len(item.get('prompts', []))}"
+                    "Retrieved full context for user %s: %s, "
+                    "prompts_count=%s",
+                    user_id, item.get('report_type'), len(item.get('prompts', []))
                 )
                 return {
                     'intent': item.get('report_type'),  # Changed from 'intent' to 'report_type'
@@ -507,14 +510,14 @@ class QueryContextService:
                     'timestamp': item.get('timestamp')
                 }
             
-            logger.info(f"No query context found for user {user_id}")
+            logger.info("No query context found for user %s", user_id)
             return None
             
         except ClientError as e:
-            logger.error(f"Failed to retrieve full context for user {user_id}: {e}")
+            logger.error("Failed to retrieve full context for user %s: %s", user_id, e)
             return None
         except Exception as e:
-            logger.exception(f"Unexpected error retrieving full context: {e}")
+            logger.exception("Unexpected error retrieving full context: %s", e)
             return None
     
     def update_context_slots(
@@ -549,14 +552,14 @@ class QueryContextService:
                 ReturnValues='UPDATED_NEW'
             )
             
-            logger.info(f"Updated context slots for user {user_id}: {new_slots}")
+            logger.info("Updated context slots for user %s: %s", user_id, new_slots)
             return True
             
         except ClientError as e:
-            logger.error(f"Failed to update context slots for user {user_id}: {e}")
+            logger.error("Failed to update context slots for user %s: %s", user_id, e)
             return False
         except Exception as e:
-            logger.exception(f"Unexpected error updating context slots: {e}")
+            logger.exception("Unexpected error updating context slots: %s", e)
             return False
     
     def clear_query_context(self, user_id: str) -> bool:
@@ -576,7 +579,7 @@ class QueryContextService:
             latest = self.get_full_context(user_id)
             
             if not latest:
-                logger.info(f"No context to clear for user {user_id}")
+                logger.info("No context to clear for user %s", user_id)
                 return True
             
             # Delete the item
@@ -587,14 +590,14 @@ class QueryContextService:
                 }
             )
             
-            logger.info(f"Cleared query context for user {user_id}")
+            logger.info("Cleared query context for user %s", user_id)
             return True
             
         except ClientError as e:
-            logger.error(f"Failed to clear query context for user {user_id}: {e}")
+            logger.error("Failed to clear query context for user %s: %s", user_id, e)
             return False
         except Exception as e:
-            logger.exception(f"Unexpected error clearing query context: {e}")
+            logger.exception("Unexpected error clearing query context: %s", e)
             return False
     
     def should_save_context(self, intent: str, slots: Dict[str, Any]) -> bool:
@@ -612,7 +615,7 @@ class QueryContextService:
         Returns:
             bool: True if should save, False otherwise
         """
-        logger.info(f"Checking save criteria - Intent: '{intent}', Slots: {slots}")
+        logger.info("Checking save criteria - Intent: '%s', Slots: %s", intent, slots)
         
         # Check if intent is one we want to save
         valid_intents = ['success_rate', 'failure_rate']
@@ -624,11 +627,12 @@ class QueryContextService:
         has_required_slot = has_domain or has_file
         
         logger.info(
-            f"Criteria check - "
-            f"is_valid_intent: {is_valid_intent}, "
-            f"has_domain: {has_domain}, "
-            f"has_file: {has_file}, "
-            f"has_required_slot: {has_required_slot}"
+            "Criteria check - "
+            "is_valid_intent: %s, "
+            "has_domain: %s, "
+            "has_file: %s, "
+            "has_required_slot: %s",
+            is_valid_intent, has_domain, has_file, has_required_slot
         )
         
         # Save if EITHER condition is met (OR logic)
@@ -636,15 +640,17 @@ class QueryContextService:
         
         if should_save:
             logger.info(
-                f"Save criteria met: "
-                f"intent={intent} (valid={is_valid_intent}), "
-                f"has_domain={has_domain}, has_file={has_file}"
+                "Save criteria met: "
+                "intent=%s (valid=%s), "
+                "has_domain=%s, has_file=%s",
+                intent, is_valid_intent, has_domain, has_file
             )
         else:
             logger.info(
-                f"Save criteria NOT met: "
-                f"intent={intent} (valid={is_valid_intent}), "
-                f"no domain_name or file_name in slots"
+                "Save criteria NOT met: "
+                "intent=%s (valid=%s), "
+                "no domain_name or file_name in slots",
+                intent, is_valid_intent
             )
         
         return should_save
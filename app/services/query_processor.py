@@ -69,9 +69,11 @@ class QueryProcessor:
 
         try:
             # 1) SECURITY: JWT validation and user profile verification
-            auth_result = await validate_user_profile_with_response(credentials)
+            # Reuse the payload if the endpoint already verified this request's token
+            jwt_payload = getattr(http_request.state, "jwt_payload", None)
+            auth_result = await validate_user_profile_with_response(credentials, jwt_payload)
             if not auth_result.get("success"):
-                logger.warning(f"Authentication failed: {auth_result.get('message')}")
+                logger.warning("Authentication failed: %s", auth_result.get('message'))
                 return auth_result  # Structured error
 
             user = auth_result["payload"]
@@ -79,22 +81,22 @@ class QueryProcessor:
             if not user_id :
                 raise ValueError("JWT missing required claims: userid")
 
-            logger.info(f"JWT validated - user:")
+            logger.info("JWT validated - user:")
 
             # Get org_id from JWT claims (already validated)
             org_id = user.get("orgId")
             
             # Extract intent and slots
-            logger.info(f"Extracting intent and slots from prompt: '{request.prompt}'")
+            logger.info("Extracting intent and slots from prompt: '%s'", request.prompt)
             agent = get_query_understanding_agent()
             result = await agent.extract_intent_and_slots(request.prompt)
             result = agent.validate_completeness(result)
 
-            logger.info(f"Extracted - Intent: {result.intent}, Slots: {result.slots}, Chart Type: {result.chart_type}, Complete: {result.is_complete},  High Intent: {result.high_level_intent}, Clarification: {result.clarification_needed}, Query Type: {result.query_type}")
+            logger.info("Extracted - Intent: %s, Slots: %s, Chart Type: %s, Complete: %s,  High Intent: %s, Clarification: %s, Query Type: %s", result.intent, result.slots, result.chart_type, result.is_complete, result.high_level_intent, result.clarification_needed, result.query_type)
 
             # Handle out-of-scope queries (greetings, chitchat, non-analytics questions)
             if result.intent == "out_of_scope":
-                logger.info(f"Out-of-scope query detected: '{request.prompt}'")
+                logger.info("Out-of-scope query detected: '%s'", request.prompt)
                 return {
                     "success": False,
                     "message": result.clarification_needed or "I'm specialized in analytics. Please ask about success rates, failure rates, or data analysis.",
@@ -108,8 +110,8 @@ class QueryProcessor:
             # Check if query_type is 'complex' and handle with planner + executor
             if result.query_type == 'complex':
                 comparison_targets = result.comparison_targets
-                logger.info(f"Query type is 'complex'. Processing with Planner + Executor")
-                logger.info(f"Comparison targets: {comparison_targets}")
+                logger.info("Query type is 'complex'. Processing with Planner + Executor")
+                logger.info("Comparison targets: %s", comparison_targets)
                 
                 # Retrieve previous context for inheritance
                 previous_data = pending_service.get_query_context(user_id)
@@ -118,16 +120,16 @@ class QueryProcessor:
                 # Priority 1: Use extracted intent if it's success_rate or failure_rate
                 if result.intent in ['success_rate', 'failure_rate']:
                     report_type = result.intent
-                    logger.info(f"Using extracted intent: {report_type}")
+                    logger.info("Using extracted intent: %s", report_type)
                 else:
                     # Priority 2: Try to retrieve from previous context
-                    logger.info(f"Intent is '{result.intent}', retrieving from previous context...")
+                    logger.info("Intent is '%s', retrieving from previous context...", result.intent)
                     if previous_data and previous_data.get('intent') in ['success_rate', 'failure_rate']:
                         report_type = previous_data.get('intent')
-                        logger.info(f"Retrieved intent from database: {report_type}")
+                        logger.info("Retrieved intent from database: %s", report_type)
                     else:
                         report_type = ""
-                        logger.warning(f"No valid intent found (current: '{result.intent}', previous: None)")
+                        logger.warning("No valid intent found (current: '%s', previous: None)", result.intent)
                 
                 # Inherit chart_type if not provided in current query
                 chart_type_to_save = result.chart_type
@@ -135,7 +137,7 @@ class QueryProcessor:
                     prev_chart_type = previous_data.get('chart_type')
                     if prev_chart_type:
                         chart_type_to_save = prev_chart_type
-                        logger.info(f"Inherited chart_type '{chart_type_to_save}' from previous prompt for complex query")
+                        logger.info("Inherited chart_type '%s' from previous prompt for complex query", chart_type_to_save)
             
                 # Save context for potential multi-turn conversations
                 saved_data = pending_service.save_query_context(
@@ -190,13 +192,13 @@ class QueryProcessor:
                         query_type='comparison'
                     )
                     
-                    logger.info(f"Planner created plan: {plan.plan_id}")
-                    logger.info(f"   Plan has {len(plan.steps)} steps")
-                    logger.info(f"   Estimated duration: {plan.metadata.get('estimated_duration', 'unknown')}")
+                    logger.info("Planner created plan: %s", plan.plan_id)
+                    logger.info("   Plan has %s steps", len(plan.steps))
+                    logger.info("   Estimated duration: %s", plan.metadata.get('estimated_duration', 'unknown'))
                     
                     # STEP 2: Execute plan using Complex Query Executor
                     logger.info("STEP 2: Invoking Complex Query Executor to execute plan")
-                    logger.info(f"   Chart type to pass: {chart_type_to_save or 'LLM will suggest'}")
+                    logger.info("   Chart type to pass: %s", chart_type_to_save or 'LLM will suggest')
                     from app.orchestration.complex_query_executor import execute_plan
                     
                     
@@ -208,15 +210,15 @@ class QueryProcessor:
                     )
                     
                     logger.info("Complex Query Executor completed")
-                    logger.info(f"   Success: {result_response.get('success')}")
-                    logger.info(f"   Has chart: {result_response.get('chart_image') is not None}")
+                    logger.info("   Success: %s", result_response.get('success'))
+                    logger.info("   Has chart: %s", result_response.get('chart_image') is not None)
                     logger.info("=" * 80)
                     
                     # OUTPUT VALIDATION: Check for information leaks before returning
                     is_safe_output, leak_error = validate_llm_output(result_response)
                     if not is_safe_output:
-                        logger.error(f"Blocked unsafe output for user {user_id}")
-                        logger.error(f"   Leak detected: {leak_error}")
+                        logger.error("Blocked unsafe output for user %s", user_id)
+                        logger.error("   Leak detected: %s", leak_error)
                         return {
                             "success": False,
                             "message": "I apologize, but I cannot provide that information. Please ask about analytics data only.",
@@ -226,7 +228,7 @@ class QueryProcessor:
                     return result_response
                     
                 except Exception as e:
-                    logger.exception(f"Complex query processing failed: {e}")
+                    logger.exception("Complex query processing failed: %s", e)
                     logger.info("=" * 80)
                     return {
                         "success": False,
@@ -250,7 +252,7 @@ class QueryProcessor:
                 prev_chart_type = previous_data.get('chart_type')
                 if prev_chart_type:
                     result.chart_type = prev_chart_type
-                    logger.info(f"Inherited chart_type '{result.chart_type}' from previous prompt")
+                    logger.info("Inherited chart_type '%s' from previous prompt", result.chart_type)
             
             # CONFLICT DETECTION: Check if user is switching target types
             # Skip conflict detection if we're already in a conflict state (marker exists)
@@ -263,7 +265,7 @@ class QueryProcessor:
                     prev_target = f"domain '{prev_domain}'" if prev_domain else f"file '{prev_file}'"
                     curr_target = f"domain '{result.slots['domain_name']}'" if has_domain else f"file '{result.slots['file_name']}'"
                     
-                    logger.warning(f"Target conflict detected: {prev_target} vs {curr_target}")
+                    logger.warning("Target conflict detected: %s vs %s", prev_target, curr_target)
                     
                     # Save the new extraction temporarily with a special marker
                     # This allows us to retrieve it when user confirms
@@ -277,7 +279,7 @@ class QueryProcessor:
                         original_prompt=request.prompt
                     )
                     
-                    logger.info(f"Saved conflicting target temporarily with _conflict_pending marker")
+                    logger.info("Saved conflicting target temporarily with _conflict_pending marker")
                     
                     # Ask user to choose
                     # return {
@@ -316,14 +318,14 @@ class QueryProcessor:
                     if any(keyword in prompt_lower for keyword in keywords):
                         if action == 'use_current':
                             # User chose the new target (the one with conflict marker)
-                            logger.info(f"User confirmed: use new target from previous prompt")
+                            logger.info("User confirmed: use new target from previous prompt")
                             # Clean up the marker and continue
                             result.slots = prev_slots
                             # Don't inherit anything else - use what's in conflict
                             break
                         elif action == 'use_previous':
                             # User chose to go back to the target before the conflict
-                            logger.info(f"User confirmed: revert to target before conflict")
+                            logger.info("User confirmed: revert to target before conflict")
                             
                             # Need to retrieve the record before the conflict
                             # For now, clear the conflict and ask user to re-specify
@@ -341,12 +343,12 @@ class QueryProcessor:
             
             # If missing report_type OR target, try to inherit from previous context
             if not has_report_type or not has_target:
-                logger.info(f"Missing fields detected - Checking for previous context to inherit...")
-                logger.info(f"   has_report_type: {has_report_type}, has_target: {has_target}")
+                logger.info("Missing fields detected - Checking for previous context to inherit...")
+                logger.info("   has_report_type: %s, has_target: %s", has_report_type, has_target)
                 
                 # Use previous_data already retrieved above (for conflict detection)
                 if previous_data:
-                    logger.info(f"Found previous context: {previous_data}")
+                    logger.info("Found previous context: %s", previous_data)
                     
                     # Inherit missing report_type (only if previous has valid intent)
                     if not has_report_type:
@@ -354,8 +356,9 @@ class QueryProcessor:
                         if prev_report_type and prev_report_type in ['success_rate', 'failure_rate']:
                             result.intent = prev_report_type
                             logger.info(
-                                f"Inherited report_type '{result.intent}' from previous prompt "
-                                f"(last updated: {previous_data.get('updated_at')})"
+                                "Inherited report_type '%s' from previous prompt "
+                                "(last updated: %s)",
+                                result.intent, previous_data.get('updated_at')
                             )
                     
                     # Inherit missing target (domain or file)
@@ -363,10 +366,10 @@ class QueryProcessor:
                         prev_slots = previous_data.get('slots', {})
                         if prev_slots.get('domain_name'):
                             result.slots['domain_name'] = prev_slots['domain_name']
-                            logger.info(f"Inherited domain_name '{result.slots['domain_name']}' from previous prompt")
+                            logger.info("Inherited domain_name '%s' from previous prompt", result.slots['domain_name'])
                         elif prev_slots.get('file_name'):
                             result.slots['file_name'] = prev_slots['file_name']
-                            logger.info(f"Inherited file_name '{result.slots['file_name']}' from previous prompt")
+                            logger.info("Inherited file_name '%s' from previous prompt", result.slots['file_name'])
                     
                     # Re-validate after inheritance
                     has_report_type = result.intent in ['success_rate', 'failure_rate']
@@ -377,32 +380,32 @@ class QueryProcessor:
                     # Mark as complete if we now have both
                     if has_report_type and has_target:
                         result.is_complete = True
-                        logger.info(f"Query completed after inheritance: intent={result.intent}, slots={result.slots}")
+                        logger.info("Query completed after inheritance: intent=%s, slots=%s", result.intent, result.slots)
                 else:
-                    logger.info(f"No previous context found (expired or never existed)")
+                    logger.info("No previous context found (expired or never existed)")
             
             
             # Save to DynamoDB if conditions are met
             # Note: Check AFTER inheritance to save merged values
             # Conditions: Intent is success_rate OR failure_rate OR has target (domain/file)
             
-            logger.info(f"Checking if should save to DynamoDB (after inheritance)...")
-            logger.info(f"VALUES TO CHECK FOR SAVE:")
-            logger.info(f"   - Intent (after inheritance): '{result.intent}'")
-            logger.info(f"   - Slots (after inheritance): {result.slots}")
-            logger.info(f"   - Is complete (after inheritance): {result.is_complete}")
+            logger.info("Checking if should save to DynamoDB (after inheritance)...")
+            logger.info("VALUES TO CHECK FOR SAVE:")
+            logger.info("   - Intent (after inheritance): '%s'", result.intent)
+            logger.info("   - Slots (after inheritance): %s", result.slots)
+            logger.info("   - Is complete (after inheritance): %s", result.is_complete)
             
             should_save = pending_service.should_save_context(result.intent, result.slots)
-            logger.info(f"Should save result: {should_save}")
+            logger.info("Should save result: %s", should_save)
             
             saved_data = None
             if should_save:
-                logger.info(f"SAVING TO DYNAMODB:")
-                logger.info(f"   - user_id: {user_id}")
-                logger.info(f"   - intent: '{result.intent}'")
-                logger.info(f"   - slots: {result.slots}")
-                logger.info(f"   - chart_type: '{result.chart_type}'")
-                logger.info(f"   - prompt: '{request.prompt}'")
+                logger.info("SAVING TO DYNAMODB:")
+                logger.info("   - user_id: %s", user_id)
+                logger.info("   - intent: '%s'", result.intent)
+                logger.info("   - slots: %s", result.slots)
+                logger.info("   - chart_type: '%s'", result.chart_type)
+                logger.info("   - prompt: '%s'", request.prompt)
                 
                 saved_data = pending_service.save_query_context(
                     user_id=user_id,
@@ -413,23 +416,23 @@ class QueryProcessor:
                 )
                 
                 if saved_data:
-                    logger.info(f"SAVE SUCCESSFUL:")
-                    logger.info(f"   - Saved intent: {saved_data.get('intent')}")
-                    logger.info(f"   - Saved slots: {saved_data.get('slots')}")
-                    logger.info(f"   - Saved chart_type: {saved_data.get('chart_type')}")
-                    logger.info(f"   - Saved prompts count: {len(saved_data.get('prompts', []))}")
+                    logger.info("SAVE SUCCESSFUL:")
+                    logger.info("   - Saved intent: %s", saved_data.get('intent'))
+                    logger.info("   - Saved slots: %s", saved_data.get('slots'))
+                    logger.info("   - Saved chart_type: %s", saved_data.get('chart_type'))
+                    logger.info("   - Saved prompts count: %s", len(saved_data.get('prompts', [])))
                 else:
-                    logger.error(f"Failed to save to DynamoDB for user")
+                    logger.error("Failed to save to DynamoDB for user")
             else:
                 logger.info(
-                    f"SKIPPING SAVE - Intent/slots do not meet criteria:"
+                    "SKIPPING SAVE - Intent/slots do not meet criteria:"
                 )
-                logger.info(f"   - Intent: '{result.intent}'")
-                logger.info(f"   - Slots: {result.slots}")
+                logger.info("   - Intent: '%s'", result.intent)
+                logger.info("   - Slots: %s", result.slots)
             
             # Check if query is complete
             if not result.is_complete:
-                logger.warning(f"Incomplete query - Missing: {result.missing_required}")
+                logger.warning("Incomplete query - Missing: %s", result.missing_required)
                 
                 # Determine what's missing for proper error messaging
                 has_report_type = result.intent in ['success_rate', 'failure_rate']
@@ -484,7 +487,7 @@ class QueryProcessor:
                 }
             
             # Call analytics orchestrator - coordinates tool execution, chart generation, and response
-            logger.info(f"Calling analytics orchestrator")
+            logger.info("Calling analytics orchestrator")
             
             from app.orchestration.simple_query_executor import run_analytics_query
             
@@ -493,7 +496,7 @@ class QueryProcessor:
                 # Pass report_type (intent) to guide LLM tool selection
                 # - If report_type provided: LLM uses it directly (multi-turn context)
                 # - If report_type is None: LLM analyzes query keywords (fallback)
-                logger.info(f"Response - extracted result: {result}")
+                logger.info("Response - extracted result: %s", result)
               
                 extracted_data = {
                     "report_type": result.intent,
@@ -502,8 +505,8 @@ class QueryProcessor:
                     "chart_type": result.chart_type
                 }
                 
-                logger.info(f"Workflow input - Query: '{request.prompt}'")
-                logger.info(f"Workflow input - Data: {extracted_data}")
+                logger.info("Workflow input - Query: '%s'", request.prompt)
+                logger.info("Workflow input - Data: %s", extracted_data)
                 
                 # Run workflow - LLM uses report_type if provided, otherwise analyzes query
                 response = await run_analytics_query(
@@ -512,14 +515,14 @@ class QueryProcessor:
                     org_id=org_id
                 )
                 
-                logger.info(f"Workflow completed successfully")
-                logger.info(f"Response - Success: {response.get('success')}, Has chart: {response.get('chart_image') is not None}")
+                logger.info("Workflow completed successfully")
+                logger.info("Response - Success: %s, Has chart: %s", response.get('success'), response.get('chart_image') is not None)
                 
                 # OUTPUT VALIDATION: Check for information leaks before returning
                 is_safe_output, leak_error = validate_llm_output(response)
                 if not is_safe_output:
-                    logger.error(f"Blocked unsafe output for user {user_id}")
-                    logger.error(f"   Leak detected: {leak_error}")
+                    logger.error("Blocked unsafe output for user %s", user_id)
+                    logger.error("   Leak detected: %s", leak_error)
                     return {
                         "success": False,
                         "message": "I apologize, but I cannot provide that information. Please ask about analytics data only.",
@@ -529,7 +532,7 @@ class QueryProcessor:
                 return response
                 
             except Exception as e:
-                logger.exception(f"Analytics workflow execution failed: {e}")
+                logger.exception("Analytics workflow execution failed: %s", e)
                 return {
                     "success": False,
                     "message": f"I encountered an error while processing your analytics request: {str(e)}",
@@ -542,14 +545,14 @@ class QueryProcessor:
 
 
         except (ValidationError, ValueError) as e:
-            logger.warning(f"Validation error: {e}")
+            logger.warning("Validation error: %s", e)
             return self._create_error_response("Invalid request data", str(e))
 
         except HTTPException:
             raise
 
         except Exception as error:
-            logger.exception(f"Query processing failed: {error}")
+            logger.exception("Query processing failed: %s", error)
             return self._create_error_response("Processing failed", str(error))
 
     
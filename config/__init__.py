@@ -8,3 +8,8 @@ from .logging_config import *
 
 # Evaluation configuration
 from .evaluation_config import EvaluationConfig
+
+
+def __getattr__(name):
+    """Forward the lazily resolved secret settings, which the star import cannot copy."""
+    return getattr(app_config, name)
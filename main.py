@@ -13,5 +13,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=APP_PORT,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # libuv event loop and C HTTP parser (both installed with uvicorn[standard]);
+        # named explicitly so a missing package fails at startup instead of
+        # silently falling back to asyncio / h11
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
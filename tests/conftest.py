@@ -8,9 +8,92 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Set APP_ENV to test before any other imports
 os.environ['APP_ENV'] = 'test'
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(autouse=True)
+def reset_simple_query_executor_caches():
+    """
+    Clear module-level LLM, graph and tool-result caches in simple_query_executor.
+
+    Tests patch ChatOpenAI and build_analytics_orchestrator per test, so an
+    object cached by an earlier test must not leak into the next one.
+    """
+    from app.orchestration import simple_query_executor
+    caches = (
+        simple_query_executor._get_chat_client,
+        simple_query_executor._get_tool_selection_llm,
+        simple_query_executor._get_orchestrator,
+    )
+    for cache in caches:
+        cache.cache_clear()
+    simple_query_executor.clear_analytics_cache()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+    simple_query_executor.clear_analytics_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_query_understanding_agent():
+    """
+    Drop the cached query understanding LLM client and singleton agent.
+    
+    Tests patch ChatOpenAI per test, so the client built by one test must not be
+    reused by the next.
+    """
+    from app.orchestration import query_understanding_agent
+    caches = (
+        query_understanding_agent._get_llm,
+        query_understanding_agent.get_query_understanding_agent,
+    )
+    for cache in caches:
+        cache.cache_clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_planner_and_complex_executor_llms():
+    """Drop LLM clients cached by the planner and complex executor between tests."""
+    from app.orchestration import complex_query_executor, planner_agent
+    caches = (
+        planner_agent._get_planner_llm,
+        complex_query_executor._get_llm,
+    )
+    for cache in caches:
+        cache.cache_clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_jwt_cache():
+    """Forget validated tokens and the parsed key, since tests patch jwt.decode and the key."""
+    from app.security import auth
+    auth.clear_jwt_cache()
+    auth._get_verification_key.cache_clear()
+    yield
+    auth.clear_jwt_cache()
+    auth._get_verification_key.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def render_charts_in_threads():
+    """
+    Render charts on the default thread executor instead of the process pool.
+
+    Tests mock generate_analytics_chart, and mocks cannot cross a process boundary.
+    """
+    from unittest.mock import patch
+    with patch('app.orchestration.simple_query_executor._get_chart_pool', return_value=None):
+        yield
@@ -66,8 +66,8 @@ class TestAgentWorkflowIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
-    @patch('app.services.chart_service.generate_analytics_chart')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.generate_analytics_chart')
     async def test_end_to_end_success_rate_query(self, mock_chart, mock_get_tools, mock_llm):
         """
         End-to-end test: User query → Tool selection → Execution → Chart → Response
@@ -110,7 +110,7 @@ class TestAgentWorkflowIntegration:
         # Setup mock to return different responses for different calls
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute end-to-end
         result = await run_analytics_query(
@@ -130,7 +130,7 @@ class TestAgentWorkflowIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     async def test_failure_rate_workflow(self, mock_get_tools, mock_llm):
         """
         Test: Failure rate analysis workflow
@@ -171,7 +171,7 @@ class TestAgentWorkflowIntegration:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute workflow
         result = await run_analytics_query(
@@ -191,8 +191,8 @@ class TestChartGenerationIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.services.chart_service.generate_analytics_chart')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.generate_analytics_chart')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     async def test_chart_generation_in_workflow(self, mock_get_tools, mock_chart, mock_llm):
         """
         Test: Chart generation integrates into workflow
@@ -240,7 +240,7 @@ class TestChartGenerationIntegration:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute workflow
         result = await run_analytics_query(
@@ -258,8 +258,8 @@ class TestChartGenerationIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.services.chart_service.generate_analytics_chart')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.generate_analytics_chart')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     async def test_chart_generation_failure_handling(self, mock_get_tools, mock_chart, mock_llm):
         """
         Test: Chart generation failures are handled gracefully
@@ -300,7 +300,7 @@ class TestChartGenerationIntegration:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute - should not crash
         result = await run_analytics_query(
@@ -318,7 +318,7 @@ class TestErrorPropagationIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     async def test_tool_error_propagates_to_response(self, mock_get_tools, mock_llm):
         """
         Test: Tool errors propagate correctly through workflow
@@ -443,7 +443,7 @@ class TestMultiAgentScenarios:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     async def test_file_name_parameter_flow(self, mock_get_tools, mock_llm):
         """
         Test: File name parameter flows correctly through agents
@@ -480,7 +480,7 @@ class TestMultiAgentScenarios:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute with file_name
         result = await run_analytics_query(
@@ -499,8 +499,8 @@ class TestPerformanceIntegration:
     
     @pytest.mark.asyncio
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
-    @patch('app.services.chart_service.generate_analytics_chart')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.generate_analytics_chart')
     async def test_workflow_completes_within_time_limit(self, mock_chart, mock_get_tools, mock_llm):
         """
         Test: Complete workflow completes within acceptable time
@@ -541,7 +541,7 @@ class TestPerformanceIntegration:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Time the workflow
         start_time = time.time()
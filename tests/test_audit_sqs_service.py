@@ -6,11 +6,17 @@ error handling, and health checks.
 """
 import pytest
 import json
+import queue
+import time
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from botocore.exceptions import ClientError, BotoCoreError
 
-from app.services.audit_sqs_service import AuditSQSService, get_audit_sqs_service
+from app.services.audit_sqs_service import (
+    AuditSQSService,
+    _SQS_CLIENT_CONFIG,
+    get_audit_sqs_service,
+)
 
 
 class TestAuditSQSServiceInitialization:
@@ -33,7 +39,8 @@ class TestAuditSQSServiceInitialization:
             'sqs',
             aws_access_key_id='test-key',
             aws_secret_access_key='test-secret',
-            region_name='us-east-1'
+            region_name='us-east-1',
+            config=_SQS_CLIENT_CONFIG
         )
     
     @patch('app.services.audit_sqs_service.boto3')
@@ -48,7 +55,16 @@ class TestAuditSQSServiceInitialization:
         service = AuditSQSService(queue_url="https://sqs.ap-southeast-1.amazonaws.com/456/prod")
         
         assert service.sqs_client == mock_sqs_client
-        mock_boto3.client.assert_called_once_with('sqs', region_name='ap-southeast-1')
+        mock_boto3.client.assert_called_once_with(
+            'sqs', region_name='ap-southeast-1', config=_SQS_CLIENT_CONFIG
+        )
+    
+    def test_client_config_pools_and_bounds_calls(self):
+        """Test the SQS client config keeps a connection pool and short timeouts."""
+        assert _SQS_CLIENT_CONFIG.max_pool_connections == 50
+        assert _SQS_CLIENT_CONFIG.connect_timeout == 1
+        assert _SQS_CLIENT_CONFIG.read_timeout == 3
+        assert _SQS_CLIENT_CONFIG.retries["mode"] == "adaptive"
     
     @patch('app.services.audit_sqs_service.boto3')
     def test_init_client_failure(self, mock_boto3):
@@ -358,6 +374,182 @@ class TestSendAnalyticsQueryAudit:
         assert len(message_body['remarks']) <= 200
 
 
+class TestBatching:
+    """Test queued audit logs sent with SendMessageBatch."""
+    
+    def setup_method(self):
+        """Setup test service with mocked SQS client."""
+        with patch('app.services.audit_sqs_service.boto3'):
+            self.service = AuditSQSService(queue_url="https://sqs.us-east-1.amazonaws.com/123/test")
+            self.service.sqs_client = Mock()
+            self.service.sqs_client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+    
+    def teardown_method(self):
+        """Make sure no flusher thread outlives the test."""
+        self.service.stop_batching()
+    
+    def _send(self, user_id="user-123"):
+        return self.service.send_analytics_query_audit(
+            statusCode=200, user_id=user_id, username="john.doe", prompt="success rate", success=True
+        )
+    
+    def test_queued_logs_sent_in_batches_of_ten(self):
+        """Test 12 audit logs become two SendMessageBatch calls and no single sends."""
+        self.service.start_batching()
+        
+        results = [self._send(user_id=f"user-{i}") for i in range(12)]
+        self.service.stop_batching()
+        
+        assert all(results)
+        self.service.sqs_client.send_message.assert_not_called()
+        calls = self.service.sqs_client.send_message_batch.call_args_list
+        sizes = [len(c[1]['Entries']) for c in calls]
+        assert sum(sizes) == 12
+        assert max(sizes) <= 10
+        
+        entries = [entry for c in calls for entry in c[1]['Entries']]
+        assert calls[0][1]['QueueUrl'] == "https://sqs.us-east-1.amazonaws.com/123/test"
+        assert json.loads(entries[0]['MessageBody'])['userId'] == "user-0"
+        assert entries[0]['MessageAttributes']['UserId']['StringValue'] == "user-0"
+        # Entry ids are unique within each batch
+        for c in calls:
+            ids = [entry['Id'] for entry in c[1]['Entries']]
+            assert len(ids) == len(set(ids))
+    
+    @patch('app.services.audit_sqs_service._BATCH_MAX_SIZE', 3)
+    def test_batch_size_is_configurable(self):
+        """Test a smaller AUDIT_BATCH_SIZE caps the entries per SendMessageBatch call."""
+        self.service.start_batching()
+        
+        for i in range(7):
+            self._send(user_id=f"user-{i}")
+        self.service.stop_batching()
+        
+        calls = self.service.sqs_client.send_message_batch.call_args_list
+        sizes = [len(c[1]['Entries']) for c in calls]
+        assert sum(sizes) == 7
+        assert max(sizes) <= 3
+    
+    def test_stop_batching_restores_direct_sends(self):
+        """Test audit logs are sent one by one again after batching stops."""
+        self.service.sqs_client.send_message.return_value = {'MessageId': 'msg-1'}
+        self.service.start_batching()
+        self.service.stop_batching()
+        
+        assert self._send() is True
+        self.service.sqs_client.send_message.assert_called_once()
+    
+    def test_batching_not_started_without_queue_url(self):
+        """Test batching stays off when audit logging is not configured."""
+        self.service.queue_url = None
+        self.service.start_batching()
+        
+        assert self._send() is False
+        self.service.sqs_client.send_message_batch.assert_not_called()
+    
+    def test_batch_error_is_logged_not_raised(self):
+        """Test a failing SendMessageBatch call does not stop the flusher."""
+        self.service.sqs_client.send_message_batch.side_effect = [
+            ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'Denied'}}, 'SendMessageBatch'),
+            {'Successful': [{'Id': '0'}], 'Failed': []},
+        ]
+        self.service.start_batching()
+        self._send()
+        
+        # Wait for the first batch to be flushed before queueing the second
+        for _ in range(100):
+            if self.service.sqs_client.send_message_batch.called:
+                break
+            time.sleep(0.01)
+        self._send()
+        self.service.stop_batching()
+        
+        assert self.service.sqs_client.send_message_batch.call_count == 2
+
+    
+    def test_missing_user_id_does_not_drop_batch(self):
+        """Test an audit log without user_id is still valid and its batch is delivered."""
+        import boto3
+        from botocore.stub import Stubber
+        
+        client = boto3.client(
+            'sqs', region_name='us-east-1', aws_access_key_id='test', aws_secret_access_key='test'
+        )
+        self.service.sqs_client = client
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                'send_message_batch',
+                {'Successful': [
+                    {'Id': str(i), 'MessageId': f'msg-{i}', 'MD5OfMessageBody': 'x'} for i in range(3)
+                ], 'Failed': []}
+            )
+            self.service.start_batching()
+            self._send(user_id="user-1")
+            self._send(user_id=None)
+            self._send(user_id="user-2")
+            self.service.stop_batching()
+            
+            stubber.assert_no_pending_responses()
+    
+    def test_full_queue_sends_directly(self):
+        """Test an audit log that does not fit in the queue is sent directly, not dropped."""
+        self.service.sqs_client.send_message.return_value = {'MessageId': 'msg-1'}
+        # Stand-in queue with no room, so nothing is picked up by a flusher thread
+        self.service._batch_queue = queue.Queue(maxsize=1)
+        self.service._batch_queue.put_nowait({'MessageBody': '{}'})
+        try:
+            assert self._send(user_id="user-overflow") is True
+        finally:
+            self.service._batch_queue = None
+        
+        self.service.sqs_client.send_message.assert_called_once()
+        call_args = self.service.sqs_client.send_message.call_args[1]
+        assert call_args['MessageAttributes']['UserId']['StringValue'] == "user-overflow"
+    
+    def test_failed_batch_entries_retried_individually(self):
+        """Test entries SQS reports as failed are sent again one by one."""
+        def reject_user_1(QueueUrl, Entries):
+            rejected = [
+                entry['Id'] for entry in Entries
+                if entry['MessageAttributes']['UserId']['StringValue'] == "user-1"
+            ]
+            return {
+                'Successful': [{'Id': entry['Id']} for entry in Entries if entry['Id'] not in rejected],
+                'Failed': [{'Id': i, 'Code': 'InternalError', 'Message': 'Try again'} for i in rejected]
+            }
+        
+        self.service.sqs_client.send_message_batch.side_effect = reject_user_1
+        self.service.sqs_client.send_message.return_value = {'MessageId': 'msg-1'}
+        self.service.start_batching()
+        for i in range(3):
+            self._send(user_id=f"user-{i}")
+        self.service.stop_batching()
+        
+        self.service.sqs_client.send_message.assert_called_once()
+        call_args = self.service.sqs_client.send_message.call_args[1]
+        assert call_args['MessageAttributes']['UserId']['StringValue'] == "user-1"
+    
+    def test_invalid_batch_falls_back_to_single_sends(self):
+        """Test a batch rejected by parameter validation is sent message by message."""
+        from botocore.exceptions import ParamValidationError
+        
+        self.service.sqs_client.send_message_batch.side_effect = ParamValidationError(report="bad entry")
+        self.service.sqs_client.send_message.side_effect = [
+            {'MessageId': 'msg-1'}, ParamValidationError(report="bad entry"), {'MessageId': 'msg-3'}
+        ]
+        self.service.start_batching()
+        for i in range(3):
+            self._send(user_id=f"user-{i}")
+        self.service.stop_batching()
+        
+        assert self.service.sqs_client.send_message.call_count == 3
+        user_ids = [
+            c[1]['MessageAttributes']['UserId']['StringValue']
+            for c in self.service.sqs_client.send_message.call_args_list
+        ]
+        assert user_ids == ["user-0", "user-1", "user-2"]
+
+
 class TestHealthCheck:
     """Test health check functionality."""
     
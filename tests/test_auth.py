@@ -7,6 +7,8 @@ Tests cover:
 - Error handling for invalid/expired tokens
 - Integration with admin API
 """
+import time
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import HTTPException
@@ -90,6 +92,109 @@ class TestJWTValidation:
         # Token is valid, but missing claims will be caught downstream
         result = validate_jwt_token(mock_credentials)
         assert "sub" not in result
+    
+    @patch('app.security.auth.jwt.decode')
+    def test_repeated_token_verified_once(self, mock_decode, mock_credentials, sample_jwt_payload):
+        """Test the signature is only checked once for a recently seen token."""
+        from app.security.auth import validate_jwt_token
+        
+        mock_decode.return_value = sample_jwt_payload
+        
+        first = validate_jwt_token(mock_credentials)
+        second = validate_jwt_token(mock_credentials)
+        
+        assert first == second == sample_jwt_payload
+        mock_decode.assert_called_once()
+        # Callers cannot mutate the cached payload
+        second["sub"] = "someone-else"
+        assert validate_jwt_token(mock_credentials)["sub"] == "user-123-456"
+    
+    @patch('app.security.auth.jwt.decode')
+    def test_cached_token_rechecked_after_expiry(self, mock_decode, mock_credentials):
+        """Test a cached token past its exp claim is decoded (and rejected) again."""
+        from app.security.auth import validate_jwt_token
+        from jose import JWTError
+        
+        mock_decode.return_value = {"sub": "user-123-456", "exp": 1}
+        validate_jwt_token(mock_credentials)
+        mock_decode.side_effect = JWTError("Token expired")
+        
+        with pytest.raises(HTTPException):
+            validate_jwt_token(mock_credentials)
+        assert mock_decode.call_count == 2
+    
+    @patch('app.security.auth.jwt.decode')
+    def test_cached_token_rechecked_after_cache_ttl(self, mock_decode, mock_credentials):
+        """Test a long-lived token is verified again once JWT_CACHE_TTL has passed."""
+        from app.security import auth
+        
+        now = time.time()
+        mock_decode.return_value = {"sub": "user-123-456", "exp": now + 10 * auth.JWT_CACHE_TTL}
+        auth.validate_jwt_token(mock_credentials)
+        auth.validate_jwt_token(mock_credentials)
+        assert mock_decode.call_count == 1
+        
+        auth._JWT_CACHE.expire(now + auth.JWT_CACHE_TTL + 1)
+        auth.validate_jwt_token(mock_credentials)
+        assert mock_decode.call_count == 2
+    
+    @patch('app.security.auth.jwt.decode')
+    def test_failed_validation_not_cached(self, mock_decode, mock_credentials, sample_jwt_payload):
+        """Test a rejected token is checked again on the next request."""
+        from app.security.auth import validate_jwt_token
+        from jose import JWTError
+        
+        mock_decode.side_effect = [JWTError("Invalid token"), sample_jwt_payload]
+        
+        with pytest.raises(HTTPException):
+            validate_jwt_token(mock_credentials)
+        assert validate_jwt_token(mock_credentials) == sample_jwt_payload
+
+
+class TestVerificationKey:
+    """Test the JWT key is parsed once and reused for every token."""
+    
+    @pytest.fixture
+    def rsa_keys(self):
+        """Generate an RSA key pair as PEM strings."""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        return private_pem, public_pem
+    
+    def test_rs256_token_verified_with_parsed_key(self, rsa_keys):
+        """Test tokens signed with the private key verify against the pre-parsed public key."""
+        from app.security import auth
+        
+        private_pem, public_pem = rsa_keys
+        token = jwt.encode({"sub": "user-123", "exp": time.time() + 300}, private_pem, algorithm="RS256")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        
+        with patch.object(auth, 'JWT_SECRET_KEY', public_pem), \
+             patch.object(auth, 'JWT_ALGORITHM', 'RS256'):
+            key = auth._get_verification_key()
+            assert not isinstance(key, str)
+            assert auth._get_verification_key() is key
+            
+            assert auth.validate_jwt_token(credentials)["sub"] == "user-123"
+    
+    def test_unparsable_key_used_as_is(self):
+        """Test a key that is not valid for the algorithm falls back to the raw value."""
+        from app.security import auth
+        
+        with patch.object(auth, 'JWT_SECRET_KEY', 'not-a-pem-key'), \
+             patch.object(auth, 'JWT_ALGORITHM', 'RS256'):
+            assert auth._get_verification_key() == 'not-a-pem-key'
 
 
 class TestUserProfileValidation:
@@ -151,6 +256,32 @@ class TestUserProfileValidation:
         assert "authenticated and active" in result["message"].lower()
         assert result["payload"] == sample_jwt_payload
     
+    @pytest.mark.asyncio
+    @patch('app.security.auth.validate_jwt_token')
+    @patch('httpx.AsyncClient')
+    async def test_known_payload_skips_jwt_validation(
+        self,
+        mock_httpx_client,
+        mock_validate_jwt,
+        mock_credentials,
+        sample_jwt_payload
+    ):
+        """Test a payload already verified in this request is not validated again."""
+        from app.security.auth import validate_user_profile_with_response
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"success": True}
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_httpx_client.return_value.__aenter__.return_value = mock_client
+        
+        result = await validate_user_profile_with_response(mock_credentials, sample_jwt_payload)
+        
+        assert result["success"] is True
+        assert result["payload"] == sample_jwt_payload
+        mock_validate_jwt.assert_not_called()
+    
     @pytest.mark.asyncio
     @patch('app.security.auth.validate_jwt_token')
     @patch('httpx.AsyncClient')
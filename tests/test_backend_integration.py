@@ -254,7 +254,7 @@ class TestOpenAIIntegration:
         mock_response = Mock()
         mock_response.content = "The customer domain shows an 85% success rate with 85 out of 100 requests successful."
         
-        mock_llm.return_value.invoke.return_value = mock_response
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
         
         # Test state
         state = {
@@ -272,7 +272,7 @@ class TestOpenAIIntegration:
             "chart_image": None
         }
         
-        result = format_response_with_llm(state)
+        result = await format_response_with_llm(state)
         
         # Validate formatting
         assert result["final_response"]["success"] is True
@@ -373,7 +373,7 @@ class TestEndToEndBackendFlow:
     @patch('app.security.auth.validate_jwt_token')
     @patch('boto3.resource')
     @patch('app.orchestration.simple_query_executor.ChatOpenAI')
-    @patch('app.tools.analytics_tools.get_analytics_tools')
+    @patch('app.orchestration.simple_query_executor.get_analytics_tools')
     @patch('app.security.auth.httpx.AsyncClient')
     async def test_complete_authenticated_query_flow(
         self, mock_http_client, mock_get_tools, mock_llm, mock_boto_resource, mock_jwt
@@ -447,7 +447,7 @@ class TestEndToEndBackendFlow:
         
         mock_llm_instance = mock_llm.return_value
         mock_llm_instance.bind_tools.return_value.invoke.return_value = mock_tool_response
-        mock_llm_instance.invoke.return_value = mock_format_response
+        mock_llm_instance.ainvoke = AsyncMock(return_value=mock_format_response)
         
         # Execute complete flow
         from app.security.auth import validate_user_profile_with_response
@@ -18,7 +18,8 @@ from app.orchestration.complex_query_executor import (
     execute_step_node,
     should_continue,
     build_execution_graph,
-    execute_plan
+    execute_plan,
+    _get_llm
 )
 
 
@@ -137,6 +138,23 @@ class TestExecutionState:
         assert isinstance(state["org_id"], str)
 
 
+class TestLLMClients:
+    """Test LLM clients are reused instead of rebuilt per step."""
+    
+    @patch('app.orchestration.complex_query_executor.ChatOpenAI')
+    def test_client_cached_per_temperature(self, mock_chat):
+        """Test one client per temperature, sharing the HTTP pools."""
+        mock_chat.side_effect = lambda **kwargs: Mock(**kwargs)
+        
+        deterministic = _get_llm(temperature=0)
+        assert _get_llm(temperature=0.0) is deterministic
+        creative = _get_llm(temperature=0.7)
+        
+        assert creative is not deterministic
+        assert mock_chat.call_count == 2
+        assert creative.http_async_client is deterministic.http_async_client
+
+
 # ============================================================================
 # TEST EXECUTE QUERY ANALYTICS
 # ============================================================================
@@ -168,7 +186,7 @@ class TestExecuteQueryAnalytics:
         }]
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute
@@ -217,7 +235,7 @@ class TestExecuteQueryAnalytics:
         }]
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute
@@ -258,7 +276,7 @@ class TestExecuteQueryAnalytics:
         }]
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute and expect exception
@@ -286,7 +304,7 @@ class TestExecuteQueryAnalytics:
         mock_response.tool_calls = []
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute and expect exception
@@ -320,7 +338,7 @@ class TestExecuteQueryAnalytics:
         }]
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute and expect exception
@@ -628,7 +646,7 @@ class TestExecuteFormatResponse:
         
         # Mock LLM response
         mock_llm = Mock()
-        mock_llm.invoke.return_value.content = "Customer.csv has the highest success rate at 85.5%, compared to payment.csv at 72.3%."
+        mock_llm.ainvoke = AsyncMock(return_value=Mock(content="Customer.csv has the highest success rate at 85.5%, compared to payment.csv at 72.3%."))
         mock_chat.return_value = mock_llm
         
         step = {
@@ -658,7 +676,7 @@ class TestExecuteFormatResponse:
         
         # Mock LLM response
         mock_llm = Mock()
-        mock_llm.invoke.return_value.content = "Analysis complete."
+        mock_llm.ainvoke = AsyncMock(return_value=Mock(content="Analysis complete."))
         mock_chat.return_value = mock_llm
         
         step = {
@@ -932,7 +950,7 @@ class TestEdgeCases:
         }]
         
         mock_llm = Mock()
-        mock_llm.bind_tools.return_value.invoke.return_value = mock_response
+        mock_llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_chat.return_value = mock_llm
         
         # Execute
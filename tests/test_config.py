@@ -32,6 +32,19 @@ class TestConfigLoading:
         assert config_module.OPENAI_MODEL == 'gpt-4o-mini'
         assert config_module.AWS_REGION == 'ap-southeast-1'
     
+    @patch.dict(os.environ, {
+        'OPENAI_MODEL': 'gpt-4o',
+        'OPENAI_ROUTER_MODEL': 'gpt-4o-mini'
+    })
+    def test_router_model_independent_of_main_model(self):
+        """Test the tool-routing model is configured separately from OPENAI_MODEL."""
+        import importlib
+        import app.config as config_module
+        importlib.reload(config_module)
+        
+        assert config_module.OPENAI_MODEL == 'gpt-4o'
+        assert config_module.OPENAI_ROUTER_MODEL == 'gpt-4o-mini'
+    
     @patch.dict(os.environ, {'APP_ENV': 'development'})
     def test_development_environment(self):
         """Test configuration for development environment."""
@@ -71,10 +84,11 @@ class TestSecretsManagerIntegration:
                 importlib.reload(config_module)
             except:
                 pass
-        
-        # Should fall back to environment variables (verify keys are set)
-        assert hasattr(config_module, 'OPENAI_API_KEY')
-        assert hasattr(config_module, 'JWT_SECRET_KEY')
+            
+            # Secrets are resolved on first access, which hits the ImportError
+            # and falls back to environment variables (verify keys are set)
+            assert hasattr(config_module, 'OPENAI_API_KEY')
+            assert hasattr(config_module, 'JWT_SECRET_KEY')
     
     @patch.dict(os.environ, {'USE_SECRETS_MANAGER': 'true', 'OPENAI_API_KEY': 'test_key', 'JWT_SECRET_KEY': 'test_jwt'})
     @patch('app.services.aws_secrets.get_secrets_manager')
@@ -96,6 +110,34 @@ class TestSecretsManagerIntegration:
         assert config_module.JWT_SECRET_KEY == 'test_jwt'
 
 
+class TestLazySecrets:
+    """Test secret settings are only resolved when first used."""
+    
+    @patch.dict(os.environ, {'USE_SECRETS_MANAGER': 'true', 'OPENAI_API_KEY': 'test_key'})
+    @patch('app.services.aws_secrets.get_secrets_manager')
+    def test_secrets_resolved_on_first_access(self, mock_get_secrets):
+        """Test importing config does not contact Secrets Manager, and first access does once."""
+        mock_get_secrets.return_value.available = False
+        
+        import importlib
+        import app.config as config_module
+        importlib.reload(config_module)
+        
+        mock_get_secrets.assert_not_called()
+        
+        assert config_module.OPENAI_API_KEY == 'test_key'
+        assert config_module.USE_LLM is True
+        assert config_module.JWT_SECRET_KEY is not None
+        mock_get_secrets.assert_called_once()
+    
+    def test_unknown_attribute_still_raises(self):
+        """Test the lazy lookup only covers the secret settings."""
+        import app.config as config_module
+        
+        with pytest.raises(AttributeError):
+            config_module.NOT_A_SETTING
+
+
 class TestAWSSecretsManager:
     """Test AWS Secrets Manager integration."""
     
@@ -0,0 +1,41 @@
+"""
+Test suite for the shared OpenAI HTTP clients.
+"""
+import httpx
+import pytest
+
+from app.services.http_clients import close_openai_http_clients, get_openai_http_clients
+
+
+class TestOpenAIHttpClients:
+    """Test get_openai_http_clients and close_openai_http_clients."""
+    
+    def test_clients_are_shared(self):
+        """Test every caller gets the same sync and async clients."""
+        first = get_openai_http_clients()
+        second = get_openai_http_clients()
+        
+        assert first is second
+        assert isinstance(first[0], httpx.Client)
+        assert isinstance(first[1], httpx.AsyncClient)
+    
+    @pytest.mark.asyncio
+    async def test_close_releases_clients(self):
+        """Test shutdown closes both clients and the next call builds new ones."""
+        client, async_client = get_openai_http_clients()
+        
+        await close_openai_http_clients()
+        
+        assert client.is_closed
+        assert async_client.is_closed
+        assert get_openai_http_clients()[1] is not async_client
+    
+    @pytest.mark.asyncio
+    async def test_close_without_clients_is_noop(self):
+        """Test shutdown does not build clients just to close them."""
+        await close_openai_http_clients()
+        get_openai_http_clients.cache_clear()
+        
+        await close_openai_http_clients()
+        
+        assert get_openai_http_clients.cache_info().currsize == 0
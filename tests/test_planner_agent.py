@@ -351,6 +351,26 @@ class TestCreateExecutionPlan:
         assert plan.steps[3].action == "generate_chart"
         assert plan.steps[4].action == "format_response"
     
+    @patch('app.orchestration.planner_agent.ChatOpenAI')
+    def test_create_execution_plan_reuses_llm_client(self, mock_chat_openai, valid_llm_response):
+        """Test the LLM client is built once and reused for later plans."""
+        mock_response = MagicMock()
+        mock_response.content = json.dumps(valid_llm_response)
+        mock_llm = MagicMock()
+        mock_llm.invoke.return_value = mock_response
+        mock_chat_openai.return_value = mock_llm
+        
+        for _ in range(2):
+            create_execution_plan(
+                intent="success_rate",
+                comparison_targets=["customer.csv", "payment.csv"],
+                user_query="Compare success rates",
+                query_type="comparison"
+            )
+        
+        mock_chat_openai.assert_called_once()
+        assert mock_llm.invoke.call_count == 2
+    
     @patch('app.orchestration.planner_agent.ChatOpenAI')
     def test_create_execution_plan_with_markdown_wrapped_json(self, mock_chat_openai, valid_llm_response):
         """Test plan creation when LLM wraps JSON in markdown code blocks."""
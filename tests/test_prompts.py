@@ -51,6 +51,12 @@ class TestQueryUnderstandingPrompt:
         assert isinstance(message, str)
         assert "test" in message
     
+    def test_format_user_message_strips_control_characters(self):
+        """Test null bytes and control characters are removed but tabs and newlines kept."""
+        prompt = QueryUnderstandingPrompt()
+        message = prompt.format_user_message(query="success\x00 rate\x07\tfor\ncustomer\x1f.csv")
+        assert "success rate\tfor\ncustomer.csv" in message
+    
     def test_format_user_message_empty(self):
         """Test empty query handling."""
         prompt = QueryUnderstandingPrompt()
@@ -75,6 +81,21 @@ class TestQueryUnderstandingPrompt:
         prompt = QueryUnderstandingPrompt()
         with pytest.raises(PromptSecurityError):
             prompt.validate_response_schema({"intent": "success_rate"})
+    
+    def test_template_stays_compact(self):
+        """Test the template stays small and plain; rules live in the response schema."""
+        assert len(QueryUnderstandingPrompt.TEMPLATE) < 2000
+        assert QueryUnderstandingPrompt.TEMPLATE.isascii()
+    
+    def test_response_format_is_strict_json_schema(self):
+        """Test the structured output schema satisfies OpenAI strict mode rules."""
+        json_schema = QueryUnderstandingPrompt.RESPONSE_FORMAT["json_schema"]
+        assert json_schema["strict"] is True
+        
+        objects = [json_schema["schema"], json_schema["schema"]["properties"]["slots"]]
+        for obj in objects:
+            assert obj["additionalProperties"] is False
+            assert set(obj["required"]) == set(obj["properties"])
 
 
 class TestPlannerPrompt:
@@ -114,6 +114,20 @@ class TestQueryHandlerAuthentication:
         assert result["success"] is False
         assert "Invalid token" in result["message"]
     
+    @pytest.mark.asyncio
+    @patch('app.services.query_processor.validate_user_profile_with_response')
+    async def test_reuses_payload_from_request_state(self, mock_validate, processor, mock_http_request, mock_credentials):
+        """Test the JWT payload verified by the endpoint is passed on instead of re-verified."""
+        from app.services.query_processor import PromptRequest
+        
+        mock_validate.return_value = {"success": False, "message": "Inactive"}
+        mock_http_request.state.jwt_payload = {"sub": "user-123"}
+        
+        request = PromptRequest(prompt="Test query")
+        await processor.query_handler(request, mock_http_request, mock_credentials)
+        
+        mock_validate.assert_awaited_once_with(mock_credentials, {"sub": "user-123"})
+    
     @pytest.mark.asyncio
     @patch('app.services.query_processor.get_query_understanding_agent')
     @patch('app.services.query_processor.validate_user_profile_with_response')
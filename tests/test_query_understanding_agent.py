@@ -3,13 +3,15 @@ Test suite for QueryUnderstandingAgent.
 
 Tests intent extraction, slot filling, and query understanding for analytics queries.
 """
+import asyncio
 import json
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from app.orchestration.query_understanding_agent import (
     QueryUnderstandingAgent,
     QueryUnderstandingResult,
-    get_query_understanding_agent
+    get_query_understanding_agent,
+    _fast_classify
 )
 
 
@@ -48,6 +50,12 @@ class TestQueryUnderstandingResult:
         assert result.missing_required == []
         assert result.is_complete is True
         assert result.query_type == "simple"
+    
+    def test_query_understanding_result_rejects_non_string_slots(self):
+        """Test slot values are narrowed to strings (or None)."""
+        from pydantic import ValidationError
+        with pytest.raises(ValidationError):
+            QueryUnderstandingResult(slots={"domain_name": ["customer"]})
 
 
 class TestQueryUnderstandingAgentInit:
@@ -62,6 +70,7 @@ class TestQueryUnderstandingAgentInit:
         mock_chat_openai.assert_called_once()
         call_kwargs = mock_chat_openai.call_args.kwargs
         assert call_kwargs['temperature'] == 0.0
+        assert call_kwargs['model_kwargs']['response_format']['type'] == 'json_schema'
 
 
 class TestExtractIntentAndSlots:
@@ -121,6 +130,91 @@ class TestExtractIntentAndSlots:
         assert result.slots == {"file_name": "customer.csv"}
         assert result.is_complete is True
     
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_extract_intent_structured_output_drops_null_slots(self, mock_chat_openai):
+        """Test a strict-schema response keeps only filled slots and hoists chart_type."""
+        mock_llm = AsyncMock()
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            "intent": "success_rate",
+            "query_type": "simple",
+            "high_level_intent": None,
+            "slots": {"domain_name": "customer", "file_name": None, "chart_type": "pie"},
+            "comparison_targets": [],
+            "confidence": 0.95,
+            "missing_required": [],
+            "is_complete": True,
+            "clarification_needed": None
+        })
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_chat_openai.return_value = mock_llm
+        
+        agent = QueryUnderstandingAgent()
+        result = await agent.extract_intent_and_slots("customer success rate as a pie chart")
+        
+        assert result.slots == {"domain_name": "customer"}
+        assert result.chart_type == "pie"
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_extract_intent_logs_cached_prompt_tokens(self, mock_chat_openai, caplog):
+        """Test the prompt cache hit size reported by OpenAI is logged."""
+        mock_llm = AsyncMock()
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            "intent": "general_query",
+            "query_type": "simple",
+            "slots": {},
+            "confidence": 0.9,
+            "missing_required": [],
+            "is_complete": False,
+            "comparison_targets": []
+        })
+        mock_response.response_metadata = {
+            "token_usage": {"prompt_tokens": 1200, "prompt_tokens_details": {"cached_tokens": 1024}}
+        }
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_chat_openai.return_value = mock_llm
+        
+        agent = QueryUnderstandingAgent()
+        with caplog.at_level("DEBUG", logger="app.orchestration.query_understanding_agent"):
+            await agent.extract_intent_and_slots("analyze customer domain")
+        
+        assert "prompt_tokens=1200 cached_tokens=1024" in caplog.text
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_extract_intent_uses_stable_cached_prefix(self, mock_chat_openai):
+        """Test only the query varies between calls and a prompt cache key is sent."""
+        mock_llm = AsyncMock()
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            "intent": "general_query",
+            "query_type": "simple",
+            "slots": {},
+            "confidence": 0.9,
+            "missing_required": [],
+            "is_complete": False,
+            "comparison_targets": []
+        })
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_chat_openai.return_value = mock_llm
+        
+        agent = QueryUnderstandingAgent()
+        await agent.extract_intent_and_slots("analyze customer domain")
+        await agent.extract_intent_and_slots("analyze payment domain")
+        
+        first_call, second_call = mock_llm.ainvoke.await_args_list
+        first_system, first_user = first_call.args[0]
+        second_system, second_user = second_call.args[0]
+        assert first_system is second_system is agent.system_message
+        assert first_system.content.endswith(agent.prompt_template.QUERY_INSTRUCTION)
+        assert first_user.content == "<USER_QUERY>\nanalyze customer domain\n</USER_QUERY>"
+        assert second_user.content == "<USER_QUERY>\nanalyze payment domain\n</USER_QUERY>"
+        assert first_call.kwargs["prompt_cache_key"].startswith("query-understanding-")
+        assert first_call.kwargs == second_call.kwargs
+    
     @pytest.mark.asyncio
     @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
     async def test_extract_intent_complex_comparison(self, mock_chat_openai):
@@ -241,6 +335,23 @@ class TestExtractIntentAndSlots:
         assert result.is_complete is False
         assert result.confidence == 0.0
         assert "error" in result.clarification_needed.lower()
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_fallback_results_are_independent_copies(self, mock_chat_openai):
+        """Test mutating one fallback result does not leak into the next."""
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(side_effect=Exception("API error"))
+        mock_chat_openai.return_value = mock_llm
+        
+        agent = QueryUnderstandingAgent()
+        first = await agent.extract_intent_and_slots("show me success rate")
+        first.missing_required.append("tampered")
+        agent.validate_completeness(first)
+        second = await agent.extract_intent_and_slots("show me success rate")
+        
+        assert second.missing_required == ["intent", "domain_name or file_name"]
+        assert "error" in second.clarification_needed.lower()
 
 
 class TestValidateCompleteness:
@@ -292,6 +403,21 @@ class TestValidateCompleteness:
         
         # Validation should not change query_type or high_level_intent
         assert validated.intent == "success_rate"
+        assert validated.clarification_needed is None
+    
+    def test_validate_completeness_general_query_with_all_slots(self):
+        """Test no clarification is asked once both domain and file are known."""
+        agent = QueryUnderstandingAgent()
+        
+        result = QueryUnderstandingResult(
+            intent="general_query",
+            slots={"domain_name": "customer", "file_name": "customer.csv"},
+            clarification_needed="stale question"
+        )
+        
+        validated = agent.validate_completeness(result)
+        
+        assert validated.clarification_needed is None
 
 
 class TestGetQueryUnderstandingAgent:
@@ -301,8 +427,7 @@ class TestGetQueryUnderstandingAgent:
     def test_get_agent_singleton(self, mock_chat_openai):
         """Test get_query_understanding_agent returns singleton instance."""
         # Reset singleton for test
-        import app.orchestration.query_understanding_agent as agent_module
-        agent_module._query_understanding_agent = None
+        get_query_understanding_agent.cache_clear()
         
         agent1 = get_query_understanding_agent()
         agent2 = get_query_understanding_agent()
@@ -314,8 +439,7 @@ class TestGetQueryUnderstandingAgent:
     def test_get_agent_creates_instance_once(self, mock_chat_openai):
         """Test get_query_understanding_agent creates instance only once."""
         # Reset singleton for test
-        import app.orchestration.query_understanding_agent as agent_module
-        agent_module._query_understanding_agent = None
+        get_query_understanding_agent.cache_clear()
         
         # First call should create instance
         agent1 = get_query_understanding_agent()
@@ -327,6 +451,29 @@ class TestGetQueryUnderstandingAgent:
         
         assert call_count_after_first == call_count_after_second
         assert agent1 is agent2
+    
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    def test_agents_share_llm_client(self, mock_chat_openai):
+        """Test every agent instance reuses one LLM client and system message."""
+        agent1 = QueryUnderstandingAgent()
+        agent2 = QueryUnderstandingAgent()
+        
+        assert agent1.llm is agent2.llm
+        assert agent1.system_message is agent2.system_message
+        mock_chat_openai.assert_called_once()
+    
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    def test_llm_uses_shared_http_clients(self, mock_chat_openai):
+        """Test the LLM client reuses the service-wide httpx pools and retries once."""
+        from app.services.http_clients import get_openai_http_clients
+        http_client, http_async_client = get_openai_http_clients()
+        
+        QueryUnderstandingAgent()
+        
+        call_kwargs = mock_chat_openai.call_args.kwargs
+        assert call_kwargs['http_client'] is http_client
+        assert call_kwargs['http_async_client'] is http_async_client
+        assert call_kwargs['max_retries'] == 1
 
 
 class TestEdgeCases:
@@ -469,3 +616,371 @@ class TestComplexQueryScenarios:
         assert result.query_type == "complex"
         assert result.comparison_targets == ["customer", "payment.csv"]
         assert result.is_complete is True
+
+
+class TestResultCache:
+    """Test the per-agent query understanding result cache."""
+    
+    @staticmethod
+    def _mock_llm(mock_chat_openai, confidence=0.95):
+        mock_llm = AsyncMock()
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            "intent": "success_rate",
+            "query_type": "simple",
+            "slots": {"domain_name": "customer"},
+            "confidence": confidence,
+            "missing_required": [],
+            "is_complete": True,
+            "comparison_targets": []
+        })
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_chat_openai.return_value = mock_llm
+        return mock_llm
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_repeated_query_skips_llm(self, mock_chat_openai):
+        """Test an identical query (modulo whitespace) is served from the cache."""
+        mock_llm = self._mock_llm(mock_chat_openai)
+        agent = QueryUnderstandingAgent()
+        
+        first = await agent.extract_intent_and_slots("success rate for customer")
+        second = await agent.extract_intent_and_slots("  success rate   for customer ")
+        
+        assert mock_llm.ainvoke.await_count == 1
+        assert second == first
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_cached_result_is_a_copy(self, mock_chat_openai):
+        """Test mutating a returned result does not corrupt the cache."""
+        self._mock_llm(mock_chat_openai)
+        agent = QueryUnderstandingAgent()
+        
+        first = await agent.extract_intent_and_slots("success rate for customer")
+        first.slots["domain_name"] = "tampered"
+        agent.validate_completeness(first)
+        second = await agent.extract_intent_and_slots("success rate for customer")
+        
+        assert second.slots == {"domain_name": "customer"}
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_low_confidence_not_cached(self, mock_chat_openai):
+        """Test low-confidence parses are re-queried instead of cached."""
+        mock_llm = self._mock_llm(mock_chat_openai, confidence=0.3)
+        agent = QueryUnderstandingAgent()
+        
+        await agent.extract_intent_and_slots("success rate for customer")
+        await agent.extract_intent_and_slots("success rate for customer")
+        
+        assert mock_llm.ainvoke.await_count == 2
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent._RESULT_CACHE_SIZE', 2)
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_least_recently_used_entry_evicted(self, mock_chat_openai):
+        """Test the cache evicts the least recently used query when full."""
+        mock_llm = self._mock_llm(mock_chat_openai)
+        agent = QueryUnderstandingAgent()
+        
+        await agent.extract_intent_and_slots("query one")
+        await agent.extract_intent_and_slots("query two")
+        await agent.extract_intent_and_slots("query one")
+        await agent.extract_intent_and_slots("query three")
+        assert mock_llm.ainvoke.await_count == 3
+        
+        await agent.extract_intent_and_slots("query one")
+        assert mock_llm.ainvoke.await_count == 3
+        await agent.extract_intent_and_slots("query two")
+        assert mock_llm.ainvoke.await_count == 4
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_paraphrased_query_shares_entry(self, mock_chat_openai):
+        """Test filler words and punctuation do not defeat the cache."""
+        mock_llm = self._mock_llm(mock_chat_openai)
+        agent = QueryUnderstandingAgent()
+        
+        await agent.extract_intent_and_slots("show me success rate for customer")
+        await agent.extract_intent_and_slots("What is the success rate of customer?")
+        
+        assert mock_llm.ainvoke.await_count == 1
+    
+    def test_cache_key_keeps_entities_and_case(self):
+        """Test cache keys still distinguish different targets and file name case."""
+        key = QueryUnderstandingAgent._cache_key
+        
+        assert key("success rate for customer.csv") != key("success rate for payment.csv")
+        assert key("success rate for customer.csv") != key("success rate for Customer.csv")
+        assert key("compare customer.csv vs payment.csv") == "compare customer.csv vs payment.csv"
+    
+    def test_cache_key_keeps_short_words_naming_the_target(self):
+        """Test lead-in words are only dropped before the query itself starts."""
+        key = QueryUnderstandingAgent._cache_key
+        
+        assert key("success rate for domain a") != key("success rate for domain")
+        assert key("failure rate for you domain") != key("failure rate for domain")
+        assert key("can you show me success rate for domain a") == key("success rate for domain a")
+
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_concurrent_identical_queries_share_llm_call(self, mock_chat_openai):
+        """Test concurrent callers asking the same question await one LLM call."""
+        mock_llm = self._mock_llm(mock_chat_openai)
+        response = mock_llm.ainvoke.return_value
+        
+        async def slow_ainvoke(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return response
+        
+        mock_llm.ainvoke = AsyncMock(side_effect=slow_ainvoke)
+        agent = QueryUnderstandingAgent()
+        
+        results = await asyncio.gather(*[
+            agent.extract_intent_and_slots("success rate for customer")
+            for _ in range(5)
+        ])
+        
+        assert mock_llm.ainvoke.await_count == 1
+        assert all(result.slots == {"domain_name": "customer"} for result in results)
+        assert len({id(result) for result in results}) == 5
+        assert agent._pending == {}
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_waiter_recovers_when_owner_cancelled(self, mock_chat_openai):
+        """Test a joined caller runs its own LLM call if the owning caller is cancelled."""
+        mock_llm = self._mock_llm(mock_chat_openai)
+        response = mock_llm.ainvoke.return_value
+        started = asyncio.Event()
+        
+        async def slow_ainvoke(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(0.01)
+            return response
+        
+        mock_llm.ainvoke = AsyncMock(side_effect=slow_ainvoke)
+        agent = QueryUnderstandingAgent()
+        
+        owner = asyncio.create_task(agent.extract_intent_and_slots("success rate for customer"))
+        await started.wait()
+        waiter = asyncio.create_task(agent.extract_intent_and_slots("success rate for customer"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        
+        result = await waiter
+        
+        assert result.intent == "success_rate"
+        assert mock_llm.ainvoke.await_count == 2
+
+
+class TestBatchExtract:
+    """Test batch_extract_intent_and_slots."""
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_batch_preserves_order_and_bounds_concurrency(self, mock_chat_openai):
+        """Test results come back in query order with limited concurrent LLM calls."""
+        in_flight = 0
+        peak = 0
+        
+        async def fake_ainvoke(messages, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            domain = messages[1].content.split()[-2]
+            response = Mock()
+            response.content = json.dumps({
+                "intent": "general_query",
+                "query_type": "simple",
+                "slots": {"domain_name": domain},
+                "confidence": 0.9,
+                "missing_required": ["intent"],
+                "is_complete": False,
+                "comparison_targets": []
+            })
+            return response
+        
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+        mock_chat_openai.return_value = mock_llm
+        agent = QueryUnderstandingAgent()
+        domains = [f"domain{i}" for i in range(6)]
+        
+        results = await agent.batch_extract_intent_and_slots(
+            [f"analyze {domain}" for domain in domains] + ["hello"],
+            max_concurrency=2
+        )
+        
+        assert [r.slots.get("domain_name") for r in results[:-1]] == domains
+        assert results[-1].intent == "out_of_scope"
+        assert mock_llm.ainvoke.await_count == 6
+        assert peak <= 2
+
+
+
+class TestStreamExtract:
+    """Test stream_extract_intent_and_slots."""
+    
+    @staticmethod
+    def _streaming_llm(mock_chat_openai, pieces):
+        async def fake_astream(messages, **kwargs):
+            for piece in pieces:
+                chunk = Mock()
+                chunk.content = piece
+                yield chunk
+        
+        mock_llm = Mock()
+        mock_llm.astream = Mock(side_effect=fake_astream)
+        mock_chat_openai.return_value = mock_llm
+        return mock_llm
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_stream_yields_intent_before_final(self, mock_chat_openai):
+        """Test the intent is previewed as soon as it is complete in the stream."""
+        payload = json.dumps({
+            "intent": "failure_rate",
+            "query_type": "simple",
+            "slots": {"domain_name": "customer"},
+            "confidence": 0.9,
+            "missing_required": [],
+            "is_complete": True,
+            "comparison_targets": []
+        })
+        pieces = [payload[i:i + 8] for i in range(0, len(payload), 8)]
+        mock_llm = self._streaming_llm(mock_chat_openai, pieces)
+        agent = QueryUnderstandingAgent()
+        
+        events = [e async for e in agent.stream_extract_intent_and_slots("failures in customer")]
+        
+        assert events[0] == {"type": "partial", "intent": "failure_rate"}
+        assert events[1] == {"type": "partial", "intent": "failure_rate", "query_type": "simple"}
+        assert events[-1]["type"] == "final"
+        assert events[-1]["result"].slots == {"domain_name": "customer"}
+        assert mock_llm.astream.call_args.kwargs["prompt_cache_key"].startswith("query-understanding-")
+        
+        # The streamed result is cached like a regular extraction
+        cached = await agent.extract_intent_and_slots("failures in customer")
+        assert cached.intent == "failure_rate"
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_stream_fast_path_only_yields_final(self, mock_chat_openai):
+        """Test fast-path queries skip the LLM and stream one final event."""
+        mock_llm = self._streaming_llm(mock_chat_openai, [])
+        agent = QueryUnderstandingAgent()
+        
+        events = [e async for e in agent.stream_extract_intent_and_slots("hello")]
+        
+        assert [e["type"] for e in events] == ["final"]
+        assert events[0]["result"].intent == "out_of_scope"
+        mock_llm.astream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_stream_ignores_values_outside_allowlist(self, mock_chat_openai):
+        """Test partial previews never expose values that fail the allowlist."""
+        self._streaming_llm(mock_chat_openai, ['{"intent": "drop_tables", "query_type": "simple"'])
+        agent = QueryUnderstandingAgent()
+        
+        events = [e async for e in agent.stream_extract_intent_and_slots("analyze customer")]
+        
+        assert events[0] == {"type": "partial", "query_type": "simple"}
+        assert events[-1]["result"].intent == "general_query"
+        assert events[-1]["result"].confidence == 0.0
+
+
+class TestFastClassify:
+    """Test the deterministic pre-classifier that runs before the LLM."""
+    
+    @pytest.mark.parametrize("query", [
+        "hello", "Hi there!", "good morning", "tell me a joke",
+        "what's the weather today?", "who are you"
+    ])
+    def test_greetings_are_out_of_scope(self, query):
+        """Test greetings and chitchat are classified without the LLM."""
+        result = _fast_classify(query)
+        
+        assert result.intent == "out_of_scope"
+        assert result.is_complete is True
+    
+    @pytest.mark.parametrize("query,intent", [
+        ("show me success rate for customer.csv", "success_rate"),
+        ("failure rate for customer-data_v2.csv", "failure_rate"),
+        ("how many errors in Payment.JSON?", "failure_rate"),
+        ("failure rate for customer domain", "failure_rate"),
+    ])
+    def test_single_file_metric_queries(self, query, intent):
+        """Test one metric plus one file name is classified without the LLM."""
+        result = _fast_classify(query)
+        
+        assert result.intent == intent
+        assert result.query_type == "simple"
+        assert len(result.slots) == 1
+        assert next(iter(result.slots.values())) in query
+        assert result.is_complete is True
+    
+    @pytest.mark.parametrize("query,slots", [
+        ("customer.csv", {"file_name": "customer.csv"}),
+        (" Payment-2024.xlsx? ", {"file_name": "Payment-2024.xlsx"}),
+        ("customer domain", {"domain_name": "customer"}),
+    ])
+    def test_bare_target_asks_for_metric(self, query, slots):
+        """Test a query naming only a target becomes an incomplete general_query."""
+        result = _fast_classify(query)
+        
+        assert result.intent == "general_query"
+        assert result.slots == slots
+        assert result.missing_required == ["intent"]
+        assert result.is_complete is False
+    
+    @pytest.mark.parametrize("query", [
+        "hello, can you analyze customer.csv",
+        "success rate for this domain",
+        "this domain",
+        "success rate for customer domain in payment.csv",
+        "compare success rate for customer.csv vs payment.csv",
+        "success rate for customer.csv and payment.csv",
+        "success rate for customer.csv as a pie chart",
+        "success and failure rate for customer.csv",
+        "analyze customer.csv",
+    ])
+    def test_ambiguous_queries_fall_through(self, query):
+        """Test anything beyond the simple shapes is left to the LLM."""
+        assert _fast_classify(query) is None
+    
+    @pytest.mark.parametrize("query", ["", "   \n\t"])
+    def test_empty_query_asks_for_input(self, query):
+        """Test empty and whitespace-only queries are answered locally."""
+        result = _fast_classify(query)
+        
+        assert result.intent == "general_query"
+        assert result.is_complete is False
+        assert "what you'd like to analyze" in result.clarification_needed
+    
+    def test_oversized_query_is_refused(self):
+        """Test queries over the length cap never reach the regexes or the LLM."""
+        result = _fast_classify("success rate for customer.csv " * 200)
+        
+        assert result.intent == "general_query"
+        assert result.confidence == 0.0
+        assert "too long" in result.clarification_needed
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestration.query_understanding_agent.ChatOpenAI')
+    async def test_fast_path_skips_llm(self, mock_chat_openai):
+        """Test extract_intent_and_slots does not call the LLM for a fast-path query."""
+        mock_llm = AsyncMock()
+        mock_chat_openai.return_value = mock_llm
+        agent = QueryUnderstandingAgent()
+        
+        result = await agent.extract_intent_and_slots("hello")
+        
+        assert result.intent == "out_of_scope"
+        mock_llm.ainvoke.assert_not_awaited()